@@ -0,0 +1 @@
+"""Offline CPU benchmarks for the grok_api hot paths, run with ``python -m benchmarks``."""
@@ -0,0 +1,95 @@
+"""
+Run the CPU benchmark suite.
+
+    python -m benchmarks                 # report ops/s and MB/s
+    python -m benchmarks --check         # also fail on golden mismatches or regressions
+    python -m benchmarks --update        # re-record baseline.json (and golden.json with --golden)
+"""
+from argparse import ArgumentParser
+from timeit   import Timer
+from json     import load, dump
+from os       import path
+import sys
+
+from .suite import CASES
+
+HERE = path.dirname(path.abspath(__file__))
+BASELINE_PATH = path.join(HERE, "baseline.json")
+GOLDEN_PATH = path.join(HERE, "golden.json")
+
+
+def read_json(file: str) -> dict:
+    if not path.exists(file):
+        return {}
+    with open(file) as f:
+        return load(f)
+
+
+def write_json(file: str, data: dict) -> None:
+    with open(file, "w") as f:
+        dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def measure(func, min_time: float, repeat: int) -> float:
+    """Best seconds per call over ``repeat`` runs of at least ``min_time`` each."""
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("filter", nargs="*", help="only run cases whose name contains one of these")
+    parser.add_argument("--check", action="store_true", help="exit non-zero on golden mismatches or regressions")
+    parser.add_argument("--update", action="store_true", help="store the measured ops/s as the new baseline")
+    parser.add_argument("--golden", action="store_true", help="with --update, also re-record golden outputs")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline (default 0.25)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing run (default 0.2)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline: dict = read_json(BASELINE_PATH)
+    golden: dict = read_json(GOLDEN_PATH)
+    failures: list = []
+
+    print(f"{'case':<28} {'ops/s':>12} {'MB/s':>9} {'baseline':>12} {'change':>8}")
+    for name, case in CASES.items():
+        if args.filter and not any(part in name for part in args.filter):
+            continue
+
+        with case.fixture():
+            func, size = case.setup()
+            value = case.golden(func())
+            seconds: float = measure(func, args.min_time, args.repeat)
+
+        if args.update and args.golden:
+            golden[name] = value
+        elif name in golden and golden[name] != value:
+            failures.append(f"{name}: output differs from golden.json")
+
+        ops: float = 1 / seconds
+        mbps: str = f"{size / seconds / 1e6:9.1f}" if size else f"{'-':>9}"
+
+        reference = baseline.get(name)
+        change: str = f"{ops / reference - 1:+8.0%}" if reference else f"{'new':>8}"
+        print(f"{name:<28} {ops:12.0f} {mbps} {reference or 0:12.0f} {change}")
+
+        if reference and ops < reference * (1 - args.tolerance):
+            failures.append(f"{name}: {ops:.0f} ops/s is more than {args.tolerance:.0%} below the baseline {reference:.0f}")
+        if args.update:
+            baseline[name] = round(ops)
+
+    if args.update:
+        write_json(BASELINE_PATH, baseline)
+        if args.golden:
+            write_json(GOLDEN_PATH, golden)
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
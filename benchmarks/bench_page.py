@@ -0,0 +1,50 @@
+"""
+Compare ``Parser.parse_page`` with the previous BeautifulSoup based ``Grok._load`` extraction.
+
+    python -m benchmarks.bench_page [path/to/saved/c.html]
+"""
+from grok_api.core import Parser, Utils
+from timeit        import repeat
+from os            import path
+import sys
+
+FIXTURE = path.join(path.dirname(path.abspath(__file__)), "fixtures", "grok_c.html")
+
+
+def bs4_extract(html: str) -> tuple:
+    from bs4 import BeautifulSoup
+
+    scripts: list = [s['src'] for s in BeautifulSoup(html, 'html.parser').find_all('script', src=True) if s['src'].startswith('/_next/static/chunks/')]
+    baggage: str = Utils.between(html, '<meta name="baggage" content="', '"')
+    sentry_trace: str = Utils.between(html, '<meta name="sentry-trace" content="', '-')
+    return scripts, baggage, sentry_trace
+
+
+def bench(func, html: str, number: int) -> float:
+    return min(repeat(lambda: func(html), number=number, repeat=5)) / number
+
+
+def main() -> None:
+    with open(sys.argv[1] if len(sys.argv) > 1 else FIXTURE, encoding="utf-8") as f:
+        html: str = f.read()
+
+    size: float = len(html.encode()) / 1e6
+    fast: float = bench(Parser.parse_page, html, 200)
+    print(f"parse_page : {fast * 1e3:8.3f} ms  {size / fast:8.1f} MB/s")
+
+    try:
+        expected: tuple = bs4_extract(html)
+    except ImportError:
+        print("beautifulsoup4 not installed, skipping comparison")
+        return
+
+    if tuple(Parser.parse_page(html)) != expected:
+        raise SystemExit("parse_page disagrees with the BeautifulSoup extraction")
+
+    slow: float = bench(bs4_extract, html, 5)
+    print(f"bs4        : {slow * 1e3:8.3f} ms  {size / slow:8.1f} MB/s")
+    print(f"speedup    : {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
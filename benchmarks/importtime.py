@@ -0,0 +1,82 @@
+"""
+Import-time budgets for the package entry points, measured with ``python -X importtime``.
+
+    python -m benchmarks.importtime            # cumulative import time per statement
+    python -m benchmarks.importtime --check    # also fail on budget overruns or eager heavy imports
+
+Each statement runs in a fresh interpreter. Modules the interpreter loads at startup are
+measured once with an empty program and left out, so only the cost of the statement counts.
+"""
+from argparse import ArgumentParser
+from typing   import Dict, Set, Tuple
+import subprocess
+import sys
+
+HEAVY: Tuple[str, ...] = ("curl_cffi", "coincurve", "colorama", "asyncio", "fastapi", "uvicorn")
+
+# statement -> (budget in milliseconds, modules it must not load)
+BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "import grok_api": (20, HEAVY),
+    "from grok_api import GrokError, Hooks, Log": (40, HEAVY),
+    "from grok_api.core import Signature": (40, HEAVY),
+    "from grok_api.core import Parser": (60, HEAVY),
+    "import grok_api.api_server": (2000, ("uvicorn",)),
+}
+
+
+def _run(statement: str) -> Tuple[Dict[str, int], Set[str]]:
+    """Top-level imports with their cumulative microseconds, and every module loaded afterwards."""
+    program: str = f"{statement}\nimport sys\nprint(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", program], capture_output=True, text=True, check=True)
+
+    imports: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            imports[name.strip()] = int(cumulative)
+    return imports, set(result.stdout.split())
+
+
+def measure(statement: str, repeat: int = 3) -> Tuple[float, Set[str]]:
+    """Best-of-``repeat`` milliseconds spent importing for ``statement``, and the modules it loaded."""
+    startup, preloaded = _run("pass")
+    best: float = float("inf")
+    modules: Set[str] = set()
+
+    for _ in range(repeat):
+        imports, modules = _run(statement)
+        best = min(best, sum(cumulative for name, cumulative in imports.items() if name not in startup) / 1000)
+
+    return best, modules - preloaded
+
+
+def eager(modules: Set[str], forbidden: Tuple[str, ...]) -> list:
+    return sorted(name for name in forbidden if name in modules)
+
+
+def main() -> int:
+    parser = ArgumentParser(prog="python -m benchmarks.importtime", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="exit non-zero when a budget is exceeded")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, for slow machines")
+    args = parser.parse_args()
+
+    failures: list = []
+    print(f"{'statement':<46} {'ms':>9} {'budget':>9}  eager heavy imports")
+    for statement, (budget, forbidden) in BUDGETS.items():
+        ms, modules = measure(statement)
+        loaded: list = eager(modules, forbidden)
+        print(f"{statement:<46} {ms:9.1f} {budget * args.scale:9.0f}  {', '.join(loaded) or '-'}")
+
+        if ms > budget * args.scale:
+            failures.append(f"{statement}: {ms:.1f}ms is over its {budget * args.scale:.0f}ms budget")
+        if loaded:
+            failures.append(f"{statement}: loads {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if args.check and failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
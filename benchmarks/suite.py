@@ -0,0 +1,170 @@
+"""
+Benchmark cases for the CPU hot paths, driven by the recorded fixtures in ``fixtures/``.
+
+Every case returns a callable doing one unit of work, the number of input bytes it
+processes and a function that reduces its result to the golden value stored in
+``golden.json``, so a faster implementation must still produce identical output. A case's
+``fixture`` is entered around its setup and every run of the callable.
+"""
+from grok_api.core import Grok, Parser, Signature, Headers, Payloads, MappingStore
+from grok_api.core.decoder import decode_line
+from grok_api.core.flight import decode_action
+from dataclasses   import dataclass
+from contextlib    import contextmanager, nullcontext
+from tempfile      import TemporaryDirectory
+from hashlib       import sha256
+from typing        import Any, Callable, ContextManager, Dict, Iterator, Tuple
+from json          import dumps
+from os            import path
+
+FIXTURES = path.join(path.dirname(path.abspath(__file__)), "fixtures")
+
+XSID_SCRIPT = "static/chunks/4f5d3b2a1c0e9d8f.js"
+NUMBERS = [17, 3, 41, 29]
+
+
+def fixture(name: str, mode: str = "r") -> Any:
+    with open(path.join(FIXTURES, name), mode) as f:
+        return f.read()
+
+
+def digest(value: Any) -> str:
+    return sha256(dumps(value, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Tuple[Callable[[], Any], int]]
+    golden: Callable[[Any], Any]
+    fixture: Callable[[], ContextManager] = nullcontext
+
+
+def _grok() -> Grok:
+    grok = Grok()
+    grok.keys = {"privateKey": "benchmark", "userPublicKey": []}
+    grok.anon_user = "anon"
+    grok.actions = ["7f00", "7f01", "7f02"]
+    grok.xsid_script = XSID_SCRIPT
+    grok.baggage = "sentry-environment=production"
+    grok.sentry_trace = "0" * 32
+    return grok
+
+
+@contextmanager
+def warm_txid() -> Iterator[None]:
+    """Give ``Parser`` a throwaway txid mapping that already knows the fixture's xsid script."""
+    saved: MappingStore = Parser.mapping
+    with TemporaryDirectory(prefix="grok-bench-") as directory:
+        Parser.mapping = MappingStore(path.join(directory, "txid.json"))
+        Parser.mapping.put(f"{Parser.base_url}/_next/{XSID_SCRIPT}", NUMBERS)
+        try:
+            yield
+        finally:
+            Parser.mapping = saved
+
+
+def _verification() -> Tuple[str, str]:
+    html: str = fixture("c_request_2.txt")
+    token, anim = Parser.get_anim(html)
+    svg, _ = Parser.parse_values(html, anim, XSID_SCRIPT)
+    return token, svg
+
+
+def setup_generate_sign():
+    token, svg = _verification()
+    return lambda: Signature.generate_sign("/rest/app-chat/conversations/new", "POST", token, svg, NUMBERS, 100_000_000, 0.5), 0
+
+
+def setup_xs_uncached():
+    token, svg = _verification()
+    from base64 import b64decode
+    raw: bytes = b64decode(token)
+    return lambda: Signature.xs(raw, svg, NUMBERS), 0
+
+
+def setup_parse_values():
+    html: str = fixture("c_request_2.txt")
+    return lambda: Parser.parse_values(html, "loading-x-anim-2", XSID_SCRIPT), len(html)
+
+
+def setup_get_anim():
+    html: str = fixture("c_request_2.txt")
+    return lambda: Parser.get_anim(html), len(html)
+
+
+def setup_challenge():
+    content: bytes = fixture("c_request_1.bin", "rb")
+    return lambda: decode_action(content).challenge, len(content)
+
+
+def setup_decode_verification():
+    content: bytes = fixture("c_request_2.txt", "rb")
+    return lambda: Parser.verification(decode_action(content)), len(content)
+
+
+def setup_parse_page():
+    html: str = fixture("grok_c.html")
+    return lambda: Parser.parse_page(html), len(html)
+
+
+def setup_chat_new():
+    grok, text = _grok(), fixture("conversation_new.ndjson")
+    return lambda: grok._parse_conversation(text), len(text)
+
+
+def setup_chat_next():
+    grok, text = _grok(), fixture("conversation_next.ndjson")
+    extra_data: dict = {"conversationId": "conversation"}
+    return lambda: grok._parse_conversation(text, extra_data), len(text)
+
+
+def setup_stream_lines():
+    raw: bytes = fixture("conversation_new.ndjson", "rb")
+    lines: list = raw.splitlines()
+    return lambda: [decode_line(line) for line in lines], len(raw)
+
+
+def _events(events: list) -> str:
+    return digest([{"token": e.token, "conversationId": e.conversation_id, "responseId": e.response_id} for e in events])
+
+
+def setup_fix_order():
+    base: dict = Headers().CONVERSATION
+    headers: dict = dict(reversed(list(base.items())))
+    headers.update({"baggage": "sentry-environment=production", "x-statsig-id": "x" * 94, "traceparent": "00-" + "0" * 32 + "-" + "0" * 16 + "-00"})
+    return lambda: Headers.fix_order(headers, base), 0
+
+
+def setup_overlay():
+    fields: dict = {"baggage": "sentry-environment=production", "x-statsig-id": "x" * 94, "traceparent": "00-" + "0" * 32 + "-" + "0" * 16 + "-00"}
+    return lambda: Headers.overlay(Headers.CONVERSATION, fields), 0
+
+
+def setup_conversation_body():
+    message: str = "Summarise the following text in three bullet points: " + "lorem ipsum " * 40
+    return lambda: Payloads.conversation(message, "grok-3-auto", "MODEL_MODE_AUTO", "auto", "0" * 36), 0
+
+
+def _conversation(result: dict) -> dict:
+    return {key: result[key] for key in ("response", "stream_response", "images")} | {
+        "conversationId": result["extra_data"]["conversationId"],
+        "parentResponseId": result["extra_data"]["parentResponseId"],
+    }
+
+
+CASES: Dict[str, Case] = {case.name: case for case in (
+    Case("signature.generate_sign", setup_generate_sign, lambda sign: sign, warm_txid),
+    Case("signature.xs_uncached", setup_xs_uncached, lambda o: o, warm_txid),
+    Case("parser.parse_values", setup_parse_values, lambda r: [digest(r[0]), r[1]], warm_txid),
+    Case("parser.get_anim", setup_get_anim, list),
+    Case("parser.parse_page", setup_parse_page, digest),
+    Case("grok.challenge", setup_challenge, lambda challenge: challenge.hex()),
+    Case("flight.verification", setup_decode_verification, lambda r: [r[0], r[1], digest(r[2])]),
+    Case("grok.chat_ndjson_new", setup_chat_new, lambda r: digest(_conversation(r))),
+    Case("grok.chat_ndjson_next", setup_chat_next, lambda r: digest(_conversation(r))),
+    Case("grok.chat_stream_lines", setup_stream_lines, _events),
+    Case("headers.fix_order", setup_fix_order, lambda headers: digest(list(headers.items()))),
+    Case("headers.overlay", setup_overlay, lambda headers: digest(list(headers.items()))),
+    Case("payloads.conversation", setup_conversation_body, lambda body: sha256(body).hexdigest()[:16]),
+)}
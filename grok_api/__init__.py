@@ -1,19 +1,49 @@
-from .core import (
-    Grok,
-    GrokError,
-    GrokNetworkError,
-    GrokParsingError,
-    GrokAuthError,
-    GrokSessionError,
-    Log
-)
+from importlib import import_module
+from typing    import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .core import (
+        Grok,
+        AsyncGrok,
+        GrokError,
+        GrokNetworkError,
+        GrokStreamError,
+        GrokParsingError,
+        GrokAuthError,
+        GrokSessionError,
+        GrokLimitError,
+        GrokRejectedError,
+        GrokCircuitOpenError,
+        Hooks,
+        Log
+    )
 
 __all__ = [
     "Grok",
+    "AsyncGrok",
     "GrokError",
     "GrokNetworkError",
+    "GrokStreamError",
     "GrokParsingError",
     "GrokAuthError",
     "GrokSessionError",
+    "GrokLimitError",
+    "GrokRejectedError",
+    "GrokCircuitOpenError",
+    "Hooks",
     "Log"
 ]
+
+
+def __getattr__(name: str):
+    # Resolved through ``grok_api.core`` on first access, which in turn loads only the module it needs.
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(".core", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
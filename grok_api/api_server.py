@@ -1,17 +1,72 @@
 from fastapi      import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from urllib.parse import urlparse, ParseResult
 from pydantic     import BaseModel
-from .core         import Grok, GrokError, GrokNetworkError, GrokParsingError, GrokAuthError, GrokSessionError
-from uvicorn      import run
+from .core         import Grok, Log, ResponseCache, MemoryResponseBackend, SQLiteResponseBackend, GrokError, GrokNetworkError, GrokParsingError, GrokAuthError, GrokSessionError, GrokLimitError, GrokRejectedError, GrokCircuitOpenError
+from .executor     import BoundedExecutor, ExecutorFull
+from .metrics      import Metrics
+from .conversations import ConversationStore, MemoryConversationStore, SQLiteConversationStore
+from os           import environ, getpid
+from json         import dumps
+from typing       import AsyncGenerator, Generator, List, Optional
+import asyncio
 
 
 app = FastAPI()
+metrics = Metrics().install()
 
-class ConversationRequest(BaseModel):
-    proxy: str
+executor = BoundedExecutor(
+    max_workers=int(environ.get("GROK_API_WORKERS", 50)),
+    max_queue=int(environ.get("GROK_API_QUEUE", 100)),
+)
+RETRY_AFTER: int = int(environ.get("GROK_API_RETRY_AFTER", 5))
+STREAM_BUFFER: int = int(environ.get("GROK_API_STREAM_BUFFER", 64))
+BATCH_CONCURRENCY: int = int(environ.get("GROK_API_BATCH_CONCURRENCY", 8))
+BATCH_MAX_ITEMS: int = int(environ.get("GROK_API_BATCH_MAX_ITEMS", 1000))
+Grok.retry.max_attempts = int(environ.get("GROK_API_MAX_ATTEMPTS", Grok.retry.max_attempts))
+Grok.sessions.max_size = int(environ.get("GROK_API_POOL_SIZE", Grok.sessions.max_size))
+Grok.sessions.idle_timeout = float(environ.get("GROK_API_POOL_IDLE", Grok.sessions.idle_timeout))
+if "GROK_API_MAX_RESPONSE_BYTES" in environ:
+    Grok.max_response_bytes = int(environ["GROK_API_MAX_RESPONSE_BYTES"]) or None
+
+if environ.get("GROK_API_LOG_LEVEL") or environ.get("GROK_API_LOG_FORMAT"):
+    Log.set_enabled(True)
+    Log.set_level(environ.get("GROK_API_LOG_LEVEL", "INFO"))
+    Log.set_format(environ.get("GROK_API_LOG_FORMAT", "text"))
+
+if float(environ.get("GROK_API_RESPONSE_CACHE_TTL", 0)) > 0:
+    RESPONSE_CACHE_MAX: int = int(environ.get("GROK_API_RESPONSE_CACHE_MAX", 1024))
+    if environ.get("GROK_API_RESPONSE_CACHE_DB"):
+        response_backend = SQLiteResponseBackend(environ["GROK_API_RESPONSE_CACHE_DB"], RESPONSE_CACHE_MAX)
+    else:
+        response_backend = MemoryResponseBackend(RESPONSE_CACHE_MAX)
+    Grok.response_cache = ResponseCache(
+        float(environ["GROK_API_RESPONSE_CACHE_TTL"]),
+        backend=response_backend,
+        per_proxy=environ.get("GROK_API_RESPONSE_CACHE_PER_PROXY") == "1"
+    )
+
+CONVERSATION_TTL: float = float(environ.get("GROK_API_CONVERSATION_TTL", 3600))
+if environ.get("GROK_API_CONVERSATION_DB"):
+    conversations: ConversationStore = SQLiteConversationStore(environ["GROK_API_CONVERSATION_DB"], CONVERSATION_TTL)
+else:
+    conversations: ConversationStore = MemoryConversationStore(int(environ.get("GROK_API_CONVERSATION_MAX", 10000)), CONVERSATION_TTL)
+
+class ConversationItem(BaseModel):
     message: str
     model: str = "grok-3-auto"
     extra_data: dict = None
+    conversation: str = None
+    # Also return the full ``extra_data`` next to the handle, for clients that keep it themselves.
+    include_extra_data: bool = False
+
+class ConversationRequest(ConversationItem):
+    proxy: str
+
+class BatchRequest(BaseModel):
+    proxy: str
+    items: List[ConversationItem]
+    concurrency: Optional[int] = None
 
 def format_proxy(proxy: str) -> str:
 
@@ -38,6 +93,69 @@ def format_proxy(proxy: str) -> str:
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid proxy format: {str(e)}")
 
+def to_http_error(e: Exception) -> HTTPException:
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, ExecutorFull):
+        return HTTPException(status_code=503, detail=f"Server busy: {str(e)}", headers={"Retry-After": str(RETRY_AFTER)})
+    if isinstance(e, GrokCircuitOpenError):
+        return HTTPException(status_code=503, detail=f"Grok Unavailable: {str(e)}", headers={"Retry-After": str(RETRY_AFTER)})
+    if isinstance(e, GrokRejectedError):
+        return HTTPException(status_code=502, detail=f"Grok Rejected: {str(e)}")
+    if isinstance(e, GrokNetworkError):
+        return HTTPException(status_code=502, detail=f"Grok Network Error: {str(e)}")
+    if isinstance(e, GrokParsingError):
+        return HTTPException(status_code=502, detail=f"Grok Parsing Error: {str(e)}")
+    if isinstance(e, GrokLimitError):
+        return HTTPException(status_code=502, detail=f"Grok Limit Error: {str(e)}")
+    if isinstance(e, GrokAuthError):
+        return HTTPException(status_code=401, detail=f"Grok Auth Error: {str(e)}")
+    if isinstance(e, GrokError):
+        return HTTPException(status_code=500, detail=f"Grok API Error: {str(e)}")
+    return HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+
+def resolve_extra_data(request: ConversationItem) -> dict:
+    """
+    Return the state to continue from: the stored conversation for a handle, else ``extra_data``.
+
+    The store may be SQLite, so call this on a worker, never on the event loop.
+    """
+    if not request.conversation:
+        return request.extra_data
+
+    extra_data: dict = conversations.get(request.conversation)
+    if extra_data is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired conversation")
+    return extra_data
+
+def store_conversation(answer: dict, handle: str = None, include_extra_data: bool = False) -> dict:
+    """
+    Store the answer's ``extra_data`` and hand back its handle instead. The state holds the
+    session cookies and keys, so it only goes back to the client when asked for.
+    """
+    # Answers served from the response cache carry no conversation to continue.
+    if not answer["extra_data"]:
+        answer["conversation"] = None
+        return answer
+
+    answer["conversation"] = conversations.put(answer["extra_data"], handle)
+    if not include_extra_data:
+        del answer["extra_data"]
+    return answer
+
+def ask(model: str, proxy: str, message: str, extra_data: dict = None, handle: str = None, include_extra_data: bool = False) -> dict:
+    with Grok(model, proxy) as grok:
+        answer: dict = grok.chat(message, extra_data)
+
+    return store_conversation(answer, handle, include_extra_data)
+
+def ask_stream(model: str, proxy: str, message: str, extra_data: dict = None, handle: str = None, include_extra_data: bool = False) -> Generator[dict, None, None]:
+    with Grok(model, proxy) as grok:
+        for chunk in grok.chat_stream(message, extra_data):
+            if chunk["meta"]:
+                store_conversation(chunk["meta"], handle, include_extra_data)
+            yield chunk
+
 @app.post("/ask")
 async def create_conversation(request: ConversationRequest):
     if not request.proxy or not request.message:
@@ -46,25 +164,128 @@ async def create_conversation(request: ConversationRequest):
     proxy = format_proxy(request.proxy)
 
     try:
-        answer: dict = Grok(request.model, proxy).chat(request.message, request.extra_data)
+        answer: dict = await executor.run(lambda: ask(request.model, proxy, request.message, resolve_extra_data(request), request.conversation, request.include_extra_data))
 
         return {
             "status": "success",
             **answer
         }
-    except GrokNetworkError as e:
-        raise HTTPException(status_code=502, detail=f"Grok Network Error: {str(e)}")
-    except GrokParsingError as e:
-        raise HTTPException(status_code=502, detail=f"Grok Parsing Error: {str(e)}")
-    except GrokAuthError as e:
-        raise HTTPException(status_code=401, detail=f"Grok Auth Error: {str(e)}")
-    except GrokError as e:
-        raise HTTPException(status_code=500, detail=f"Grok API Error: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+        raise to_http_error(e)
+
+def encode_frame(chunk: dict, format: str) -> bytes:
+    if format == "sse":
+        return f"data: {dumps(chunk)}\n\n".encode()
+    return (dumps(chunk) + "\n").encode()
+
+async def stream_frames(first: dict, chunks: AsyncGenerator[dict, None], format: str) -> AsyncGenerator[bytes, None]:
+    try:
+        if first is not None:
+            yield encode_frame(first, format)
+        async for chunk in chunks:
+            yield encode_frame(chunk, format)
+    except Exception as e:
+        # Headers are already sent, so failures after the first frame are reported inline.
+        yield encode_frame({"error": to_http_error(e).detail}, format)
+    finally:
+        await chunks.aclose()
+
+@app.post("/ask/stream")
+async def stream_conversation(request: ConversationRequest, format: str = "ndjson"):
+    if not request.proxy or not request.message:
+        raise HTTPException(status_code=400, detail="Proxy and message are required")
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="Format must be ndjson or sse")
+
+    proxy = format_proxy(request.proxy)
+
+    chunks = executor.stream(lambda: ask_stream(request.model, proxy, request.message, resolve_extra_data(request), request.conversation, request.include_extra_data), STREAM_BUFFER)
+
+    # Wait for the first frame so handshake failures still map to a proper status code.
+    try:
+        first: dict = await anext(chunks)
+    except StopAsyncIteration:
+        first = None
+    except Exception as e:
+        await chunks.aclose()
+        raise to_http_error(e)
+
+    return StreamingResponse(
+        stream_frames(first, chunks, format),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def run_batch(items: List[ConversationItem], proxy: str, concurrency: int) -> AsyncGenerator[bytes, None]:
+    """Run ``items`` at most ``concurrency`` at a time and yield one NDJSON line per item as it finishes."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_item(index: int, item: ConversationItem) -> dict:
+        async with semaphore:
+            try:
+                if not item.message:
+                    raise HTTPException(status_code=400, detail="Message is required")
+                answer: dict = await executor.run(lambda: ask(item.model, proxy, item.message, resolve_extra_data(item), item.conversation, item.include_extra_data))
+                return {"index": index, "status": "success", **answer}
+            except Exception as e:
+                error: HTTPException = to_http_error(e)
+                return {"index": index, "status": "error", "status_code": error.status_code, "error": error.detail}
+
+    tasks: list = [asyncio.create_task(run_item(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield (dumps(await next_done) + "\n").encode()
+    finally:
+        # A client that disconnects stops queued items; ones already on a worker run to completion.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+@app.post("/ask/batch")
+async def batch_conversations(request: BatchRequest):
+    if not request.proxy or not request.items:
+        raise HTTPException(status_code=400, detail="Proxy and items are required")
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch is limited to {BATCH_MAX_ITEMS} items")
+
+    proxy = format_proxy(request.proxy)
+    concurrency: int = max(1, min(request.concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY))
+
+    return StreamingResponse(
+        run_batch(request.items, proxy, concurrency),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/stats")
+async def stats():
+    return {
+        "executor": executor.stats(),
+        "sessions": Grok.sessions.stats(),
+        "verification": Grok.verification.stats(),
+        "retry": Grok.retry.stats(),
+        "responses": Grok.response_cache.stats() if Grok.response_cache else None,
+        "conversations": conversations.stats(),
+        "pid": getpid()
+    }
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+def create_app() -> FastAPI:
+    """
+    App factory for ``grok-api-server`` and ``uvicorn --factory grok_api.api_server:create_app``.
+
+    Every worker process imports this module, which configures it from the ``GROK_API_*``
+    environment, and serves the app returned here.
+    """
+    return app
 
 def main():
-    run(app, host="0.0.0.0", port=6969)
+    from .server import main as serve
+
+    serve()
 
 if __name__ == "__main__":
     main()
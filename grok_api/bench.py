@@ -0,0 +1,201 @@
+"""
+End-to-end load test against :mod:`grok_api.mock_server`.
+
+``grok-api-bench`` drives either the library (``--target library``) or a spawned
+``api_server`` (``--target server``) at a fixed concurrency and reports latency
+percentiles, time to first token and requests per second. Nothing leaves the machine:
+the mock also acts as the proxy the server requires, and mappings go to a temporary
+directory so the shipped ones are left alone.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from curl_cffi          import requests
+from argparse           import ArgumentParser
+from contextlib         import contextmanager, nullcontext
+from tempfile           import TemporaryDirectory
+from threading          import Thread
+from time               import perf_counter, sleep
+from typing             import Callable, Iterator, List, Optional, Tuple
+from json               import loads, dumps
+from os                 import path, environ
+from math               import ceil
+import subprocess
+import socket
+import sys
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 15.0) -> None:
+    deadline: float = perf_counter() + timeout
+    while perf_counter() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.errors.RequestsError:
+            sleep(0.05)
+    raise RuntimeError(f"Nothing answered at {url} within {timeout:g}s")
+
+
+@contextmanager
+def mock_server(tokens: int = 64, token_rate: float = 0.0, latency: float = 0.0) -> Iterator[str]:
+    """Serve the mock on a free port in a background thread and yield its base URL."""
+    from uvicorn     import Config, Server
+    from .mock_server import create_app
+
+    port: int = free_port()
+    server = Server(Config(create_app(tokens, token_rate, latency), host="127.0.0.1", port=port, log_level="error"))
+    thread = Thread(target=server.run, name="grok-mock", daemon=True)
+    thread.start()
+    try:
+        url: str = f"http://127.0.0.1:{port}"
+        wait_until_up(f"{url}/c")
+        yield url
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+
+
+@contextmanager
+def api_server(mock_url: str, mappings: str) -> Iterator[str]:
+    """Run ``api_server`` in a subprocess that talks to ``mock_url`` and yield its base URL."""
+    port: int = free_port()
+    env: dict = dict(environ, GROK_API_BASE_URL=mock_url, GROK_API_MAPPINGS_DIR=mappings)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "grok_api.api_server:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "error"],
+        env=env
+    )
+    try:
+        url: str = f"http://127.0.0.1:{port}"
+        wait_until_up(f"{url}/stats")
+        yield url
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def library_request(model: str, message: str) -> Callable[[], Tuple[float, Optional[float]]]:
+    from .core import Grok
+
+    def request() -> Tuple[float, Optional[float]]:
+        start: float = perf_counter()
+        first_token: Optional[float] = None
+        with Grok(model) as grok:
+            for chunk in grok.chat_stream(message):
+                if chunk.get("token") and first_token is None:
+                    first_token = perf_counter() - start
+        return perf_counter() - start, first_token
+
+    return request
+
+
+def server_request(url: str, proxy: str, model: str, message: str) -> Callable[[], Tuple[float, Optional[float]]]:
+    body: str = dumps({"proxy": proxy, "message": message, "model": model})
+
+    def request() -> Tuple[float, Optional[float]]:
+        start: float = perf_counter()
+        first_token: Optional[float] = None
+        response = requests.post(f"{url}/ask/stream", data=body, headers={"Content-Type": "application/json"}, stream=True, timeout=120)
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line and first_token is None and loads(line).get("token"):
+                    first_token = perf_counter() - start
+        finally:
+            response.close()
+        return perf_counter() - start, first_token
+
+    return request
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted ``values``."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, ceil(q / 100 * len(values)) - 1))]
+
+
+def run(request: Callable[[], Tuple[float, Optional[float]]], total: int, concurrency: int) -> dict:
+    """Issue ``total`` requests, ``concurrency`` at a time, and summarise them."""
+    latencies: List[float] = []
+    ttfts: List[float] = []
+    errors: dict = {}
+
+    def one(_) -> None:
+        try:
+            latency, ttft = request()
+        except Exception as e:
+            name: str = type(e).__name__
+            errors[name] = errors.get(name, 0) + 1
+            return
+        latencies.append(latency)
+        if ttft is not None:
+            ttfts.append(ttft)
+
+    start: float = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="grok-bench") as pool:
+        list(pool.map(one, range(total)))
+    elapsed: float = perf_counter() - start
+
+    latencies.sort()
+    ttfts.sort()
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": errors,
+        "elapsed": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": {f"p{q}": percentile(latencies, q) for q in (50, 95, 99)},
+        "ttft": {f"p{q}": percentile(ttfts, q) for q in (50, 95, 99)},
+    }
+
+
+def report(result: dict) -> str:
+    ms = lambda seconds: f"{seconds * 1000:.1f}ms"
+    lines = [
+        f"requests     {result['ok']}/{result['requests']} ok at concurrency {result['concurrency']} in {result['elapsed']:.2f}s",
+        f"throughput   {result['rps']:.1f} req/s",
+        "latency      " + "  ".join(f"{name} {ms(value)}" for name, value in result["latency"].items()),
+        "ttft         " + "  ".join(f"{name} {ms(value)}" for name, value in result["ttft"].items()),
+    ]
+    if result["errors"]:
+        lines.append("errors       " + ", ".join(f"{name} x{count}" for name, count in result["errors"].items()))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Load-test the library or api_server against the offline grok.com mock.")
+    parser.add_argument("--target", choices=("library", "server"), default="library")
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("--model", default="grok-3-auto")
+    parser.add_argument("--message", default="Hello")
+    parser.add_argument("--mock-url", help="use an already running mock_server instead of starting one")
+    parser.add_argument("--server-url", help="use an already running api_server (pointed at the mock) instead of spawning one")
+    parser.add_argument("--tokens", type=int, default=64, help="tokens per mock response")
+    parser.add_argument("--token-rate", type=float, default=0.0, help="mock tokens per second, 0 for unlimited")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the mock adds to every response")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    with TemporaryDirectory(prefix="grok-bench-") as mappings:
+        with (nullcontext(args.mock_url) if args.mock_url else mock_server(args.tokens, args.token_rate, args.latency)) as mock_url:
+            if args.target == "library":
+                from .core import Parser, MappingStore
+
+                Parser.base_url = mock_url
+                Parser.mapping = MappingStore(path.join(mappings, "txid.json"))
+                Parser.grok_mapping = MappingStore(path.join(mappings, "grok.json"), key="action_script")
+                result: dict = run(library_request(args.model, args.message), args.requests, args.concurrency)
+            else:
+                with (nullcontext(args.server_url) if args.server_url else api_server(mock_url, mappings)) as server_url:
+                    result: dict = run(server_request(server_url, mock_url, args.model, args.message), args.requests, args.concurrency)
+
+    print(dumps(result, indent=2) if args.json else report(result))
+
+if __name__ == "__main__":
+    main()
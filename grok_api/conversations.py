@@ -0,0 +1,104 @@
+from collections import OrderedDict
+from threading   import Lock
+from secrets     import token_urlsafe
+from time        import monotonic, time
+from typing      import Optional
+from json        import dumps, loads
+from abc         import ABC, abstractmethod
+import sqlite3
+
+
+class ConversationStore(ABC):
+    """
+    Server-side home for ``extra_data`` so clients only keep a short conversation handle.
+
+    ``put`` stores the state of a conversation and returns its handle; passing an existing
+    handle updates that conversation in place, so the handle stays the same for every turn.
+    ``get`` returns ``None`` for unknown or expired handles.
+    """
+
+    @abstractmethod
+    def get(self, handle: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def put(self, extra_data: dict, handle: str = None) -> str:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+    @staticmethod
+    def new_handle() -> str:
+        return token_urlsafe(16)
+
+
+class MemoryConversationStore(ConversationStore):
+    """In-process LRU of conversations; entries expire ``ttl`` seconds after their last turn."""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 3600.0) -> None:
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def get(self, handle: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            if entry[0] < monotonic():
+                del self._entries[handle]
+                return None
+            self._entries.move_to_end(handle)
+            return entry[1]
+
+    def put(self, extra_data: dict, handle: str = None) -> str:
+        handle = handle or self.new_handle()
+        with self._lock:
+            self._entries[handle] = (monotonic() + self.ttl, extra_data)
+            self._entries.move_to_end(handle)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return handle
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._entries)
+            }
+
+
+class SQLiteConversationStore(ConversationStore):
+    """Conversations kept in a SQLite file, so they survive restarts and are shared between workers."""
+
+    def __init__(self, path: str, ttl: float = 3600.0) -> None:
+        self.path: str = path
+        self.ttl: float = ttl
+        self._lock: Lock = Lock()
+        self._db: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS conversations (handle TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS conversations_expires ON conversations (expires)")
+
+    def get(self, handle: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute("SELECT data FROM conversations WHERE handle = ? AND expires >= ?", (handle, time())).fetchone()
+        return loads(row[0]) if row else None
+
+    def put(self, extra_data: dict, handle: str = None) -> str:
+        handle = handle or self.new_handle()
+        now = time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO conversations VALUES (?, ?, ?)", (handle, dumps(extra_data), now + self.ttl))
+            self._db.execute("DELETE FROM conversations WHERE expires < ?", (now,))
+        return handle
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "size": size
+        }
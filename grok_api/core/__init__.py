@@ -1,14 +1,86 @@
-from .logger         import Log
-from .runtime        import Run, Utils
-from .headers        import Headers
-from .reverse.parser import Parser
-from .reverse.xctid  import Signature
-from .reverse.anon   import Anon
-from .grok           import Grok
-from .exceptions     import (
-    GrokError,
-    GrokNetworkError,
-    GrokParsingError,
-    GrokAuthError,
-    GrokSessionError
-)
\ No newline at end of file
+"""
+Core client, reverse-engineered signing and the caches around them.
+
+Names are imported on first access, so ``from grok_api.core import Signature`` does not pay
+for ``curl_cffi``, ``coincurve`` or ``asyncio``; those load with the classes that need them.
+"""
+from importlib import import_module
+from typing    import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .logger         import Log
+    from .hooks          import Hooks
+    from .runtime        import Run, Utils
+    from .store          import MappingStore, SQLiteMappingStore
+    from .pool           import SessionPool
+    from .verification   import VerificationCache
+    from .retry          import RetryPolicy, CircuitBreaker
+    from .responses      import ResponseCache, ResponseBackend, MemoryResponseBackend, SQLiteResponseBackend
+    from .headers        import Headers
+    from .payloads       import Payloads
+    from .reverse.parser import Parser
+    from .reverse.xctid  import Signature
+    from .reverse.anon   import Anon
+    from .grok           import Grok
+    from .async_grok     import AsyncGrok
+    from .exceptions     import (
+        GrokError,
+        GrokNetworkError,
+        GrokStreamError,
+        GrokParsingError,
+        GrokAuthError,
+        GrokSessionError,
+        GrokLimitError,
+        GrokRejectedError,
+        GrokCircuitOpenError
+    )
+
+# public name -> module that defines it
+_LAZY: dict = {
+    "Log": ".logger",
+    "Hooks": ".hooks",
+    "Run": ".runtime",
+    "Utils": ".runtime",
+    "MappingStore": ".store",
+    "SQLiteMappingStore": ".store",
+    "SessionPool": ".pool",
+    "VerificationCache": ".verification",
+    "RetryPolicy": ".retry",
+    "CircuitBreaker": ".retry",
+    "ResponseCache": ".responses",
+    "ResponseBackend": ".responses",
+    "MemoryResponseBackend": ".responses",
+    "SQLiteResponseBackend": ".responses",
+    "Headers": ".headers",
+    "Payloads": ".payloads",
+    "Parser": ".reverse.parser",
+    "Signature": ".reverse.xctid",
+    "Anon": ".reverse.anon",
+    "Grok": ".grok",
+    "AsyncGrok": ".async_grok",
+    "GrokError": ".exceptions",
+    "GrokNetworkError": ".exceptions",
+    "GrokStreamError": ".exceptions",
+    "GrokParsingError": ".exceptions",
+    "GrokAuthError": ".exceptions",
+    "GrokSessionError": ".exceptions",
+    "GrokLimitError": ".exceptions",
+    "GrokRejectedError": ".exceptions",
+    "GrokCircuitOpenError": ".exceptions",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,217 @@
+from .           import Log, Hooks, Parser, Headers
+from .grok       import Grok
+from .decoder    import Conversation
+from .exceptions import GrokNetworkError, GrokStreamError
+from curl_cffi   import requests
+from contextlib  import aclosing
+from typing      import AsyncGenerator, Optional
+from time        import perf_counter
+
+
+class AsyncGrok(Grok):
+    """
+    asyncio flavour of :class:`Grok` built on ``curl_cffi``'s ``AsyncSession``.
+
+    ``chat`` and ``chat_stream`` behave like their sync counterparts and produce
+    the same ``extra_data``, so conversations can move freely between both clients.
+    """
+
+    @staticmethod
+    def _create_session() -> requests.AsyncSession:
+        return requests.AsyncSession(impersonate="chrome136", default_headers=False)
+
+    def _acquire_session(self) -> requests.AsyncSession:
+        # AsyncSession is bound to the event loop it first ran on, so it is never pooled.
+        session = self._create_session()
+        if self.proxy:
+            session.proxies = {
+                "all": self.proxy
+            }
+        return session
+
+    async def __aenter__(self) -> "AsyncGrok":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    def close(self) -> None:
+        raise TypeError("AsyncGrok sessions are closed with 'await aclose()' or 'async with'")
+
+    async def aclose(self) -> None:
+        await self.session.close()
+
+    async def _load(self, extra_data: dict = None) -> None:
+
+        if not extra_data:
+            with Hooks.phase("load", self.model):
+                self.session.headers = Headers.LOAD
+                try:
+                    load_site: requests.models.Response = await self.session.get(f'{Parser.base_url}/c')
+                    load_site.raise_for_status()
+                except requests.errors.RequestsError as e:
+                    raise GrokNetworkError(f"Failed to load Grok: {e}")
+
+                self.session.cookies.update(load_site.cookies)
+
+                self._parse_page(load_site.text)
+                self.actions, self.xsid_script = await Parser.parse_grok_async(self.scripts)
+        else:
+            self._restore(extra_data)
+
+    async def c_request(self, next_action: str) -> None:
+
+        with Hooks.phase(f"c_request_{self.c_run}", self.model):
+            self._set_c_request_headers(next_action)
+
+            try:
+                if self.c_run == 0:
+                    c_request: requests.models.Response = await self.session.post(f"{Parser.base_url}/c", multipart=self._c_request_mime())
+                else:
+                    c_request: requests.models.Response = await self.session.post(f'{Parser.base_url}/c', data=self._c_request_data())
+                c_request.raise_for_status()
+            except requests.errors.RequestsError as e:
+                raise GrokNetworkError(f"Network error during c_request({self.c_run}): {e}")
+
+            self.session.cookies.update(c_request.cookies)
+
+            script_link: Optional[str] = self._handle_c_response(c_request.content)
+            if script_link is not None:
+                self.numbers = await Parser.txid_numbers_async(script_link)
+
+    async def _handshake(self, extra_data: dict = None) -> str:
+        if not extra_data:
+            await self._load()
+            await self.c_request(self.actions[0])
+        else:
+            self._resume(extra_data)
+            if self._reuse_verification():
+                return self._conversation_path(extra_data)
+        await self._verify()
+        return self._conversation_path(extra_data)
+
+    async def _verify(self) -> None:
+        await self.c_request(self.actions[1])
+        await self.c_request(self.actions[2])
+        self.verification.put(self.anon_user, self.verification_token, self.svg_data, self.numbers)
+
+    async def _stream_conversation(self, path: str, message: str, extra_data: dict = None) -> AsyncGenerator[dict, None]:
+        self._set_conversation_headers(path)
+
+        body: bytes = self._conversation_body(message, extra_data)
+        conversation = self._new_conversation(extra_data)
+        start: float = perf_counter()
+        first_token: Optional[float] = None
+
+        try:
+            response: requests.models.Response = await self.session.post(f'{Parser.base_url}{path}', data=body, stream=True, timeout=9999)
+        except requests.errors.RequestsError as e:
+            raise self._post_error(e)
+
+        try:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                event = conversation.feed_line(line)
+                if event is not None and event.token:
+                    first_token = first_token or perf_counter()
+                    yield {
+                        "token": event.token,
+                        "meta": None
+                    }
+        except requests.errors.RequestsError as e:
+            raise GrokStreamError(f"Network error during chat: {e}")
+        finally:
+            await response.aclose()
+
+        self._report_generation(conversation, start, first_token)
+
+    async def chat(self, message: str, extra_data: dict = None) -> dict:
+        async def attempt(n: int) -> dict:
+            if n == 1:
+                return await self._chat(message, extra_data)
+            async with type(self)(self.model, self.proxy) as grok:
+                return await grok._chat(message, extra_data)
+
+        async def call() -> dict:
+            with Hooks.phase("chat", self.model):
+                return await self.retry.call_async(attempt, self.proxy)
+
+        if extra_data or self.response_cache is None:
+            return await call()
+        return await self.response_cache.call_async(self.model, message, call, self.proxy)
+
+    async def chat_stream(self, message: str, extra_data: dict = None) -> AsyncGenerator[dict, None]:
+        async def attempt(n: int) -> AsyncGenerator[dict, None]:
+            if n == 1:
+                grok = self
+            else:
+                grok = type(self)(self.model, self.proxy)
+            try:
+                async with aclosing(grok._chat_stream(message, extra_data)) as chunks:
+                    async for chunk in chunks:
+                        yield chunk
+            finally:
+                if grok is not self:
+                    await grok.aclose()
+
+        async def stream() -> AsyncGenerator[dict, None]:
+            with Hooks.phase("chat", self.model):
+                async with aclosing(self.retry.stream_async(attempt, self.proxy)) as chunks:
+                    async for chunk in chunks:
+                        yield chunk
+
+        if extra_data or self.response_cache is None:
+            chunks = stream()
+        else:
+            chunks = self.response_cache.stream_async(self.model, message, stream, self.proxy)
+        async with aclosing(chunks):
+            async for chunk in chunks:
+                yield chunk
+
+    async def _chat(self, message: str, extra_data: dict = None) -> dict:
+        path: str = await self._handshake(extra_data)
+
+        while True:
+            try:
+                async for _ in self._stream_conversation(path, message, extra_data):
+                    pass
+            except GrokNetworkError:
+                if not self._verification_rejected(self.conversation):
+                    raise
+            else:
+                if not self._verification_rejected(self.conversation):
+                    break
+            await self._verify()
+
+        self._check_conversation(self.conversation)
+        return self._chat_result(self.conversation)
+
+    async def _chat_stream(self, message: str, extra_data: dict = None) -> AsyncGenerator[dict, None]:
+        path: str = await self._handshake(extra_data)
+
+        while True:
+            try:
+                async with aclosing(self._stream_conversation(path, message, extra_data)) as chunks:
+                    async for chunk in chunks:
+                        yield chunk
+            except GrokNetworkError:
+                if not self._verification_rejected(self.conversation):
+                    raise
+            else:
+                if not self._verification_rejected(self.conversation):
+                    break
+            await self._verify()
+
+        conversation: Conversation = self.conversation
+        if not conversation.tokens:
+            self._check_conversation(conversation)
+
+        # Yield final metadata needed for next turn
+        yield {
+            "token": None,
+            "meta": {
+                "response": "".join(conversation.tokens),
+                "images": conversation.images,
+                "extra_data": self._extra_data(conversation.conversation_id, conversation.response_id)
+            }
+        }
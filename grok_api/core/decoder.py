@@ -0,0 +1,168 @@
+from dataclasses import dataclass, field
+from typing      import Any, Callable, Optional, Tuple, Union
+from os          import environ
+from .exceptions import GrokLimitError
+import json
+
+TOKEN = "token"
+MODEL_RESPONSE = "modelResponse"
+CONVERSATION = "conversation"
+FINAL_METADATA = "finalMetadata"
+OTHER = "other"
+
+_backend: Optional[Tuple[str, Callable[[Union[bytes, str]], Any], Tuple[type, ...]]] = None
+
+
+def set_json_backend(name: str = None) -> str:
+    """
+    Select the JSON parser used for conversation lines: ``orjson``, ``msgspec`` or ``json``.
+
+    Without a name the ``GROK_API_JSON`` environment variable is used, falling back to the
+    fastest installed backend. Returns the name of the backend now in use.
+    """
+    global _backend
+    name = name or environ.get("GROK_API_JSON")
+
+    for candidate in ([name] if name else ["orjson", "msgspec", "json"]):
+        if candidate == "orjson":
+            try:
+                import orjson
+            except ImportError:
+                continue
+            _backend = ("orjson", orjson.loads, (orjson.JSONDecodeError,))
+        elif candidate == "msgspec":
+            try:
+                import msgspec
+            except ImportError:
+                continue
+            _backend = ("msgspec", msgspec.json.Decoder().decode, (msgspec.DecodeError,))
+        elif candidate == "json":
+            _backend = ("json", json.loads, (ValueError,))
+        else:
+            raise ValueError(f"Unknown JSON backend: {candidate}")
+        return _backend[0]
+
+    raise ImportError(f"JSON backend {name} is not installed")
+
+
+def json_backend() -> str:
+    if _backend is None:
+        set_json_backend()
+    return _backend[0]
+
+
+@dataclass(slots=True)
+class Event:
+    """One classified line of a conversation response."""
+    kind: str
+    token: Optional[str] = None
+    conversation_id: Optional[str] = None
+    response_id: Optional[str] = None
+    message: Optional[str] = None
+    images: Optional[list] = None
+    metadata: Optional[dict] = None
+
+
+def decode_line(line: Union[bytes, str]) -> Optional[Event]:
+    """
+    Decode one NDJSON line of either conversation shape.
+
+    New conversations nest the payload under ``result.response`` and announce the id in
+    ``result.conversation``; follow-ups put the same fields straight under ``result``.
+    Returns ``None`` for blank or undecodable lines.
+    """
+    if _backend is None:
+        set_json_backend()
+    _, loads, errors = _backend
+
+    if not line or line.isspace():
+        return None
+    try:
+        data = loads(line)
+    except errors:
+        return None
+
+    result = data.get("result") if isinstance(data, dict) else None
+    if not isinstance(result, dict):
+        return None
+
+    body = result.get("response")
+    if not isinstance(body, dict):
+        body = result
+
+    token = body.get("token")
+    if token is not None:
+        return Event(TOKEN, token=token)
+
+    model_response = body.get("modelResponse")
+    if isinstance(model_response, dict):
+        return Event(
+            MODEL_RESPONSE,
+            response_id=model_response.get("responseId"),
+            message=model_response.get("message"),
+            images=model_response.get("generatedImageUrls"),
+        )
+
+    conversation = result.get("conversation")
+    if isinstance(conversation, dict):
+        return Event(CONVERSATION, conversation_id=conversation.get("conversationId"))
+
+    metadata = body.get("finalMetadata")
+    if isinstance(metadata, dict):
+        return Event(FINAL_METADATA, metadata=metadata)
+
+    return Event(OTHER)
+
+
+@dataclass
+class Conversation:
+    """
+    Accumulates decoded events into what ``chat``/``chat_stream`` return; first value wins.
+
+    ``feed_line`` also enforces ``limit`` on the total response size and keeps the first
+    few undecodable bytes, which is where grok.com puts its error body.
+    """
+    conversation_id: Optional[str] = None
+    response_id: Optional[str] = None
+    message: Optional[str] = None
+    images: Optional[list] = None
+    metadata: Optional[dict] = None
+    tokens: list = field(default_factory=list)
+    completed: bool = False
+    limit: Optional[int] = None
+    size: int = 0
+    unparsed: bytearray = field(default_factory=bytearray)
+
+    UNPARSED_LIMIT = 4096
+
+    def feed(self, event: Event) -> Event:
+        match event.kind:
+            case "token":
+                if event.token:
+                    self.tokens.append(event.token)
+            case "modelResponse":
+                self.completed = True
+                self.response_id = self.response_id or event.response_id
+                self.message = self.message or event.message
+                self.images = self.images or event.images or None
+            case "conversation":
+                self.conversation_id = self.conversation_id or event.conversation_id
+            case "finalMetadata":
+                self.metadata = self.metadata or event.metadata
+        return event
+
+    def feed_line(self, line: Union[bytes, str]) -> Optional[Event]:
+        self.size += len(line) + 1
+        if self.limit is not None and self.size > self.limit:
+            raise GrokLimitError(f"Response exceeded {self.limit} bytes")
+
+        event = decode_line(line)
+        if event is None:
+            if line and len(self.unparsed) < self.UNPARSED_LIMIT:
+                self.unparsed += (line if isinstance(line, bytes) else line.encode())[:self.UNPARSED_LIMIT - len(self.unparsed)]
+            return None
+        return self.feed(event)
+
+    @property
+    def error_text(self) -> str:
+        return self.unparsed.decode("utf-8", "replace")
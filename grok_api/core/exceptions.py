@@ -6,6 +6,10 @@ class GrokNetworkError(GrokError):
     """Exception raised for network-related errors."""
     pass
 
+class GrokStreamError(GrokNetworkError):
+    """Exception raised when the connection fails after a conversation turn was sent; the turn may already exist upstream, so it is never retried."""
+    pass
+
 class GrokParsingError(GrokError):
     """Exception raised when parsing response from Grok fails."""
     pass
@@ -17,3 +21,15 @@ class GrokAuthError(GrokError):
 class GrokSessionError(GrokError):
     """Exception raised for session or cookie related issues."""
     pass
+
+class GrokLimitError(GrokError):
+    """Exception raised when a response exceeds a configured limit."""
+    pass
+
+class GrokRejectedError(GrokError):
+    """Exception raised when grok.com rejects a request as automated traffic."""
+    pass
+
+class GrokCircuitOpenError(GrokError):
+    """Exception raised instead of calling grok.com while the circuit breaker is open."""
+    pass
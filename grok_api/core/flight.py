@@ -0,0 +1,301 @@
+from dataclasses import dataclass
+from typing      import Any, Dict, List, Optional, Tuple, Union
+from .exceptions import GrokParsingError
+import json
+
+# Tags of rows whose payload is ``<tag><hex length>,`` followed by that many raw bytes: text,
+# ArrayBuffer and the typed arrays React serializes as binary chunks.
+BINARY_TAGS: frozenset = frozenset(b"TAOoUSsLlGgMmVb")
+# Path data shorter than this is decoration, not one of the loading animation SVGs.
+SVG_MIN_LENGTH: int = 201
+
+_raw_decode = json.JSONDecoder().raw_decode
+
+
+@dataclass(slots=True)
+class FlightRow:
+    """
+    One row of a flight response. ``raw`` is the payload as sent; ``value`` decodes it on
+    access: bytes for binary rows, a str for text rows, else the row's JSON.
+    """
+    id: int
+    tag: str
+    raw: bytes
+    binary: bool = False
+
+    @property
+    def value(self) -> Any:
+        if self.binary:
+            return self.raw.decode() if self.tag == "T" else self.raw
+        return _decode(self.raw)[0]
+
+
+# ``(id, tag, payload, is binary)``: rows as :func:`_scan` finds them, before any decoding.
+RawRow = Tuple[int, str, bytes, bool]
+
+
+def _scan(buffer: Union[bytes, bytearray], final: bool) -> Tuple[List[RawRow], int]:
+    """
+    Split ``buffer`` into rows without decoding them; return the rows and how far it got.
+
+    Headers are found with ``bytes.find`` and binary rows are sliced by their declared
+    length. Lines that are not rows are skipped. Unless ``final``, a row cut off by the end
+    of the buffer is left for the next call.
+    """
+    rows: List[RawRow] = []
+    append = rows.append
+    find = buffer.find
+    size: int = len(buffer)
+    pos: int = 0
+
+    while pos < size:
+        colon: int = find(b":", pos, pos + 17)
+        try:
+            # ``int`` also skips the newline that ends the row before.
+            row_id: int = int(buffer[pos:colon], 16) if colon != -1 else -1
+        except ValueError:
+            row_id = -1
+        if row_id < 0:
+            if buffer[pos:].isspace():
+                pos = size
+                break
+            newline: int = find(b"\n", pos)
+            if newline == -1:
+                if not final and size - pos < 17:
+                    break
+                newline = size
+            pos = newline + 1
+            continue
+
+        start: int = colon + 1
+        if start == size:
+            if not final:
+                break
+            append((row_id, "", b"", False))
+            pos = size
+            continue
+
+        first: int = buffer[start]
+        if first in BINARY_TAGS:
+            comma: int = find(b",", start + 1, start + 18)
+            try:
+                end: int = comma + 1 + int(buffer[start + 1:comma], 16) if comma != -1 else -1
+            except ValueError:
+                end = -1
+            if end > size:
+                break
+            if end >= 0:
+                append((row_id, chr(first), buffer[comma + 1:end], True))
+                pos = end
+                continue
+
+        newline = find(b"\n", start)
+        if newline == -1:
+            # Also covers a binary header whose length is still on its way.
+            if not final:
+                break
+            newline = size
+
+        if 65 <= first <= 90:
+            tag_end: int = start + 1
+            while tag_end < newline and 65 <= buffer[tag_end] <= 90:
+                tag_end += 1
+            append((row_id, buffer[start:tag_end].decode(), buffer[tag_end:newline], False))
+        else:
+            append((row_id, "", buffer[start:newline], False))
+        pos = newline + 1
+
+    return rows, min(pos, size)
+
+
+def _decode(raw: bytes) -> Tuple[Any, List[RawRow]]:
+    """JSON of a row, plus any rows grok.com glued to the end of its line without a newline."""
+    line: str = raw.decode("utf-8", "surrogateescape")
+    try:
+        value, stop = _raw_decode(line)
+    except ValueError:
+        raise GrokParsingError("Malformed JSON flight row in server action response.")
+
+    tail: str = line[stop:]
+    if not tail or tail.isspace():
+        return value, []
+    return value, _scan(tail.encode("utf-8", "surrogateescape"), final=True)[0]
+
+
+class FlightDecoder:
+    """
+    Incremental parser for the React Server Components "flight" rows Next.js server actions answer with.
+
+    Each row is ``<hex id>:<payload>``. Binary payloads carry their length and are sliced
+    straight out of the buffer; every other row runs to the end of its line and is only
+    decoded when its ``value`` is read. Rows with tags it does not know are kept, not
+    rejected. Bytes can be fed as they arrive; an incomplete trailing row waits for more
+    data or for :meth:`close`.
+    """
+
+    def __init__(self) -> None:
+        self.rows: Dict[int, FlightRow] = {}
+        self._buffer: bytearray = bytearray()
+
+    def feed(self, data: bytes) -> List[FlightRow]:
+        self._buffer += data
+        rows, pos = _scan(self._buffer, final=False)
+        del self._buffer[:pos]
+        return self._register(rows)
+
+    def close(self) -> List[FlightRow]:
+        rows, pos = _scan(self._buffer, final=True)
+        truncated: bool = bool(self._buffer[pos:].strip())
+        self._buffer.clear()
+        if truncated:
+            raise GrokParsingError("Truncated flight row in server action response.")
+        return self._register(rows)
+
+    def _register(self, raw_rows: List[RawRow]) -> List[FlightRow]:
+        rows: List[FlightRow] = [FlightRow(row_id, tag, bytes(raw), binary) for row_id, tag, raw, binary in raw_rows]
+        for row in rows:
+            self.rows[row.id] = row
+        return rows
+
+
+class ActionResponse:
+    """
+    What the anonymous handshake needs from a server action response.
+
+    Each field is worked out on first access and touches only what it needs: the stage 1
+    challenge is sliced out of the ArrayBuffer (``o``) row found with ``bytes.find``, without
+    splitting or decoding anything else, ``anon_user_id`` decodes the small model rows of
+    stages 0 and 1 and only the verification fields of stage 2 walk the rendered page.
+    """
+
+    __slots__ = ("content", "verification", "_rows", "_values", "_page")
+
+    def __init__(self, content: bytes, verification: str = "grok-site-verification") -> None:
+        self.content: bytes = content
+        self.verification: str = verification
+        self._rows: Optional[List[RawRow]] = None
+        self._values: Optional[List[Any]] = None
+        self._page: Optional[Tuple[Optional[str], List[str]]] = None
+
+    @property
+    def rows(self) -> List[RawRow]:
+        if self._rows is None:
+            self._rows = _scan(self.content, final=True)[0]
+        return self._rows
+
+    @property
+    def challenge(self) -> Optional[bytes]:
+        content: bytes = self.content
+        find = content.find
+        colon: int = find(b":o")
+        while colon != -1:
+            comma: int = find(b",", colon + 2, colon + 19)
+            if comma != -1:
+                try:
+                    # Only a header at the start of a line counts; ``:o`` can also occur inside a string.
+                    int(content[content.rfind(b"\n", 0, colon) + 1:colon], 16)
+                    end: int = comma + 1 + int(content[colon + 2:comma], 16)
+                except ValueError:
+                    end = -1
+                if 0 <= end <= len(content):
+                    return content[comma + 1:end]
+            colon = find(b":o", colon + 2)
+        return self._referenced_challenge()
+
+    def _referenced_challenge(self) -> Optional[bytes]:
+        """Challenge of a response whose binary row is glued onto another row: follow ``"challenge":"$<id>"``."""
+        values: List[Any] = self._decoded()
+        binary: Dict[int, bytes] = {row_id: raw for row_id, tag, raw, is_binary in self.rows if is_binary and tag != "T"}
+        for value in values:
+            reference = value.get("challenge") if type(value) is dict else None
+            if type(reference) is str and reference.startswith("$"):
+                try:
+                    challenge: Optional[bytes] = binary.get(int(reference[1:], 16))
+                except ValueError:
+                    continue
+                if challenge is not None:
+                    return challenge
+        return next(iter(binary.values()), None)
+
+    def _decoded(self) -> List[Any]:
+        """Decoded model rows in order, including rows glued onto another row's line."""
+        if self._values is None:
+            values: List[Any] = []
+            pending: List[RawRow] = self.rows[::-1]
+            while pending:
+                _, tag, raw, binary = pending.pop()
+                if binary or tag:
+                    continue
+                try:
+                    value, glued = _decode(raw)
+                except GrokParsingError:
+                    # A row that is cut off or not JSON only matters if it held a field a stage needs.
+                    continue
+                values.append(value)
+                if glued:
+                    self.rows.extend(glued)
+                    pending.extend(reversed(glued))
+            self._values = values
+        return self._values
+
+    @property
+    def anon_user_id(self) -> Optional[str]:
+        for value in self._decoded():
+            anon_user_id = value.get("anonUserId") if type(value) is dict else None
+            if type(anon_user_id) is str:
+                return anon_user_id
+        return None
+
+    @property
+    def verification_token(self) -> Optional[str]:
+        return self._rendered()[0]
+
+    @property
+    def svg_paths(self) -> List[str]:
+        return self._rendered()[1]
+
+    def _rendered(self) -> Tuple[Optional[str], List[str]]:
+        """``(verification_token, svg_paths)`` from the React elements the action rendered."""
+        if self._page is not None:
+            return self._page
+
+        token: Optional[str] = None
+        svg_paths: List[str] = []
+
+        # React elements are ["$", type, key, props]; walk them in document order.
+        stack: list = [value for value in reversed(self._decoded()) if type(value) is list]
+        while stack:
+            node = stack.pop()
+            if type(node) is not list or not node:
+                continue
+            if node[0] != "$":
+                stack.extend(reversed(node))
+                continue
+
+            props = node[3] if len(node) == 4 else None
+            if type(props) is not dict:
+                continue
+            kind = node[1]
+            if kind == "path":
+                d = props.get("d")
+                if type(d) is str and len(d) >= SVG_MIN_LENGTH and d.startswith("M"):
+                    svg_paths.append(d)
+            elif kind == "meta" and token is None and props.get("name") == self.verification:
+                token = props.get("content")
+
+            children = props.get("children")
+            if children is not None:
+                stack.append(children)
+
+        self._page = (token, svg_paths)
+        return self._page
+
+
+def decode_action(content: bytes, verification: str = "grok-site-verification") -> ActionResponse:
+    """
+    Wrap a whole server action response; nothing is split or decoded until a field is read.
+
+    Unknown or truncated rows do not fail here; a stage fails only if a field it needs is
+    missing.
+    """
+    return ActionResponse(content, verification)
@@ -1,12 +1,22 @@
-from .           import Log, Run, Utils, Parser, Signature, Anon, Headers
-from .exceptions import GrokError, GrokNetworkError, GrokParsingError, GrokAuthError, GrokSessionError
+from .           import Log, Hooks, Run, Parser, Signature, Anon, Headers
+from .exceptions import GrokError, GrokNetworkError, GrokStreamError, GrokParsingError, GrokAuthError, GrokSessionError, GrokLimitError, GrokRejectedError
+from .decoder    import Conversation
+from .flight     import ActionResponse, decode_action
+from .pool       import SessionPool, sessions
+from .verification import VerificationCache
+from .retry      import RetryPolicy
+from .payloads   import Payloads
+from .responses  import ResponseCache
 from curl_cffi   import requests, CurlMime
 from dataclasses import dataclass, field
-from bs4         import BeautifulSoup
-from json        import dumps, loads
+from json        import dumps
 from secrets     import token_hex
 from uuid        import uuid4
-from typing      import Generator
+from typing      import Generator, Optional
+from time        import perf_counter
+
+# curl errors that mean a request never left: proxy or host resolution, connect and TLS handshake.
+NOT_SENT: frozenset = frozenset({5, 6, 7, 35})
 
 @dataclass
 class Models:
@@ -23,9 +33,24 @@ class Models:
 _Models = Models()
 
 class Grok:
+    # Upper bound on the bytes read from one conversation response; ``None`` disables it.
+    max_response_bytes: Optional[int] = 32 * 1024 * 1024
+
+    # Sessions are leased from a shared pool so handshakes reuse warm connections.
+    sessions: SessionPool = sessions
+    # Follow-up turns sign with the verification material of the last full handshake.
+    verification: VerificationCache = VerificationCache()
+    # Rejected or failed conversations are retried on a fresh instance under this policy.
+    retry: RetryPolicy = RetryPolicy()
+    # Opt-in cache of first-turn answers, with identical in-flight prompts coalesced; ``None`` disables it.
+    response_cache: Optional[ResponseCache] = None
+
     def __init__(self, model: str = "grok-3-auto", proxy: str = None) -> None:
-        self.session: requests.session.Session = requests.Session(impersonate="chrome136", default_headers=False)
-        self.headers: Headers = Headers()
+        self.proxy: Optional[str] = proxy
+        self.session: requests.session.Session = self._acquire_session()
+        # The in-flight conversation; its ids are filled in while the response streams.
+        self.conversation: Optional[Conversation] = None
+        self.reused_verification: bool = False
 
         self.model_mode: str = _Models.get_model_mode(model, 0)
         self.mode: str = _Models.get_model_mode(model, 1)
@@ -34,365 +59,388 @@ class Grok:
 
         self.c_run: int = 0
         self.keys: dict = Anon.generate_keys()
-        if proxy:
-            self.session.proxies = {
-                "all": proxy
-            }
 
-    def _load(self, extra_data: dict = None) -> None:
+    @staticmethod
+    def _create_session() -> requests.session.Session:
+        return requests.Session(impersonate="chrome136", default_headers=False)
 
-        if not extra_data:
-            self.session.headers = self.headers.LOAD
-            try:
-                load_site: requests.models.Response = self.session.get('https://grok.com/c')
-                load_site.raise_for_status()
-            except requests.errors.RequestError as e:
-                raise GrokNetworkError(f"Failed to load Grok: {e}")
+    def _acquire_session(self) -> requests.session.Session:
+        return self.sessions.acquire(self.proxy, self._create_session)
 
-            self.session.cookies.update(load_site.cookies)
+    def __enter__(self) -> "Grok":
+        return self
 
-            scripts: list = [s['src'] for s in BeautifulSoup(load_site.text, 'html.parser').find_all('script', src=True) if s['src'].startswith('/_next/static/chunks/')]
-            if not scripts:
-                raise GrokParsingError("Failed to find necessary scripts on Grok site.")
+    def __exit__(self, *args) -> None:
+        self.close()
 
-            self.actions, self.xsid_script = Parser.parse_grok(scripts)
+    def close(self) -> None:
+        """Hand the session back to the pool; the instance must not be used afterwards."""
+        if self.session is not None:
+            self.sessions.release(self.session, self.proxy)
+            self.session = None
 
-            self.baggage: str = Utils.between(load_site.text, '<meta name="baggage" content="', '"')
-            self.sentry_trace: str = Utils.between(load_site.text, '<meta name="sentry-trace" content="', '-')
+    def _load(self, extra_data: dict = None) -> None:
 
-            if not self.baggage or not self.sentry_trace:
-                raise GrokParsingError("Failed to parse metadata from Grok site.")
-        else:
-            self.session.cookies.update(extra_data["cookies"])
+        if not extra_data:
+            with Hooks.phase("load", self.model):
+                self.session.headers = Headers.LOAD
+                try:
+                    load_site: requests.models.Response = self.session.get(f'{Parser.base_url}/c')
+                    load_site.raise_for_status()
+                except requests.errors.RequestsError as e:
+                    raise GrokNetworkError(f"Failed to load Grok: {e}")
 
-            self.actions: list = extra_data["actions"]
-            self.xsid_script: list =  extra_data["xsid_script"]
-            self.baggage: str = extra_data["baggage"]
-            self.sentry_trace: str = extra_data["sentry_trace"]
+                self.session.cookies.update(load_site.cookies)
 
+                self._parse_page(load_site.text)
+                self.actions, self.xsid_script = Parser.parse_grok(self.scripts)
+        else:
+            self._restore(extra_data)
 
-    def c_request(self, next_action: str) -> None:
+    def _parse_page(self, html: str) -> None:
+        self.scripts, self.baggage, self.sentry_trace = Parser.parse_page(html)
 
-        self.session.headers = self.headers.C_REQUEST
-        self.session.headers.update({
-            'baggage': self.baggage,
-            'next-action': next_action,
-            'sentry-trace': f'{self.sentry_trace}-{str(uuid4()).replace("-", "")[:16]}-0',
-        })
-        self.session.headers = Headers.fix_order(self.session.headers, self.headers.C_REQUEST)
+        if not self.scripts:
+            raise GrokParsingError("Failed to find necessary scripts on Grok site.")
+        if not self.baggage or not self.sentry_trace:
+            raise GrokParsingError("Failed to parse metadata from Grok site.")
 
-        if self.c_run == 0:
-            self.session.headers.pop("content-type", None)
+    def _restore(self, extra_data: dict) -> None:
+        self.session.cookies.update(extra_data["cookies"])
 
-            mime = CurlMime()
-            mime.addpart(name="1", data=bytes(self.keys["userPublicKey"]), filename="blob", content_type="application/octet-stream")
-            mime.addpart(name="0", filename=None, data='[{"userPublicKey":"$o1"}]')
+        self.actions: list = extra_data["actions"]
+        self.xsid_script: list =  extra_data["xsid_script"]
+        self.baggage: str = extra_data["baggage"]
+        self.sentry_trace: str = extra_data["sentry_trace"]
 
-            try:
-                c_request: requests.models.Response = self.session.post("https://grok.com/c", multipart=mime)
-                c_request.raise_for_status()
-            except requests.errors.RequestError as e:
-                raise GrokNetworkError(f"Network error during c_request(0): {e}")
 
-            self.session.cookies.update(c_request.cookies)
+    def _set_c_request_headers(self, next_action: str) -> None:
+        self.session.headers = Headers.overlay(Headers.C_REQUEST_MULTIPART if self.c_run == 0 else Headers.C_REQUEST, {
+            'baggage': self.baggage,
+            'next-action': next_action,
+            'sentry-trace': f'{self.sentry_trace}-{uuid4().hex[:16]}-0',
+        })
 
-            self.anon_user: str = Utils.between(c_request.text, '{"anonUserId":"', '"')
-            if not self.anon_user:
-                raise GrokParsingError("Failed to parse anonUserId from c_request.")
-            self.c_run += 1
+    def _c_request_mime(self) -> CurlMime:
+        mime = CurlMime()
+        mime.addpart(name="1", data=bytes(self.keys["userPublicKey"]), filename="blob", content_type="application/octet-stream")
+        mime.addpart(name="0", filename=None, data='[{"userPublicKey":"$o1"}]')
+        return mime
+
+    def _c_request_data(self) -> str:
+        match self.c_run:
+            case 1:
+                return dumps([{"anonUserId":self.anon_user}])
+            case 2:
+                return dumps([{"anonUserId":self.anon_user,**self.challenge_dict}])
+
+    def _handle_c_response(self, content: bytes) -> Optional[str]:
+        """
+        Consume the server-action response of the current stage and advance ``c_run``.
+
+        After the last stage, return the xsid script link whose txid numbers the caller still
+        has to look up, so the sync and async clients can fetch it their own way.
+        """
+        action: ActionResponse = decode_action(content)
+        script_link: Optional[str] = None
+
+        match self.c_run:
+            case 0:
+                self.anon_user: str = action.anon_user_id
+                if not self.anon_user:
+                    raise GrokParsingError("Failed to parse anonUserId from c_request.")
+            case 1:
+                if not action.challenge:
+                    raise GrokParsingError("Failed to find challenge bytes in c_request.")
+
+                self.challenge_dict: dict = Anon.sign_challenge(action.challenge, self.keys["privateKey"])
+                Log.Success("Solved Challenge: %s", self.challenge_dict)
+            case 2:
+                self.verification_token, self.anim, self.svg_data = Parser.verification(action)
+                self._check_verification()
+                script_link = Parser._script_link(content, self.xsid_script)
+
+        self.c_run += 1
+        return script_link
+
+    def _check_verification(self) -> None:
+        if not self.verification_token or not self.svg_data:
+             raise GrokParsingError("Failed to parse verification token or SVG data.")
 
-        else:
+    def c_request(self, next_action: str) -> None:
 
-            match self.c_run:
-                case 1:
-                    data: str = dumps([{"anonUserId":self.anon_user}])
-                case 2:
-                    data: str = dumps([{"anonUserId":self.anon_user,**self.challenge_dict}])
+        with Hooks.phase(f"c_request_{self.c_run}", self.model):
+            self._set_c_request_headers(next_action)
 
             try:
-                c_request: requests.models.Response = self.session.post('https://grok.com/c', data=data)
+                if self.c_run == 0:
+                    c_request: requests.models.Response = self.session.post(f"{Parser.base_url}/c", multipart=self._c_request_mime())
+                else:
+                    c_request: requests.models.Response = self.session.post(f'{Parser.base_url}/c', data=self._c_request_data())
                 c_request.raise_for_status()
-            except requests.errors.RequestError as e:
+            except requests.errors.RequestsError as e:
                 raise GrokNetworkError(f"Network error during c_request({self.c_run}): {e}")
 
             self.session.cookies.update(c_request.cookies)
-
-            match self.c_run:
-                case 1:
-                    start_idx = c_request.content.hex().find("3a6f38362c")
-                    if start_idx != -1:
-                        start_idx += len("3a6f38362c")
-                        end_idx = c_request.content.hex().find("313a", start_idx)
-                        if end_idx != -1:
-                            challenge_hex = c_request.content.hex()[start_idx:end_idx]
-                            challenge_bytes = bytes.fromhex(challenge_hex)
-                        else:
-                             raise GrokParsingError("Failed to find end index for challenge hex.")
-                    else:
-                         raise GrokParsingError("Failed to find start index for challenge hex.")
-
-                    self.challenge_dict: dict = Anon.sign_challenge(challenge_bytes, self.keys["privateKey"])
-                    Log.Success(f"Solved Challenge: {self.challenge_dict}")
-                case 2:
-                    self.verification_token, self.anim = Parser.get_anim(c_request.text, "grok-site-verification")
-                    self.svg_data, self.numbers = Parser.parse_values(c_request.text, self.anim, self.xsid_script)
-
-                    if not self.verification_token or not self.svg_data:
-                         raise GrokParsingError("Failed to parse verification token or SVG data.")
-
-            self.c_run += 1
-
-
-    def _get_conversation_data(self, message: str, extra_data: dict = None) -> dict:
-        """Helper to build conversation data payload."""
+            script_link: Optional[str] = self._handle_c_response(c_request.content)
+            if script_link is not None:
+                self.numbers = Parser.txid_numbers(script_link)
+
+    def _conversation_body(self, message: str, extra_data: dict = None) -> bytes:
+        """Serialized conversation payload, spliced into the precompiled template for this model."""
+        parent_response: Optional[str] = extra_data["parentResponseId"] if extra_data else None
+        return Payloads.conversation(message, self.model, self.model_mode, self.mode, parent_response, follow_up=bool(extra_data))
+
+    def _resume(self, extra_data: dict) -> None:
+        self._restore(extra_data)
+        self.c_run: int = 1
+        self.anon_user: str = extra_data["anon_user"]
+        self.keys["privateKey"] = extra_data["privateKey"]
+
+    @staticmethod
+    def _conversation_path(extra_data: dict = None) -> str:
         if not extra_data:
-            return {
-                'temporary': False,
-                'modelName': self.model,
-                'message': message,
-                'fileAttachments': [],
-                'imageAttachments': [],
-                'disableSearch': False,
-                'enableImageGeneration': True,
-                'returnImageBytes': False,
-                'returnRawGrokInXaiRequest': False,
-                'enableImageStreaming': True,
-                'imageGenerationCount': 2,
-                'forceConcise': False,
-                'toolOverrides': {},
-                'enableSideBySide': True,
-                'sendFinalMetadata': True,
-                'isReasoning': "THINKING" in self.model_mode,
-                'webpageUrls': [],
-                'disableTextFollowUps': False,
-                'responseMetadata': {
-                    'requestModelDetails': {
-                        'modelId': self.model,
-                    },
-                },
-                'disableMemory': False,
-                'forceSideBySide': False,
-                'modelMode': self.model_mode,
-                'isAsyncChat': False,
-            }
-        else:
-            return {
-                'message': message,
-                'modelName': self.model,
-                'parentResponseId': extra_data["parentResponseId"],
-                'disableSearch': False,
-                'enableImageGeneration': True,
-                'imageAttachments': [],
-                'returnImageBytes': False,
-                'returnRawGrokInXaiRequest': False,
-                'fileAttachments': [],
-                'enableImageStreaming': True,
-                'imageGenerationCount': 2,
-                'forceConcise': False,
-                'toolOverrides': {},
-                'enableSideBySide': True,
-                'sendFinalMetadata': True,
-                'customPersonality': '',
-                'isReasoning': "THINKING" in self.model_mode,
-                'webpageUrls': [],
-                'metadata': {
-                    'requestModelDetails': {
-                        'modelId': self.model,
-                    },
-                    'request_metadata': {
-                        'model': self.model,
-                        'mode': self.mode,
-                    },
-                },
-                'disableTextFollowUps': False,
-                'disableArtifact': False,
-                'isFromGrokFiles': False,
-                'disableMemory': False,
-                'forceSideBySide': False,
-                'modelMode': self.model_mode,
-                'isAsyncChat': False,
-                'skipCancelCurrentInflightRequests': False,
-                'isRegenRequest': False,
-            }
+            return '/rest/app-chat/conversations/new'
+        return f'/rest/app-chat/conversations/{extra_data["conversationId"]}/responses'
 
-    def chat(self, message: str, extra_data: dict = None) -> dict:
+    def _handshake(self, extra_data: dict = None) -> str:
+        """Run the page load and server-action handshake, returning the conversation URL."""
         if not extra_data:
             self._load()
             self.c_request(self.actions[0])
-            self.c_request(self.actions[1])
-            self.c_request(self.actions[2])
-            xsid: str = Signature.generate_sign('/rest/app-chat/conversations/new', 'POST', self.verification_token, self.svg_data, self.numbers)
-            url = 'https://grok.com/rest/app-chat/conversations/new'
         else:
-            self._load(extra_data)
-            self.c_run: int = 1
-            self.anon_user: str = extra_data["anon_user"]
-            self.keys["privateKey"] = extra_data["privateKey"]
-            self.c_request(self.actions[1])
-            self.c_request(self.actions[2])
-            xsid: str = Signature.generate_sign(f'/rest/app-chat/conversations/{extra_data["conversationId"]}/responses', 'POST', self.verification_token, self.svg_data, self.numbers)
-            url = f'https://grok.com/rest/app-chat/conversations/{extra_data["conversationId"]}/responses'
-
-        self.session.headers = self.headers.CONVERSATION
-        self.session.headers.update({
+            self._resume(extra_data)
+            if self._reuse_verification():
+                return self._conversation_path(extra_data)
+        self._verify()
+        return self._conversation_path(extra_data)
+
+    def _verify(self) -> None:
+        self.c_request(self.actions[1])
+        self.c_request(self.actions[2])
+        self.verification.put(self.anon_user, self.verification_token, self.svg_data, self.numbers)
+
+    def _reuse_verification(self) -> bool:
+        cached = self.verification.get(self.anon_user)
+        if cached is None:
+            return False
+
+        self.verification_token, self.svg_data, self.numbers = cached
+        self.reused_verification = True
+        return True
+
+    def _verification_rejected(self, conversation: Optional[Conversation]) -> bool:
+        """
+        Return True when grok.com refused a turn signed with reused verification material, that is
+        the turn ended with the anti-bot error before any token arrived. The cached entry is dropped
+        so the caller can re-run the handshake once. Network errors and other error bodies say
+        nothing about the material and are left to the caller; a reused turn that went through
+        lets the reuse window grow back.
+        """
+        if not self.reused_verification or conversation is None:
+            return False
+
+        if conversation.completed or conversation.tokens:
+            self.verification.accept(self.anon_user)
+            return False
+        if not self._anti_bot(conversation):
+            return False
+
+        Log.Info("Cached verification rejected, re-running handshake...")
+        self.verification.reject(self.anon_user)
+        self.reused_verification = False
+        return True
+
+    def _set_conversation_headers(self, path: str) -> None:
+        with Hooks.phase("sign", self.model):
+            xsid: str = Signature.generate_sign(path, 'POST', self.verification_token, self.svg_data, self.numbers)
+
+        self.session.headers = Headers.overlay(Headers.CONVERSATION, {
             'baggage': self.baggage,
-            'sentry-trace': f'{self.sentry_trace}-{str(uuid4()).replace("-", "")[:16]}-0',
+            'sentry-trace': f'{self.sentry_trace}-{uuid4().hex[:16]}-0',
             'x-statsig-id': xsid,
             'x-xai-request-id': str(uuid4()),
             'traceparent': f"00-{token_hex(16)}-{token_hex(8)}-00"
         })
-        self.session.headers = Headers.fix_order(self.session.headers, self.headers.CONVERSATION)
 
-        conversation_data = self._get_conversation_data(message, extra_data)
+    def _extra_data(self, conversation_id: str, parent_response: str) -> dict:
+        return {
+            "anon_user": self.anon_user,
+            "cookies": self.session.cookies.get_dict(),
+            "actions": self.actions,
+            "xsid_script": self.xsid_script,
+            "baggage": self.baggage,
+            "sentry_trace": self.sentry_trace,
+            "conversationId": conversation_id,
+            "parentResponseId": parent_response,
+            "privateKey": self.keys["privateKey"]
+        }
+
+    def _new_conversation(self, extra_data: dict = None) -> Conversation:
+        self.conversation = Conversation(
+            extra_data.get("conversationId") if extra_data else None,
+            limit=self.max_response_bytes
+        )
+        return self.conversation
+
+    def _parse_conversation(self, text: str, extra_data: dict = None) -> dict:
+        """Build the ``chat`` result from a fully buffered NDJSON conversation response."""
+        conversation = self._new_conversation(extra_data)
+
+        for line in text.strip().split('\n'):
+            conversation.feed_line(line)
+
+        return self._chat_result(conversation)
+
+    def _chat_result(self, conversation: Conversation) -> dict:
+        return {
+            "response": conversation.message,
+            "stream_response": conversation.tokens,
+            "images": conversation.images,
+            "extra_data": self._extra_data(conversation.conversation_id, conversation.response_id)
+        }
+
+    @staticmethod
+    def _anti_bot(conversation: Conversation) -> bool:
+        return 'rejected by anti-bot rules' in conversation.error_text
+
+    def _check_conversation(self, conversation: Conversation) -> None:
+        """Raise if grok.com answered with an error body instead of a model response."""
+        if conversation.completed:
+            return
+
+        if self._anti_bot(conversation):
+            Log.Info("Anti-bot detected, retrying with new session...")
+            raise GrokRejectedError(f"Grok API error: {conversation.error_text}")
+
+        Log.Error("Grok Error: %s", conversation.error_text)
+        raise GrokError(f"Grok API error: {conversation.error_text}")
+
+    def _stream_conversation(self, path: str, message: str, extra_data: dict = None) -> Generator[dict, None, None]:
+        """Post one conversation turn and yield its tokens; the decoded turn is left in ``self.conversation``."""
+        self._set_conversation_headers(path)
+
+        body: bytes = self._conversation_body(message, extra_data)
+        conversation = self._new_conversation(extra_data)
+        start: float = perf_counter()
+        first_token: Optional[float] = None
 
         try:
-            convo_request: requests.models.Response = self.session.post(url, json=conversation_data, timeout=9999)
-            convo_request.raise_for_status()
-        except requests.errors.RequestError as e:
-            raise GrokNetworkError(f"Network error during chat: {e}")
+            response: requests.models.Response = self.session.post(f'{Parser.base_url}{path}', data=body, stream=True, timeout=9999)
+        except requests.errors.RequestsError as e:
+            raise self._post_error(e)
 
-        if "modelResponse" in convo_request.text:
-            response = conversation_id = parent_response = image_urls = None
-            stream_response: list = []
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                event = conversation.feed_line(line)
+                if event is not None and event.token:
+                    first_token = first_token or perf_counter()
+                    yield {
+                        "token": event.token,
+                        "meta": None
+                    }
+        except requests.errors.RequestsError as e:
+            raise GrokStreamError(f"Network error during chat: {e}")
+        finally:
+            response.close()
+
+        self._report_generation(conversation, start, first_token)
+
+    @staticmethod
+    def _post_error(e: Exception) -> GrokNetworkError:
+        """
+        Error for a conversation POST that failed. Only a failure before the request left may be
+        retried; anything later raises :class:`GrokStreamError`, since grok.com may already have
+        the turn and a retry would post it again.
+        """
+        if getattr(e, "code", 0) in NOT_SENT:
+            return GrokNetworkError(f"Network error during chat: {e}")
+        return GrokStreamError(f"Network error during chat: {e}")
+
+    def _report_generation(self, conversation: Conversation, start: float, first_token: Optional[float]) -> None:
+        if not Hooks.listeners or not first_token:
+            return
+
+        duration: float = perf_counter() - start
+        Hooks.emit("phase", phase="ttft", model=self.model, duration=first_token - start, error=None)
+        Hooks.emit("phase", phase="generation", model=self.model, duration=duration, error=None)
+        Hooks.emit("tokens", model=self.model, count=len(conversation.tokens), duration=duration)
 
-            for response_dict in convo_request.text.strip().split('\n'):
-                try:
-                    data: dict = loads(response_dict)
-                except Exception:
-                    continue
-
-                if not extra_data:
-                    token: str = data.get('result', {}).get('response', {}).get('token')
-                    if not conversation_id and data.get('result', {}).get('conversation', {}).get('conversationId'):
-                        conversation_id: str = data['result']['conversation']['conversationId']
-                    if not parent_response and data.get('result', {}).get('response', {}).get('modelResponse', {}).get('responseId'):
-                        parent_response: str = data['result']['response']['modelResponse']['responseId']
-                    if not image_urls and data.get('result', {}).get('response', {}).get('modelResponse', {}).get('generatedImageUrls', {}):
-                        image_urls: str = data['result']['response']['modelResponse']['generatedImageUrls']
-                else:
-                    token: str = data.get('result', {}).get('token')
-                    if not parent_response and data.get('result', {}).get('modelResponse', {}).get('responseId'):
-                        parent_response: str = data['result']['modelResponse']['responseId']
-                    if not image_urls and data.get('result', {}).get('modelResponse', {}).get('generatedImageUrls', {}):
-                        image_urls: str = data['result']['modelResponse']['generatedImageUrls']
-                    conversation_id = extra_data["conversationId"]
-
-                if token:
-                    stream_response.append(token)
-
-                if not response and data.get('result', {}).get('modelResponse', {}).get('message'):
-                    response: str = data['result']['modelResponse']['message']
-                elif not response and not extra_data and data.get('result', {}).get('response', {}).get('modelResponse', {}).get('message'):
-                     response: str = data['result']['response']['modelResponse']['message']
-
-            return {
-                "response": response,
-                "stream_response": stream_response,
-                "images": image_urls,
-                "extra_data": {
-                    "anon_user": self.anon_user,
-                    "cookies": self.session.cookies.get_dict(),
-                    "actions": self.actions,
-                    "xsid_script": self.xsid_script,
-                    "baggage": self.baggage,
-                    "sentry_trace": self.sentry_trace,
-                    "conversationId": conversation_id,
-                    "parentResponseId": parent_response,
-                    "privateKey": self.keys["privateKey"]
-                }
-            }
-        else:
-            if 'rejected by anti-bot rules' in convo_request.text:
-                Log.Info("Anti-bot detected, retrying with new session...")
-                return Grok(self.model, self.session.proxies.get("all")).chat(message=message, extra_data=extra_data)
+    def chat(self, message: str, extra_data: dict = None) -> dict:
+        def attempt(n: int) -> dict:
+            if n == 1:
+                return self._chat(message, extra_data)
+            with type(self)(self.model, self.proxy) as grok:
+                return grok._chat(message, extra_data)
+
+        def call() -> dict:
+            with Hooks.phase("chat", self.model):
+                return self.retry.call(attempt, self.proxy)
 
-            Log.Error(f"Grok Error: {convo_request.text}")
-            raise GrokError(f"Grok API error: {convo_request.text}")
+        if extra_data or self.response_cache is None:
+            return call()
+        return self.response_cache.call(self.model, message, call, self.proxy)
 
     def chat_stream(self, message: str, extra_data: dict = None) -> Generator[dict, None, None]:
-        if not extra_data:
-            self._load()
-            self.c_request(self.actions[0])
-            self.c_request(self.actions[1])
-            self.c_request(self.actions[2])
-            xsid: str = Signature.generate_sign('/rest/app-chat/conversations/new', 'POST', self.verification_token, self.svg_data, self.numbers)
-            url = 'https://grok.com/rest/app-chat/conversations/new'
+        def attempt(n: int) -> Generator[dict, None, None]:
+            if n == 1:
+                yield from self._chat_stream(message, extra_data)
+                return
+            with type(self)(self.model, self.proxy) as grok:
+                yield from grok._chat_stream(message, extra_data)
+
+        def stream() -> Generator[dict, None, None]:
+            with Hooks.phase("chat", self.model):
+                yield from self.retry.stream(attempt, self.proxy)
+
+        if extra_data or self.response_cache is None:
+            yield from stream()
         else:
-            self._load(extra_data)
-            self.c_run: int = 1
-            self.anon_user: str = extra_data["anon_user"]
-            self.keys["privateKey"] = extra_data["privateKey"]
-            self.c_request(self.actions[1])
-            self.c_request(self.actions[2])
-            xsid: str = Signature.generate_sign(f'/rest/app-chat/conversations/{extra_data["conversationId"]}/responses', 'POST', self.verification_token, self.svg_data, self.numbers)
-            url = f'https://grok.com/rest/app-chat/conversations/{extra_data["conversationId"]}/responses'
-
-        self.session.headers = self.headers.CONVERSATION
-        self.session.headers.update({
-            'baggage': self.baggage,
-            'sentry-trace': f'{self.sentry_trace}-{str(uuid4()).replace("-", "")[:16]}-0',
-            'x-statsig-id': xsid,
-            'x-xai-request-id': str(uuid4()),
-            'traceparent': f"00-{token_hex(16)}-{token_hex(8)}-00"
-        })
-        self.session.headers = Headers.fix_order(self.session.headers, self.headers.CONVERSATION)
+            yield from self.response_cache.stream(self.model, message, stream, self.proxy)
 
-        conversation_data = self._get_conversation_data(message, extra_data)
+    def _chat(self, message: str, extra_data: dict = None) -> dict:
+        path: str = self._handshake(extra_data)
 
-        try:
-            response = self.session.post(url, json=conversation_data, stream=True, timeout=9999)
-            response.raise_for_status()
-        except requests.errors.RequestError as e:
-            raise GrokNetworkError(f"Network error during chat_stream: {e}")
+        while True:
+            try:
+                for _ in self._stream_conversation(path, message, extra_data):
+                    pass
+            except GrokNetworkError:
+                if not self._verification_rejected(self.conversation):
+                    raise
+            else:
+                if not self._verification_rejected(self.conversation):
+                    break
+            self._verify()
 
-        full_response_text = ""
-        conversation_id = extra_data.get("conversationId") if extra_data else None
-        parent_response = None
+        self._check_conversation(self.conversation)
+        return self._chat_result(self.conversation)
 
-        for line in response.iter_lines():
-            if not line:
-                continue
+    def _chat_stream(self, message: str, extra_data: dict = None) -> Generator[dict, None, None]:
+        path: str = self._handshake(extra_data)
 
-            decoded_line = line.decode('utf-8')
+        while True:
             try:
-                data = loads(decoded_line)
-            except Exception:
-                continue
-
-            # Handle both new and existing conversation structures
-            if not extra_data:
-                token = data.get('result', {}).get('response', {}).get('token')
-                if not conversation_id:
-                    conversation_id = data.get('result', {}).get('conversation', {}).get('conversationId')
-                if not parent_response:
-                    parent_response = data.get('result', {}).get('response', {}).get('modelResponse', {}).get('responseId')
+                yield from self._stream_conversation(path, message, extra_data)
+            except GrokNetworkError:
+                if not self._verification_rejected(self.conversation):
+                    raise
             else:
-                token = data.get('result', {}).get('token')
-                if not parent_response:
-                    parent_response = data.get('result', {}).get('modelResponse', {}).get('responseId')
+                if not self._verification_rejected(self.conversation):
+                    break
+            self._verify()
 
-            if token:
-                full_response_text += token
-                yield {
-                    "token": token,
-                    "meta": None
-                }
+        conversation: Conversation = self.conversation
+        if not conversation.tokens:
+            self._check_conversation(conversation)
 
         # Yield final metadata needed for next turn
         yield {
             "token": None,
             "meta": {
-                "response": full_response_text,
-                "extra_data": {
-                    "anon_user": self.anon_user,
-                    "cookies": self.session.cookies.get_dict(),
-                    "actions": self.actions,
-                    "xsid_script": self.xsid_script,
-                    "baggage": self.baggage,
-                    "sentry_trace": self.sentry_trace,
-                    "conversationId": conversation_id,
-                    "parentResponseId": parent_response,
-                    "privateKey": self.keys["privateKey"]
-                }
+                "response": "".join(conversation.tokens),
+                "images": conversation.images,
+                "extra_data": self._extra_data(conversation.conversation_id, conversation.response_id)
             }
-        }
+        }
\ No newline at end of file
@@ -1,7 +1,89 @@
+from types  import MappingProxyType
+from typing import Mapping
+
+# Request header templates, built once per process and read-only. Per-request values are laid
+# over a copy with ``Headers.overlay``, so the templates themselves are never modified.
+
+LOAD: Mapping[str, str] = MappingProxyType({
+    "upgrade-insecure-requests": "1",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
+    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
+    "sec-ch-ua": "\"Google Chrome\";v=\"143\", \"Chromium\";v=\"143\", \"Not A(Brand\";v=\"24\"",
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": "\"Windows\"",
+    "sec-fetch-site": "none",
+    "sec-fetch-mode": "navigate",
+    "sec-fetch-user": "?1",
+    "sec-fetch-dest": "document",
+    "accept-encoding": "gzip, deflate, br, zstd",
+    "accept-language": "de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7",
+    "priority": "u=0, i",
+})
+
+C_REQUEST: Mapping[str, str] = MappingProxyType({
+    "sec-ch-ua-platform": "\"Windows\"",
+    "next-action": "",
+    "sec-ch-ua": "\"Google Chrome\";v=\"143\", \"Chromium\";v=\"143\", \"Not A(Brand\";v=\"24\"",
+    "sec-ch-ua-mobile": "?0",
+    "next-router-state-tree": "%5B%22%22%2C%7B%22children%22%3A%5B%22c%22%2C%7B%22children%22%3A%5B%5B%22slug%22%2C%22%22%2C%22oc%22%5D%2C%7B%22children%22%3A%5B%22__PAGE__%22%2C%7B%7D%2Cnull%2Cnull%5D%7D%2Cnull%2Cnull%5D%7D%2Cnull%2Cnull%5D%7D%2Cnull%2Cnull%2Ctrue%5D",
+    "baggage": '',
+    "sentry-trace": "",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
+    "accept": "text/x-component",
+    "content-type": "text/plain;charset=UTF-8",
+    "origin": "https://grok.com",
+    "sec-fetch-site": "same-origin",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-dest": "empty",
+    "referer": "https://grok.com/c",
+    "accept-encoding": "gzip, deflate, br, zstd",
+    "accept-language": "de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7",
+    "priority": "u=1, i",
+})
+
+# Stage 0 posts multipart form data, and curl has to set that content type with its boundary.
+C_REQUEST_MULTIPART: Mapping[str, str] = MappingProxyType({key: value for key, value in C_REQUEST.items() if key != "content-type"})
+
+CONVERSATION: Mapping[str, str] = MappingProxyType({
+    "x-xai-request-id": "",
+    "sec-ch-ua-platform": "\"Windows\"",
+    "sec-ch-ua": "\"Google Chrome\";v=\"143\", \"Chromium\";v=\"143\", \"Not A(Brand\";v=\"24\"",
+    "sec-ch-ua-mobile": "?0",
+    "baggage": "",
+    "sentry-trace": "",
+    "traceparent": "",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
+    "content-type": "application/json",
+    "x-statsig-id": "",
+    "accept": "*/*",
+    "origin": "https://grok.com",
+    "sec-fetch-site": "same-origin",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-dest": "empty",
+    "referer": "https://grok.com/",
+    "accept-encoding": "gzip, deflate, br, zstd",
+    "accept-language": "de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7",
+    "priority": "u=1, i",
+})
 
 
 class Headers:
-    
+
+    LOAD: Mapping[str, str] = LOAD
+    C_REQUEST: Mapping[str, str] = C_REQUEST
+    C_REQUEST_MULTIPART: Mapping[str, str] = C_REQUEST_MULTIPART
+    CONVERSATION: Mapping[str, str] = CONVERSATION
+
+    @staticmethod
+    def overlay(template: Mapping[str, str], fields: dict) -> dict:
+        """
+        Return a new headers dict in ``template`` order with ``fields`` filled in.
+
+        Keys already in the template keep their position and keys it lacks go last, which
+        is what ``fix_order`` would produce for the updated template, without the second pass.
+        """
+        return {**template, **fields}
+
     @staticmethod
     def fix_order(headers, base) -> dict:
         ordered: dict = {}
@@ -15,64 +97,3 @@ class Headers:
                 ordered[key] = value
         
         return ordered
-    
-    def __init__(self) -> None:
-        
-        self.LOAD: dict = {
-            "upgrade-insecure-requests": "1",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
-            "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-            "sec-ch-ua": "\"Google Chrome\";v=\"143\", \"Chromium\";v=\"143\", \"Not A(Brand\";v=\"24\"",
-            "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": "\"Windows\"",
-            "sec-fetch-site": "none",
-            "sec-fetch-mode": "navigate",
-            "sec-fetch-user": "?1",
-            "sec-fetch-dest": "document",
-            "accept-encoding": "gzip, deflate, br, zstd",
-            "accept-language": "de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7",
-            "priority": "u=0, i",
-        }
-        
-        self.C_REQUEST: dict = {
-            "sec-ch-ua-platform": "\"Windows\"",
-            "next-action": "",
-            "sec-ch-ua": "\"Google Chrome\";v=\"143\", \"Chromium\";v=\"143\", \"Not A(Brand\";v=\"24\"",
-            "sec-ch-ua-mobile": "?0",
-            "next-router-state-tree": "%5B%22%22%2C%7B%22children%22%3A%5B%22c%22%2C%7B%22children%22%3A%5B%5B%22slug%22%2C%22%22%2C%22oc%22%5D%2C%7B%22children%22%3A%5B%22__PAGE__%22%2C%7B%7D%2Cnull%2Cnull%5D%7D%2Cnull%2Cnull%5D%7D%2Cnull%2Cnull%5D%7D%2Cnull%2Cnull%2Ctrue%5D",
-            "baggage": '',
-            "sentry-trace": "",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
-            "accept": "text/x-component",
-            "content-type": "text/plain;charset=UTF-8",
-            "origin": "https://grok.com",
-            "sec-fetch-site": "same-origin",
-            "sec-fetch-mode": "cors",
-            "sec-fetch-dest": "empty",
-            "referer": "https://grok.com/c",
-            "accept-encoding": "gzip, deflate, br, zstd",
-            "accept-language": "de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7",
-            "priority": "u=1, i",
-        }
-        
-        self.CONVERSATION: dict = {
-            "x-xai-request-id": "",
-            "sec-ch-ua-platform": "\"Windows\"",
-            "sec-ch-ua": "\"Google Chrome\";v=\"143\", \"Chromium\";v=\"143\", \"Not A(Brand\";v=\"24\"",
-            "sec-ch-ua-mobile": "?0",
-            "baggage": "",
-            "sentry-trace": "",
-            "traceparent": "",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/143.0.0.0 Safari/537.36",
-            "content-type": "application/json",
-            "x-statsig-id": "",
-            "accept": "*/*",
-            "origin": "https://grok.com",
-            "sec-fetch-site": "same-origin",
-            "sec-fetch-mode": "cors",
-            "sec-fetch-dest": "empty",
-            "referer": "https://grok.com/",
-            "accept-encoding": "gzip, deflate, br, zstd",
-            "accept-language": "de-DE,de;q=0.9,en-US;q=0.8,en;q=0.7",
-            "priority": "u=1, i",
-        }
\ No newline at end of file
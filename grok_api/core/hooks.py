@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from threading  import Lock
+from time       import perf_counter
+from typing     import Callable, Iterator, List
+
+
+class Hooks:
+    """
+    Process-wide listeners for timing and outcome events.
+
+    A listener is called as ``listener(event, fields)`` from whichever thread produced the
+    event, so it must be quick and thread-safe. Events emitted by the library:
+
+    - ``phase``: ``phase``, ``model``, ``duration`` (seconds) and ``error`` (exception class
+      name or ``None``) for ``load``, ``parse_grok``, ``c_request_<stage>``, ``sign``,
+      ``ttft``, ``generation`` and ``chat``.
+    - ``tokens``: ``model``, ``count`` and ``duration`` of a finished generation.
+    - ``cache``: ``cache`` and ``hit`` for the ``txid``, ``grok``, ``verification``,
+      ``signature_table`` and ``response`` caches.
+
+    With no listeners registered, emitting costs a single attribute check.
+    """
+
+    listeners: List[Callable[[str, dict], None]] = []
+    lock = Lock()
+
+    @classmethod
+    def subscribe(cls, listener: Callable[[str, dict], None]) -> Callable[[str, dict], None]:
+        with cls.lock:
+            cls.listeners = cls.listeners + [listener]
+        return listener
+
+    @classmethod
+    def unsubscribe(cls, listener: Callable[[str, dict], None]) -> None:
+        with cls.lock:
+            cls.listeners = [registered for registered in cls.listeners if registered is not listener]
+
+    @classmethod
+    def emit(cls, event: str, **fields) -> None:
+        for listener in cls.listeners:
+            try:
+                listener(event, fields)
+            except Exception:
+                pass
+
+    @classmethod
+    @contextmanager
+    def phase(cls, phase: str, model: str = "") -> Iterator[None]:
+        """Time the wrapped block and emit it as a ``phase`` event, tagged with any exception raised."""
+        if not cls.listeners:
+            yield
+            return
+
+        start = perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            cls.emit("phase", phase=phase, model=model, duration=perf_counter() - start, error=error)
@@ -1,74 +1,185 @@
-from typing      import Optional
+from typing      import Optional, TextIO
 from datetime    import datetime
-from colorama    import Fore
-from threading   import Lock
+from threading   import Lock, Thread
+from queue       import Queue, Full
 from time        import time
+from json        import dumps
+import atexit
+import sys
+import os
 
 
 class Log:
     """
     Logging class to log text better in console.
+
+    Calls only enqueue a record; a background thread formats and writes it, so request
+    threads never wait on stdout. Messages take ``%``-style arguments that are formatted on
+    that thread, and only for records at or above ``level``. A message without placeholders
+    still takes ``prefix`` and ``color`` positionally, as in ``Log.Success("msg", "[*]")``.
+    Set ``format`` to ``"json"`` to get one JSON object per line instead of coloured text.
     """
-    
+
     enabled: bool = False
-    
+
+    DEBUG: int = 10
+    INFO: int = 20
+    SUCCESS: int = 25
+    ERROR: int = 40
+    levels: dict = {'DEBUG': DEBUG, 'INFO': INFO, 'SUCCESS': SUCCESS, 'ERROR': ERROR}
+    level: int = DEBUG
+
+    format: str = "text"
+    stream: Optional[TextIO] = None
+
+    # The ``colorama.Fore`` values, spelled out so importing Log does not import colorama.
     colours: Optional[dict] = {
-        'SUCCESS': Fore.LIGHTGREEN_EX,
-        'ERROR': Fore.LIGHTRED_EX,
-        'INFO': Fore.LIGHTWHITE_EX
+        'SUCCESS': '\x1b[92m',
+        'ERROR': '\x1b[91m',
+        'INFO': '\x1b[97m',
+        'DEBUG': '\x1b[90m'
     }
-    
+
+    max_queue: int = 10000
+    dropped: int = 0
+
     lock = Lock()
-    
+    queue: Optional[Queue] = None
+    _pid: Optional[int] = None
+
     @classmethod
     def set_enabled(cls, enabled: bool) -> None:
         """
         Enable or disable logging.
-        
+
         :param enabled: True to enable, False to disable.
         """
         cls.enabled = enabled
 
+    @classmethod
+    def set_level(cls, level) -> None:
+        """
+        Drop records below ``level``.
+
+        :param level: ``DEBUG``, ``INFO``, ``SUCCESS``, ``ERROR`` or the matching number.
+        """
+        cls.level = cls.levels[level.upper()] if isinstance(level, str) else level
+
+    @classmethod
+    def set_format(cls, format: str) -> None:
+        """
+        Choose the output format.
+
+        :param format: ``"text"`` for coloured console lines, ``"json"`` for JSON lines.
+        """
+        if format not in ("text", "json"):
+            raise ValueError(f"Unknown log format: {format}")
+        cls.format = format
+
+    @classmethod
+    def _start(cls) -> Queue:
+        """Start the writer thread for this process; a forked child gets a fresh one."""
+        with cls.lock:
+            if cls._pid != os.getpid():
+                cls.queue = Queue(maxsize=cls.max_queue)
+                cls._pid = os.getpid()
+                Thread(target=cls._writer, args=(cls.queue,), name="grok-log", daemon=True).start()
+                atexit.register(cls.flush)
+            return cls.queue
+
+    @classmethod
+    def _writer(cls, queue: Queue) -> None:
+        while True:
+            record = queue.get()
+            try:
+                stream = cls.stream or sys.stdout
+                stream.write(cls._render(*record) + "\n")
+                if queue.empty():
+                    stream.flush()
+            except Exception:
+                pass
+            finally:
+                queue.task_done()
+
+    @classmethod
+    def _render(cls, name: str, prefix: str, colour: str, created: float, message, args: tuple, fields: dict) -> str:
+        message = str(message)
+        if args:
+            try:
+                if "%" not in message:
+                    raise TypeError
+                message = message % args
+            except (TypeError, ValueError, KeyError):
+                # Positional ``prefix`` and ``color`` from before messages took arguments.
+                prefix, colour = (args + (colour,))[:2]
+
+        if cls.format == "json":
+            return dumps({
+                "time": created,
+                "level": name,
+                "message": message,
+                **fields
+            }, default=str)
+
+        from colorama import Fore
+
+        colour = colour or cls.colours[name]
+        timestamp: str = datetime.fromtimestamp(created).strftime("%H:%M:%S")
+        extra: str = "".join(f" {key}={value}" for key, value in fields.items())
+        return (
+            f"{Fore.LIGHTBLACK_EX}[{Fore.MAGENTA}{timestamp}{Fore.RESET}{Fore.LIGHTBLACK_EX}]{Fore.RESET} "
+            f"{colour}{prefix}{Fore.RESET} {message}{extra}"
+        )
+
     @staticmethod
-    def _log(level, prefix, message) -> Optional[None]:
+    def _log(level, prefix, message, colour: str = "", args: tuple = (), fields: dict = None) -> Optional[None]:
         """
-        Private log function to build the payload to print.
-        
-        :param level: Just not used, only a filler
+        Private log function to queue a record for the writer thread.
+
+        :param level: Level name: Success, Error, Info or Debug
         :param prefix: Prefix to indicate if its Success, Error or Info
-        :param message: Message to Log
+        :param message: Message to Log, ``%``-formatted with ``args`` on the writer thread
         """
-        
-        if not Log.enabled:
+
+        if not Log.enabled or Log.levels[level] < Log.level:
             return
-        
-        timestamp: Optional[int] = datetime.fromtimestamp(time()).strftime("%H:%M:%S")
-        
-        log_message = (
-            f"{Fore.LIGHTBLACK_EX}[{Fore.MAGENTA}{timestamp}{Fore.RESET}{Fore.LIGHTBLACK_EX}]{Fore.RESET} "
-            f"{prefix} {message}"
-        )
-        
-        with Log.lock:
-            print(log_message)
+
+        queue = Log.queue if Log._pid == os.getpid() else Log._start()
+        try:
+            queue.put_nowait((level, prefix, colour, time(), message, args, fields or {}))
+        except Full:
+            Log.dropped += 1
+
+    @classmethod
+    def flush(cls) -> None:
+        """Block until every queued record has been written."""
+        if cls.queue is not None and cls._pid == os.getpid():
+            cls.queue.join()
 
     @staticmethod
-    def Success(message, prefix="[+]", color=colours['SUCCESS']) -> Optional[None]:
+    def Success(message, *args, prefix="[+]", color="", **fields) -> Optional[None]:
         """
         Logging a Success message.
         """
-        Log._log("SUCCESS", f"{color}{prefix}{Fore.RESET}", message)
+        Log._log("SUCCESS", prefix, message, color, args, fields)
 
     @staticmethod
-    def Error(message, prefix="[!]", color=colours['ERROR']) -> Optional[None]:
+    def Error(message, *args, prefix="[!]", color="", **fields) -> Optional[None]:
         """
         Logging an Error Message.
         """
-        Log._log("ERROR", f"{color}{prefix}{Fore.RESET}", message)
+        Log._log("ERROR", prefix, message, color, args, fields)
 
     @staticmethod
-    def Info(message, prefix="[!]", color=colours['INFO']) -> Optional[None]:
+    def Info(message, *args, prefix="[!]", color="", **fields) -> Optional[None]:
         """
         Logging an Info Message.
         """
-        Log._log("INFO", f"{color}{prefix}{Fore.RESET}", message)
\ No newline at end of file
+        Log._log("INFO", prefix, message, color, args, fields)
+
+    @staticmethod
+    def Debug(message, *args, prefix="[-]", color="", **fields) -> Optional[None]:
+        """
+        Logging a Debug Message.
+        """
+        Log._log("DEBUG", prefix, message, color, args, fields)
@@ -0,0 +1,130 @@
+from json   import dumps
+from typing import Dict, Optional, Tuple
+
+# Stand-ins for the per-request values; they only exist while a template is compiled.
+_MESSAGE: str = "\0message\0"
+_PARENT: str = "\0parent\0"
+
+
+def new_conversation_data(message: str, model: str, model_mode: str) -> dict:
+    return {
+        'temporary': False,
+        'modelName': model,
+        'message': message,
+        'fileAttachments': [],
+        'imageAttachments': [],
+        'disableSearch': False,
+        'enableImageGeneration': True,
+        'returnImageBytes': False,
+        'returnRawGrokInXaiRequest': False,
+        'enableImageStreaming': True,
+        'imageGenerationCount': 2,
+        'forceConcise': False,
+        'toolOverrides': {},
+        'enableSideBySide': True,
+        'sendFinalMetadata': True,
+        'isReasoning': "THINKING" in model_mode,
+        'webpageUrls': [],
+        'disableTextFollowUps': False,
+        'responseMetadata': {
+            'requestModelDetails': {
+                'modelId': model,
+            },
+        },
+        'disableMemory': False,
+        'forceSideBySide': False,
+        'modelMode': model_mode,
+        'isAsyncChat': False,
+    }
+
+
+def follow_up_data(message: str, model: str, model_mode: str, mode: str, parent_response: str) -> dict:
+    return {
+        'message': message,
+        'modelName': model,
+        'parentResponseId': parent_response,
+        'disableSearch': False,
+        'enableImageGeneration': True,
+        'imageAttachments': [],
+        'returnImageBytes': False,
+        'returnRawGrokInXaiRequest': False,
+        'fileAttachments': [],
+        'enableImageStreaming': True,
+        'imageGenerationCount': 2,
+        'forceConcise': False,
+        'toolOverrides': {},
+        'enableSideBySide': True,
+        'sendFinalMetadata': True,
+        'customPersonality': '',
+        'isReasoning': "THINKING" in model_mode,
+        'webpageUrls': [],
+        'metadata': {
+            'requestModelDetails': {
+                'modelId': model,
+            },
+            'request_metadata': {
+                'model': model,
+                'mode': mode,
+            },
+        },
+        'disableTextFollowUps': False,
+        'disableArtifact': False,
+        'isFromGrokFiles': False,
+        'disableMemory': False,
+        'forceSideBySide': False,
+        'modelMode': model_mode,
+        'isAsyncChat': False,
+        'skipCancelCurrentInflightRequests': False,
+        'isRegenRequest': False,
+    }
+
+
+def _serialize(data: dict) -> str:
+    # Same encoding curl_cffi uses for ``json=``.
+    return dumps(data, separators=(",", ":"))
+
+
+class Payloads:
+    """
+    Conversation request bodies from templates serialized once per model.
+
+    A body is the template with the JSON-encoded message (and parent response id for
+    follow-ups) spliced in, byte-for-byte what serializing the full payload would give.
+    """
+
+    max_templates: int = 64
+    _templates: Dict[tuple, Tuple[str, ...]] = {}
+
+    @classmethod
+    def _template(cls, model: str, model_mode: str, mode: str, follow_up: bool) -> Tuple[str, ...]:
+        key: tuple = (model, model_mode, mode, follow_up)
+        parts = cls._templates.get(key)
+        if parts is None:
+            if follow_up:
+                body: str = _serialize(follow_up_data(_MESSAGE, model, model_mode, mode, _PARENT))
+                head, rest = body.split(_serialize(_MESSAGE))
+                parts = (head, *rest.split(_serialize(_PARENT)))
+            else:
+                parts = tuple(_serialize(new_conversation_data(_MESSAGE, model, model_mode)).split(_serialize(_MESSAGE)))
+
+            # Model names come from callers, so keep the table from growing without bound.
+            if len(cls._templates) >= cls.max_templates:
+                cls._templates = {}
+            cls._templates[key] = parts
+        return parts
+
+    @classmethod
+    def conversation(cls, message: str, model: str, model_mode: str, mode: str, parent_response: Optional[str] = None,
+                     follow_up: Optional[bool] = None) -> bytes:
+        """
+        Body of a conversation turn. ``follow_up`` defaults to whether ``parent_response`` is
+        given; a follow-up without one sends ``"parentResponseId": null``.
+        """
+        if follow_up is None:
+            follow_up = parent_response is not None
+        if not follow_up:
+            head, tail = cls._template(model, model_mode, mode, False)
+            return (head + _serialize(message) + tail).encode()
+
+        head, middle, tail = cls._template(model, model_mode, mode, True)
+        return (head + _serialize(message) + middle + _serialize(parent_response) + tail).encode()
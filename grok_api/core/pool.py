@@ -0,0 +1,119 @@
+from collections import deque
+from contextlib  import contextmanager
+from threading   import Lock
+from time        import monotonic
+from typing      import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+class SessionPool:
+    """
+    Process-wide pool of idle ``curl_cffi`` sessions, keyed by proxy.
+
+    A pooled session keeps its curl handle, and with it the open TLS connection to grok.com,
+    between leases. Cookies and headers are wiped on release, so conversations never share
+    state; only the transport is reused. At most ``max_size`` sessions are kept idle and any
+    session idle for longer than ``idle_timeout`` seconds is closed.
+    """
+
+    def __init__(self, max_size: int = 32, idle_timeout: float = 90.0) -> None:
+        self.max_size: int = max_size
+        self.idle_timeout: float = idle_timeout
+        self._idle: Dict[Optional[str], Deque[Tuple[float, Any]]] = {}
+        self._count: int = 0
+        self._lock: Lock = Lock()
+        self.created: int = 0
+        self.reused: int = 0
+        self.evicted: int = 0
+
+    @staticmethod
+    def _create() -> "requests.Session":
+        from curl_cffi import requests
+
+        return requests.Session(impersonate="chrome136", default_headers=False)
+
+    def _expire(self, now: float) -> List[Any]:
+        """Pop sessions idle past ``idle_timeout``; the caller holds the lock and closes them."""
+        expired: list = []
+        for proxy in list(self._idle):
+            idle = self._idle[proxy]
+            while idle and now - idle[0][0] > self.idle_timeout:
+                expired.append(idle.popleft()[1])
+            if not idle:
+                del self._idle[proxy]
+
+        self._count -= len(expired)
+        self.evicted += len(expired)
+        return expired
+
+    @staticmethod
+    def _close(sessions: List[Any]) -> None:
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    def acquire(self, proxy: str = None, factory: Callable[[], Any] = None) -> Any:
+        """Lease a session for ``proxy``, reusing the most recently released one if possible."""
+        session = None
+        with self._lock:
+            expired = self._expire(monotonic())
+            idle = self._idle.get(proxy)
+            if idle:
+                session = idle.pop()[1]
+                self._count -= 1
+                self.reused += 1
+            else:
+                self.created += 1
+        self._close(expired)
+
+        if session is None:
+            session = (factory or self._create)()
+            if proxy:
+                session.proxies = {
+                    "all": proxy
+                }
+        return session
+
+    def release(self, session: Any, proxy: str = None) -> None:
+        """Return a leased session to the pool, wiping its cookies and headers first."""
+        session.cookies.clear()
+        session.headers = {}
+
+        with self._lock:
+            expired = self._expire(monotonic())
+            if self._count < self.max_size:
+                self._idle.setdefault(proxy, deque()).append((monotonic(), session))
+                self._count += 1
+            else:
+                expired.append(session)
+                self.evicted += 1
+        self._close(expired)
+
+    @contextmanager
+    def lease(self, proxy: str = None, factory: Callable[[], Any] = None) -> Iterator[Any]:
+        session = self.acquire(proxy, factory)
+        try:
+            yield session
+        finally:
+            self.release(session, proxy)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "idle": self._count,
+                "proxies": len(self._idle),
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            sessions = [session for idle in self._idle.values() for _, session in idle]
+            self._idle.clear()
+            self._count = 0
+        self._close(sessions)
+
+
+sessions: SessionPool = SessionPool()
@@ -0,0 +1,311 @@
+from concurrent.futures import Future
+from collections import OrderedDict
+from threading   import Lock
+from hashlib     import sha256
+from copy        import deepcopy
+from time        import monotonic, time
+from typing      import Any, AsyncGenerator, Awaitable, Callable, Dict, Generator, Optional, Tuple
+from json        import dumps, loads
+from .hooks      import Hooks
+from abc         import ABC, abstractmethod
+import asyncio
+import sqlite3
+
+
+class ResponseBackend(ABC):
+    """Storage for :class:`ResponseCache` entries; subclass it to keep them somewhere else."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def put(self, key: str, value: dict, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> dict:
+        return {}
+
+
+class MemoryResponseBackend(ResponseBackend):
+    """In-process LRU of at most ``max_size`` answers."""
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size: int = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return deepcopy(entry[1])
+
+    def put(self, key: str, value: dict, ttl: float) -> None:
+        value = deepcopy(value)
+        with self._lock:
+            self._entries[key] = (monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "size": len(self._entries)
+            }
+
+
+class SQLiteResponseBackend(ResponseBackend):
+    """Answers kept in a SQLite file, shared by every process that opens it."""
+
+    def __init__(self, path: str, max_size: int = 1024) -> None:
+        self.path: str = path
+        self.max_size: int = max_size
+        self._lock: Lock = Lock()
+        self._db: sqlite3.Connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL, used REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used)")
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time()
+        with self._lock:
+            row = self._db.execute("SELECT data FROM responses WHERE key = ? AND expires >= ?", (key, now)).fetchone()
+            if row:
+                self._db.execute("UPDATE responses SET used = ? WHERE key = ?", (now, key))
+        return loads(row[0]) if row else None
+
+    def put(self, key: str, value: dict, ttl: float) -> None:
+        now = time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, dumps(value), now + ttl, now))
+            self._db.execute("DELETE FROM responses WHERE expires < ?", (now,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "size": size
+        }
+
+
+class ResponseCache:
+    """
+    Answers to first-turn prompts, keyed by ``(model, message)``; with ``per_proxy`` each
+    proxy gets its own entries, so prompts are only shared between callers of one proxy.
+
+    Only new conversations are cached; a turn that continues a conversation always goes
+    upstream. While one call for a key is in flight, identical calls wait for it instead of
+    starting their own and then get a copy of its answer. Only the caller that went upstream
+    gets the conversation it started: cached and coalesced answers carry ``extra_data=None``,
+    so the cookies, keys and anonymous user of one caller never reach another. If that call
+    fails or a stream is abandoned before it finishes, each waiter makes its own call and
+    nothing is cached.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_size: int = 1024, backend: ResponseBackend = None, per_proxy: bool = False) -> None:
+        self.ttl: float = ttl
+        self.per_proxy: bool = per_proxy
+        self.backend: ResponseBackend = backend or MemoryResponseBackend(max_size)
+        self._flights: Dict[str, Future] = {}
+        self._lock: Lock = Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+
+    @staticmethod
+    def key(model: str, message: str, proxy: str = None) -> str:
+        scope: str = f"{model}\0{message}" if proxy is None else f"{model}\0{message}\0{proxy}"
+        return sha256(scope.encode()).hexdigest()
+
+    def _lookup(self, key: str) -> Tuple[Optional[dict], Future, bool]:
+        """Return ``(cached, flight, leader)``; the leader must settle ``flight`` through :meth:`_finish`."""
+        cached = self.backend.get(key)
+        flight = None
+        leader = False
+
+        if cached is None:
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    # A leader stores its answer before dropping its flight, so look again under the lock.
+                    cached = self.backend.get(key)
+                    if cached is None:
+                        flight = self._flights[key] = Future()
+                        leader = True
+
+                if cached is not None:
+                    self.hits += 1
+                elif leader:
+                    self.misses += 1
+                else:
+                    self.coalesced += 1
+        else:
+            with self._lock:
+                self.hits += 1
+
+        Hooks.emit("cache", cache="response", hit=not leader)
+        return self._shared(cached), flight, leader
+
+    def _finish(self, key: str, flight: Future, value: Optional[dict]) -> None:
+        if value is not None:
+            self.backend.put(key, value, self.ttl)
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.set_result(value)
+
+    @staticmethod
+    def _shared(answer: Optional[dict]) -> Optional[dict]:
+        """``answer`` without the conversation state only its own caller may continue."""
+        return {**answer, "extra_data": None} if answer is not None else None
+
+    @staticmethod
+    def _entry(tokens: list, meta: dict) -> dict:
+        return {
+            "response": meta["response"],
+            "stream_response": list(tokens),
+            "images": meta.get("images"),
+            "extra_data": None
+        }
+
+    @staticmethod
+    def _replay(value: dict) -> Generator[dict, None, None]:
+        for token in value["stream_response"]:
+            yield {"token": token, "meta": None}
+        yield {
+            "token": None,
+            "meta": {
+                "response": value["response"],
+                "images": value["images"],
+                "extra_data": value["extra_data"]
+            }
+        }
+
+    def call(self, model: str, message: str, compute: Callable[[], dict], proxy: str = None) -> dict:
+        key: str = self.key(model, message, proxy if self.per_proxy else None)
+        cached, flight, leader = self._lookup(key)
+        if cached is not None:
+            return cached
+        if not leader:
+            value: Optional[dict] = flight.result()
+            return deepcopy(value) if value is not None else compute()
+
+        value = None
+        try:
+            value = compute()
+            return value
+        finally:
+            self._finish(key, flight, self._shared(value))
+
+    async def call_async(self, model: str, message: str, compute: Callable[[], Awaitable[dict]], proxy: str = None) -> dict:
+        key: str = self.key(model, message, proxy if self.per_proxy else None)
+        cached, flight, leader = self._lookup(key)
+        if cached is not None:
+            return cached
+        if not leader:
+            value: Optional[dict] = await asyncio.wrap_future(flight)
+            return deepcopy(value) if value is not None else await compute()
+
+        value = None
+        try:
+            value = await compute()
+            return value
+        finally:
+            self._finish(key, flight, self._shared(value))
+
+    def stream(self, model: str, message: str, compute: Callable[[], Generator[dict, None, None]], proxy: str = None) -> Generator[dict, None, None]:
+        """Like :meth:`call` for ``chat_stream``; cached and coalesced answers are replayed token by token."""
+        key: str = self.key(model, message, proxy if self.per_proxy else None)
+        cached, flight, leader = self._lookup(key)
+        if cached is not None:
+            yield from self._replay(cached)
+            return
+        if not leader:
+            value: Optional[dict] = flight.result()
+            yield from self._replay(deepcopy(value)) if value is not None else compute()
+            return
+
+        value = None
+        tokens: list = []
+        chunks = compute()
+        try:
+            for chunk in chunks:
+                if chunk["meta"]:
+                    value = self._entry(tokens, chunk["meta"])
+                elif chunk["token"]:
+                    tokens.append(chunk["token"])
+                yield chunk
+        finally:
+            chunks.close()
+            self._finish(key, flight, value)
+
+    async def stream_async(self, model: str, message: str, compute: Callable[[], AsyncGenerator[dict, None]], proxy: str = None) -> AsyncGenerator[dict, None]:
+        key: str = self.key(model, message, proxy if self.per_proxy else None)
+        cached, flight, leader = self._lookup(key)
+        if not leader:
+            value: Optional[dict] = cached if cached is not None else await asyncio.wrap_future(flight)
+            if value is None:
+                chunks = compute()
+                try:
+                    async for chunk in chunks:
+                        yield chunk
+                finally:
+                    await chunks.aclose()
+                return
+            for chunk in self._replay(value if cached is not None else deepcopy(value)):
+                yield chunk
+            return
+
+        value = None
+        tokens: list = []
+        chunks = compute()
+        try:
+            async for chunk in chunks:
+                if chunk["meta"]:
+                    value = self._entry(tokens, chunk["meta"])
+                elif chunk["token"]:
+                    tokens.append(chunk["token"])
+                yield chunk
+        finally:
+            await chunks.aclose()
+            self._finish(key, flight, value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            stats = {
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+                "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0
+            }
+        return {**self.backend.stats(), **stats}
+
+    def clear(self) -> None:
+        self.backend.clear()
@@ -0,0 +1,220 @@
+from collections import OrderedDict, deque
+from threading   import Lock
+from random      import uniform
+from time        import monotonic, sleep
+from typing      import Any, AsyncGenerator, Awaitable, Callable, Deque, Generator, Optional
+from .exceptions import GrokError, GrokNetworkError, GrokStreamError, GrokRejectedError, GrokCircuitOpenError
+import asyncio
+
+
+class CircuitBreaker:
+    """
+    Fails fast once too many recent attempts against one proxy have failed.
+
+    The last ``window`` outcomes are kept. When at least ``min_requests`` of them exist and
+    the failure rate reaches ``threshold``, the breaker opens for ``cooldown`` seconds. After
+    that a single trial attempt is let through: success closes it, failure opens it again.
+    """
+
+    def __init__(self, threshold: float = 0.5, window: int = 20, min_requests: int = 10, cooldown: float = 30.0) -> None:
+        self.threshold: float = threshold
+        self.min_requests: int = min_requests
+        self.cooldown: float = cooldown
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.opened_at: Optional[float] = None
+        self.trial_at: Optional[float] = None
+
+    def allow(self, now: float) -> bool:
+        if self.opened_at is None:
+            return True
+        if now - self.opened_at < self.cooldown:
+            return False
+        # Half-open: one trial at a time; a trial that never reports back expires after another cooldown.
+        if self.trial_at is not None and now - self.trial_at < self.cooldown:
+            return False
+        self.trial_at = now
+        return True
+
+    def record(self, failed: bool, now: float) -> None:
+        if self.opened_at is not None:
+            self.trial_at = None
+            if failed:
+                self.opened_at = now
+                return
+            self.opened_at = None
+            self.outcomes.clear()
+
+        self.outcomes.append(failed)
+        if len(self.outcomes) >= self.min_requests and sum(self.outcomes) / len(self.outcomes) >= self.threshold:
+            self.opened_at = now
+
+    def retry_after(self, now: float) -> float:
+        return max(0.0, self.cooldown - (now - self.opened_at)) if self.opened_at is not None else 0.0
+
+
+class RetryPolicy:
+    """
+    Shared retry rules for ``Grok``/``AsyncGrok`` conversations.
+
+    An attempt that fails with a rejection or network error is retried up to ``max_attempts``
+    in total, after a full-jitter exponential backoff. Retries draw from a process-wide budget:
+    every call deposits ``budget_ratio`` tokens (capped at ``budget_max``) and every retry
+    spends one, so retries stay a bounded fraction of traffic when upstream degrades. Each
+    proxy also gets a :class:`CircuitBreaker`, which raises :class:`GrokCircuitOpenError`
+    instead of attempting a call while it is open.
+
+    A :class:`GrokStreamError` means the conversation POST already went out, so grok.com may
+    have recorded the turn; it is never retried, to avoid posting the same message twice.
+    """
+
+    retryable: tuple = (GrokRejectedError, GrokNetworkError)
+    never_retry: tuple = (GrokStreamError,)
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 budget_ratio: float = 0.2, budget_max: float = 10.0, breaker: dict = None, max_breakers: int = 1024) -> None:
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.budget_ratio: float = budget_ratio
+        self.budget_max: float = budget_max
+        self.budget: float = budget_max
+        self.breaker: dict = breaker or {}
+        self.max_breakers: int = max_breakers
+
+        self._breakers: "OrderedDict[Optional[str], CircuitBreaker]" = OrderedDict()
+        self._lock: Lock = Lock()
+        self.calls: int = 0
+        self.retries: int = 0
+        self.exhausted: int = 0
+        self.short_circuited: int = 0
+
+    def _breaker(self, proxy: Optional[str]) -> CircuitBreaker:
+        breaker = self._breakers.get(proxy)
+        if breaker is None:
+            breaker = self._breakers[proxy] = CircuitBreaker(**self.breaker)
+            if len(self._breakers) > self.max_breakers:
+                self._breakers.popitem(last=False)
+        self._breakers.move_to_end(proxy)
+        return breaker
+
+    def _begin(self, proxy: Optional[str], attempt: int) -> None:
+        with self._lock:
+            now = monotonic()
+            breaker = self._breaker(proxy)
+            if not breaker.allow(now):
+                self.short_circuited += 1
+                raise GrokCircuitOpenError(f"Circuit open for {proxy or 'direct'} connections, retry in {breaker.retry_after(now):.0f}s")
+            if attempt == 1:
+                self.calls += 1
+                self.budget = min(self.budget_max, self.budget + self.budget_ratio)
+
+    def _record(self, proxy: Optional[str], error: Optional[BaseException]) -> None:
+        if isinstance(error, GrokCircuitOpenError):
+            return
+        with self._lock:
+            self._breaker(proxy).record(isinstance(error, GrokError), monotonic())
+
+    def _should_retry(self, error: BaseException, attempt: int) -> bool:
+        if not isinstance(error, self.retryable) or isinstance(error, self.never_retry):
+            return False
+        with self._lock:
+            if attempt >= self.max_attempts or self.budget < 1:
+                self.exhausted += 1
+                return False
+            self.budget -= 1
+            self.retries += 1
+            return True
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before attempt ``attempt + 1``."""
+        return uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def call(self, attempt: Callable[[int], Any], proxy: str = None) -> Any:
+        """Run ``attempt(n)`` for n = 1, 2, ... until it succeeds or may not be retried."""
+        n = 1
+        while True:
+            self._begin(proxy, n)
+            try:
+                result = attempt(n)
+            except Exception as e:
+                self._record(proxy, e)
+                if not self._should_retry(e, n):
+                    raise
+            else:
+                self._record(proxy, None)
+                return result
+            sleep(self.delay(n))
+            n += 1
+
+    async def call_async(self, attempt: Callable[[int], Awaitable[Any]], proxy: str = None) -> Any:
+        n = 1
+        while True:
+            self._begin(proxy, n)
+            try:
+                result = await attempt(n)
+            except Exception as e:
+                self._record(proxy, e)
+                if not self._should_retry(e, n):
+                    raise
+            else:
+                self._record(proxy, None)
+                return result
+            await asyncio.sleep(self.delay(n))
+            n += 1
+
+    def stream(self, attempt: Callable[[int], Generator], proxy: str = None) -> Generator:
+        """Like :meth:`call` for generators; an attempt is only retried before its first item."""
+        n = 1
+        while True:
+            self._begin(proxy, n)
+            started = False
+            chunks = attempt(n)
+            try:
+                for item in chunks:
+                    started = True
+                    yield item
+            except Exception as e:
+                self._record(proxy, e)
+                if started or not self._should_retry(e, n):
+                    raise
+            else:
+                self._record(proxy, None)
+                return
+            finally:
+                chunks.close()
+            sleep(self.delay(n))
+            n += 1
+
+    async def stream_async(self, attempt: Callable[[int], AsyncGenerator], proxy: str = None) -> AsyncGenerator:
+        n = 1
+        while True:
+            self._begin(proxy, n)
+            started = False
+            chunks = attempt(n)
+            try:
+                async for item in chunks:
+                    started = True
+                    yield item
+            except Exception as e:
+                self._record(proxy, e)
+                if started or not self._should_retry(e, n):
+                    raise
+            else:
+                self._record(proxy, None)
+                return
+            finally:
+                await chunks.aclose()
+            await asyncio.sleep(self.delay(n))
+            n += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = monotonic()
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "short_circuited": self.short_circuited,
+                "budget": round(self.budget, 2),
+                "open_circuits": sum(breaker.opened_at is not None and breaker.retry_after(now) > 0 for breaker in self._breakers.values())
+            }
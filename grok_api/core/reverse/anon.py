@@ -1,6 +1,5 @@
 from base64    import b64encode, b64decode
 from secrets   import token_bytes
-from coincurve import PrivateKey
 from hashlib   import sha256
 
 class Anon:
@@ -8,6 +7,8 @@ class Anon:
     
     @staticmethod
     def publicKeyCreate(e) -> list:
+        from coincurve import PrivateKey
+
         privkey = PrivateKey(bytes(e))
         publicKey = privkey.public_key.format(compressed=True)
         return list(publicKey)
@@ -32,6 +33,7 @@ class Anon:
     
     @staticmethod
     def sign_challenge(challenge_data: bytes, key: str) -> dict:
+        from coincurve import PrivateKey
 
         key_bytes: bytes = b64decode(key)
         privkey: PrivateKey = PrivateKey(key_bytes)
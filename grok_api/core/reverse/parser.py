@@ -1,97 +1,165 @@
-from re        import findall, search
-from json      import load, dump
+from re        import findall, search, compile
+from html      import unescape
 from base64    import b64decode
-from typing    import Optional, Tuple, List, Dict
-from curl_cffi import requests
-from ..        import Utils, Log
+from typing    import Optional, Tuple, List, Dict, Union, TYPE_CHECKING
+from ..        import Utils, Log, Hooks, MappingStore
+from ..store     import shared_store
 from ..exceptions import GrokParsingError, GrokNetworkError
-from os        import path, makedirs
+from ..pool      import SessionPool, sessions
+from os        import path, environ
 
-class Parser:
+if TYPE_CHECKING:
+    from curl_cffi.requests import Response
+    from ..flight import ActionResponse
+
+# One alternation over the /c page: chunk script srcs, the baggage meta and the sentry-trace id.
+PAGE_PATTERN = compile(
+    r'<script\b[^>]*?\ssrc="(/_next/static/chunks/[^"]*)"'
+    r'|<meta name="baggage" content="([^"]*)"'
+    r'|<meta name="sentry-trace" content="([^"-]*)'
+)
+
+# Next.js framework chunks never hold the server actions or the xsid loader.
+FRAMEWORK_CHUNKS = ("webpack", "framework", "main-", "main.", "polyfills", "react-refresh")
 
-    mapping: dict = {}
-    _mapping_loaded: bool = False
+class Parser:
 
-    grok_mapping: list = []
-    _grok_mapping_loaded: bool = False
+    fetch_concurrency: int = 8
+    # Origin every request goes to; point it at a stand-in such as ``grok_api.mock_server`` for offline runs.
+    base_url: str = environ.get("GROK_API_BASE_URL", "https://grok.com")
 
     BASE_DIR = path.dirname(path.dirname(path.abspath(__file__)))
-    MAPPINGS_DIR = path.join(BASE_DIR, 'mappings')
+    MAPPINGS_DIR = environ.get("GROK_API_MAPPINGS_DIR") or path.join(BASE_DIR, 'mappings')
     TXID_PATH = path.join(MAPPINGS_DIR, 'txid.json')
     GROK_PATH = path.join(MAPPINGS_DIR, 'grok.json')
 
-    @classmethod
-    def _ensure_mappings_dir(cls):
-        if not path.exists(cls.MAPPINGS_DIR):
-            makedirs(cls.MAPPINGS_DIR)
-
-    @classmethod
-    def _load__xsid_mapping(cls):
-        if not cls._mapping_loaded and path.exists(cls.TXID_PATH):
-            try:
-                with open(cls.TXID_PATH, 'r') as f:
-                    cls.mapping = load(f)
-                cls._mapping_loaded = True
-            except Exception as e:
-                Log.Error(f"Failed to load txid mapping: {e}")
-
-    @classmethod
-    def _load_grok_mapping(cls):
-        if not cls._grok_mapping_loaded and path.exists(cls.GROK_PATH):
-            try:
-                with open(cls.GROK_PATH, 'r') as f:
-                    cls.grok_mapping = load(f)
-                cls._grok_mapping_loaded = True
-            except Exception as e:
-                Log.Error(f"Failed to load grok mapping: {e}")
+    # script link -> txid numbers
+    mapping: MappingStore = shared_store("txid", MappingStore(TXID_PATH))
+    # action script -> {"xsid_script", "action_script", "actions"}
+    grok_mapping: MappingStore = shared_store("grok", MappingStore(GROK_PATH, key="action_script"))
+    # Script fetches share the pooled grok.com connections with Grok itself.
+    sessions: SessionPool = sessions
 
     @staticmethod
-    def parse_values(html: str, loading: str = "loading-x-anim-0", scriptId: str = "") -> Tuple[str, Optional[List[int]]]:
+    def parse_page(html: str) -> Tuple[List[str], str, str]:
+        """Extract chunk script srcs, baggage and sentry-trace id from the /c page in one pass."""
+
+        scripts: list = []
+        baggage: str = ""
+        sentry_trace: str = ""
+
+        for match in PAGE_PATTERN.finditer(html):
+            src, meta_baggage, meta_trace = match.groups()
+            if src is not None:
+                scripts.append(unescape(src) if "&" in src else src)
+            elif meta_baggage is not None:
+                baggage = baggage or meta_baggage
+            else:
+                sentry_trace = sentry_trace or meta_trace
 
-        Parser._load__xsid_mapping()
+        return scripts, baggage, sentry_trace
 
-        all_d_values = findall(r'"d":"(M[^"]{200,})"', html)
-        if not all_d_values:
+    @staticmethod
+    def select_svg(paths: List[str], loading: str) -> str:
+        """The SVG path the ``loading-x-anim-N`` id picks out of ``paths``."""
+        if not paths:
             raise GrokParsingError("Failed to find SVG path data in HTML.")
 
         try:
             loading_idx = int(loading.split("loading-x-anim-")[1])
-            svg_data = all_d_values[loading_idx % len(all_d_values)]
+            return paths[loading_idx % len(paths)]
         except (IndexError, ValueError):
-            svg_data = all_d_values[0]
+            return paths[0]
+
+    @staticmethod
+    def _svg_data(html: str, loading: str) -> str:
+        return Parser.select_svg(findall(r'"d":"(M[^"]{200,})"', html), loading)
+
+    @staticmethod
+    def _script_link(html: Union[str, bytes], scriptId: str) -> str:
+        if scriptId == "ondemand.s":
+            if isinstance(html, bytes):
+                html = html.decode("utf-8", "replace")
+            return 'https://abs.twimg.com/responsive-web/client-web/ondemand.s.' + Utils.between(html, f'"{scriptId}":"', '"') + 'a.js'
+        return f'{Parser.base_url}/_next/{scriptId}'
+
+    @staticmethod
+    def _store_numbers(script_link: str, script_content: str) -> list:
+        numbers: list = [int(x) for x in findall(r'x\[(\d+)\]\s*,\s*16', script_content)]
+        if not numbers:
+            raise GrokParsingError(f"Failed to parse numbers from script: {script_link}")
+
+        Parser.mapping.put(script_link, numbers)
+        return numbers
+
+    @staticmethod
+    def txid_numbers(script_link: str) -> List[int]:
+        """txid numbers of the xsid script at ``script_link``, fetched and remembered on a miss."""
+        numbers: list = Parser.mapping.get(script_link)
+        Hooks.emit("cache", cache="txid", hit=numbers is not None)
+        if numbers is None:
+            from curl_cffi import requests
+
+            try:
+                response = Parser._get(script_link)
+                response.raise_for_status()
+                script_content: str = response.text
+            except requests.errors.RequestsError as e:
+                raise GrokNetworkError(f"Failed to fetch script for parsing: {e}")
+
+            numbers: list = Parser._store_numbers(script_link, script_content)
+
+        return numbers
+
+    @staticmethod
+    async def txid_numbers_async(script_link: str) -> List[int]:
+        """Async counterpart of :meth:`txid_numbers`, fetching unknown scripts without blocking the loop."""
+        numbers: list = Parser.mapping.get(script_link)
+        Hooks.emit("cache", cache="txid", hit=numbers is not None)
+        if numbers is None:
+            from curl_cffi import requests
+
+            try:
+                async with requests.AsyncSession(impersonate="chrome136") as session:
+                    response = await session.get(script_link)
+                response.raise_for_status()
+                script_content: str = response.text
+            except requests.errors.RequestsError as e:
+                raise GrokNetworkError(f"Failed to fetch script for parsing: {e}")
+
+            numbers: list = Parser._store_numbers(script_link, script_content)
+
+        return numbers
+
+    @staticmethod
+    def parse_values(html: str, loading: str = "loading-x-anim-0", scriptId: str = "") -> Tuple[str, Optional[List[int]]]:
+
+        svg_data: str = Parser._svg_data(html, loading)
 
         if scriptId:
-            if scriptId == "ondemand.s":
-                script_link: str = 'https://abs.twimg.com/responsive-web/client-web/ondemand.s.' + Utils.between(html, f'"{scriptId}":"', '"') + 'a.js'
-            else:
-                script_link: str = f'https://grok.com/_next/{scriptId}'
+            return svg_data, Parser.txid_numbers(Parser._script_link(html, scriptId))
 
-            if script_link in Parser.mapping:
-                numbers: list = Parser.mapping[script_link]
-            else:
-                try:
-                    response = requests.get(script_link, impersonate="chrome136")
-                    response.raise_for_status()
-                    script_content: str = response.text
-                except requests.errors.RequestError as e:
-                    raise GrokNetworkError(f"Failed to fetch script for parsing: {e}")
-
-                numbers: list = [int(x) for x in findall(r'x\[(\d+)\]\s*,\s*16', script_content)]
-                if not numbers:
-                    raise GrokParsingError(f"Failed to parse numbers from script: {script_link}")
-
-                Parser.mapping[script_link] = numbers
-                Parser._ensure_mappings_dir()
-                try:
-                    with open(Parser.TXID_PATH, 'w') as f:
-                        dump(Parser.mapping, f)
-                except Exception as e:
-                    Log.Error(f"Failed to save txid mapping: {e}")
+        return svg_data, None
+
+    @staticmethod
+    async def parse_values_async(html: str, loading: str = "loading-x-anim-0", scriptId: str = "") -> Tuple[str, Optional[List[int]]]:
+        """Async counterpart of :meth:`parse_values`."""
 
-            return svg_data, numbers
+        svg_data: str = Parser._svg_data(html, loading)
+
+        if scriptId:
+            return svg_data, await Parser.txid_numbers_async(Parser._script_link(html, scriptId))
 
         return svg_data, None
 
+    @staticmethod
+    def anim(verification_token: str) -> str:
+        """``loading-x-anim-N`` id of the SVG the verification token selects."""
+        try:
+            array: list = list(b64decode(verification_token))
+            return "loading-x-anim-" + str(array[5] % 4)
+        except Exception:
+            return "loading-x-anim-0"
 
     @staticmethod
     def get_anim(html:  str, verification: str = "grok-site-verification") -> Tuple[str, str]:
@@ -100,39 +168,72 @@ class Parser:
         if not verification_token:
             raise GrokParsingError(f"Failed to find verification token: {verification}")
 
-        try:
-            array: list = list(b64decode(verification_token))
-            anim: str = "loading-x-anim-" + str(array[5] % 4)
-            return verification_token, anim
-        except Exception:
-            return verification_token, "loading-x-anim-0"
+        return verification_token, Parser.anim(verification_token)
 
     @staticmethod
-    def parse_grok(scripts: list) -> Tuple[List[str], str]:
+    def verification(action: "ActionResponse") -> Tuple[str, str, str]:
+        """``(verification_token, anim, svg_data)`` from a decoded verification server action."""
+        if not action.verification_token:
+            raise GrokParsingError("Failed to find verification token: grok-site-verification")
 
-        Parser._load_grok_mapping()
+        anim: str = Parser.anim(action.verification_token)
+        return action.verification_token, anim, Parser.select_svg(action.svg_paths, anim)
 
-        for index in Parser.grok_mapping:
-            if index.get("action_script") in scripts:
-                return index["actions"], index["xsid_script"]
+    @staticmethod
+    def _find_grok_mapping(scripts: list) -> Optional[Tuple[List[str], str]]:
 
-        script_content1 = None
-        script_content2 = None
-        action_script = None
+        index: dict = Parser.grok_mapping.find(scripts)
+        Hooks.emit("cache", cache="grok", hit=bool(index))
+        if index:
+            return index["actions"], index["xsid_script"]
 
-        for script in scripts:
-            try:
-                response = requests.get(f'https://grok.com{script}', impersonate="chrome136")
-                response.raise_for_status()
-                content: str = response.text
-            except requests.errors.RequestError as e:
-                continue
+        return None
+
+    @staticmethod
+    def _match_script(script: str, content: str, found: dict) -> bool:
+        """Record ``content`` if it is one of the two target scripts; ``True`` once both are known."""
+        if "anonPrivateKey" in content:
+            found["action"] = content
+            found["action_script"] = script
+        elif "880932)" in content:
+            found["xsid"] = content
+
+        return "action" in found and "xsid" in found
+
+    @staticmethod
+    def _rank_scripts(scripts: list) -> list:
+        """De-duplicate ``scripts`` and order them so the likely targets are fetched first."""
+
+        def rank(script: str) -> int:
+            name: str = script.rsplit("/", 1)[-1]
+            if "/app/" in script:
+                return 0
+            if name.startswith(FRAMEWORK_CHUNKS):
+                return 2
+            return 1
+
+        return sorted(dict.fromkeys(scripts), key=rank)
+
+    @staticmethod
+    def _get(url: str) -> "Response":
+        with Parser.sessions.lease() as session:
+            return session.get(url, default_headers=True)
+
+    @staticmethod
+    def _fetch_script(script: str) -> Optional[str]:
+        from curl_cffi import requests
+
+        try:
+            response = Parser._get(f'{Parser.base_url}{script}')
+            response.raise_for_status()
+            return response.text
+        except requests.errors.RequestsError:
+            return None
 
-            if "anonPrivateKey" in content:
-                script_content1 = content
-                action_script = script
-            elif "880932)" in content:
-                script_content2 = content
+    @staticmethod
+    def _store_grok(found: dict) -> Tuple[List[str], str]:
+        script_content1 = found.get("action")
+        script_content2 = found.get("xsid")
 
         if not script_content1 or not script_content2:
             raise GrokParsingError("Failed to find required script contents for Grok actions.")
@@ -142,19 +243,78 @@ class Parser:
         xsid_script: str = xsid_match.group(1) if xsid_match else None
 
         if actions and xsid_script:
-            Parser.grok_mapping.append({
+            Parser.grok_mapping.put(found["action_script"], {
                 "xsid_script": xsid_script,
-                "action_script": action_script,
+                "action_script": found["action_script"],
                 "actions": actions
             })
 
-            Parser._ensure_mappings_dir()
-            try:
-                with open(Parser.GROK_PATH, 'w') as f:
-                    dump(Parser.grok_mapping, f, indent=2)
-            except Exception as e:
-                Log.Error(f"Failed to save grok mapping: {e}")
-
             return actions, xsid_script
         else:
             raise GrokParsingError("Failed to parse actions or xsid_script from Grok scripts.")
+
+    @staticmethod
+    def parse_grok(scripts: list, concurrency: int = None) -> Tuple[List[str], str]:
+
+        cached = Parser._find_grok_mapping(scripts)
+        if cached:
+            return cached
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        found: dict = {}
+
+        with Hooks.phase("parse_grok"):
+            pool = ThreadPoolExecutor(max_workers=concurrency or Parser.fetch_concurrency, thread_name_prefix="grok-script")
+            try:
+                futures: dict = {pool.submit(Parser._fetch_script, script): script for script in Parser._rank_scripts(scripts)}
+
+                for future in as_completed(futures):
+                    content: Optional[str] = future.result()
+                    if content is not None and Parser._match_script(futures[future], content, found):
+                        break
+            finally:
+                # Drop whatever has not started yet; in-flight fetches finish in the background.
+                pool.shutdown(wait=False, cancel_futures=True)
+
+            return Parser._store_grok(found)
+
+    @staticmethod
+    async def parse_grok_async(scripts: list, concurrency: int = None) -> Tuple[List[str], str]:
+        """Async counterpart of :meth:`parse_grok`."""
+
+        cached = Parser._find_grok_mapping(scripts)
+        if cached:
+            return cached
+
+        from curl_cffi import requests
+        import asyncio
+
+        found: dict = {}
+        limit: int = concurrency or Parser.fetch_concurrency
+        semaphore = asyncio.Semaphore(limit)
+
+        with Hooks.phase("parse_grok"):
+            async with requests.AsyncSession(impersonate="chrome136", max_clients=limit) as session:
+
+                async def fetch(script: str) -> Tuple[str, Optional[str]]:
+                    async with semaphore:
+                        try:
+                            response = await session.get(f'{Parser.base_url}{script}')
+                            response.raise_for_status()
+                            return script, response.text
+                        except requests.errors.RequestsError:
+                            return script, None
+
+                tasks: list = [asyncio.create_task(fetch(script)) for script in Parser._rank_scripts(scripts)]
+                try:
+                    for next_done in asyncio.as_completed(tasks):
+                        script, content = await next_done
+                        if content is not None and Parser._match_script(script, content, found):
+                            break
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+            return Parser._store_grok(found)
@@ -1,11 +1,40 @@
 from math      import floor, copysign, pi, cos, sin
 from base64    import b64decode, b64encode
 from re        import findall, sub
-from typing    import List, Dict
+from typing    import List, Dict, Tuple, Sequence, Optional
+from threading import Lock, Thread
+from collections import OrderedDict
 from random    import random
 from hashlib   import sha256
 from struct    import pack
 from time      import time
+from ..hooks    import Hooks
+from ..store    import shared_store
+
+# cubicBezierEased reproduces an 80-step bisection on [0, 1]. Newton's method locates the
+# level-WARM_LEVEL dyadic interval that bisection would reach, which is then accepted only if
+# x(u) clears t by WARM_MARGIN at both ends, and the remaining steps run unchanged.
+BISECT_STEPS: int = 80
+WARM_LEVEL: int = 32
+WARM_WIDTH: float = 2.0 ** -WARM_LEVEL
+WARM_MARGIN: float = 1e-12
+NEWTON_STEPS: int = 8
+NEWTON_MIN_SLOPE: float = 1e-9
+
+_np = False
+
+def _numpy():
+    """NumPy if it is installed, imported on first use."""
+    global _np
+    if _np is False:
+        try:
+            import numpy as _np
+        except ImportError:
+            _np = None
+    return _np
+
+# XOR_TABLES[k] maps every byte b to b ^ k, for use with bytes.translate.
+XOR_TABLES: List[bytes] = [bytes(b ^ k for b in range(256)) for k in range(256)]
 
 
 class Signature:
@@ -22,25 +51,98 @@ class Signature:
         return rounded
 
     @staticmethod
-    def cubicBezierEased(t: float, x1: float, y1: float, x2: float, y2: float) -> float:
-        def bezier(u: float):
-            omu = 1.0 - u
-            b1 = 3.0 * omu * omu * u
-            b2 = 3.0 * omu * u * u
-            b3 = u * u * u
-            x = b1 * x1 + b2 * x2 + b3
-            y = b1 * y1 + b2 * y2 + b3
-            return x, y
-
-        lo, hi = 0.0, 1.0
-        for _ in range(80):
+    def _bisect(t: float, x1: float, y1: float, x2: float, y2: float, lo: float = 0.0, hi: float = 1.0, steps: int = BISECT_STEPS) -> float:
+        for _ in range(steps):
             mid = 0.5 * (lo + hi)
-            if bezier(mid)[0] < t:
+            omu = 1.0 - mid
+            if 3.0 * omu * omu * mid * x1 + 3.0 * omu * mid * mid * x2 + mid * mid * mid < t:
                 lo = mid
             else:
                 hi = mid
         u = 0.5 * (lo + hi)
-        return bezier(u)[1]
+        omu = 1.0 - u
+        return 3.0 * omu * omu * u * y1 + 3.0 * omu * u * u * y2 + u * u * u
+
+    @staticmethod
+    def _newton(t: float, x1: float, x2: float) -> Optional[float]:
+        u = t
+        for _ in range(NEWTON_STEPS):
+            omu = 1.0 - u
+            x = 3.0 * omu * omu * u * x1 + 3.0 * omu * u * u * x2 + u * u * u - t
+            dx = 3.0 * omu * omu * x1 + 6.0 * omu * u * (x2 - x1) + 3.0 * u * u * (1.0 - x2)
+            if abs(dx) < NEWTON_MIN_SLOPE:
+                return None
+            u -= x / dx
+            if not 0.0 <= u <= 1.0:
+                return None
+        return u
+
+    @staticmethod
+    def cubicBezierEased(t: float, x1: float, y1: float, x2: float, y2: float) -> float:
+        if 0.0 <= x1 <= 1.0 and 0.0 <= x2 <= 1.0:
+            u = Signature._newton(t, x1, x2)
+            if u is not None:
+                lo = floor(u / WARM_WIDTH) * WARM_WIDTH
+                hi = min(lo + WARM_WIDTH, 1.0)
+
+                omu = 1.0 - lo
+                below = lo == 0.0 or t - (3.0 * omu * omu * lo * x1 + 3.0 * omu * lo * lo * x2 + lo * lo * lo) > WARM_MARGIN
+                omu = 1.0 - hi
+                above = hi == 1.0 or (3.0 * omu * omu * hi * x1 + 3.0 * omu * hi * hi * x2 + hi * hi * hi) - t > WARM_MARGIN
+
+                if below and above:
+                    return Signature._bisect(t, x1, y1, x2, y2, lo, hi, BISECT_STEPS - WARM_LEVEL)
+
+        return Signature._bisect(t, x1, y1, x2, y2)
+
+    @staticmethod
+    def cubicBezierEasedBatch(t: Sequence[float], x1: Sequence[float], y1: Sequence[float], x2: Sequence[float], y2: Sequence[float]) -> List[float]:
+        """
+        :meth:`cubicBezierEased` over equally long sequences of inputs.
+
+        Runs as one vectorised pass when NumPy is installed, otherwise falls back to
+        the scalar solver. Both give bit-identical results.
+        """
+        np = _numpy()
+        if np is None:
+            return [Signature.cubicBezierEased(*args) for args in zip(t, x1, y1, x2, y2)]
+
+        t, x1, y1, x2, y2 = (np.asarray(v, dtype=np.float64) for v in (t, x1, y1, x2, y2))
+        if not t.size:
+            return []
+
+        def bezier_x(u, t, x1, x2):
+            omu = 1.0 - u
+            return 3.0 * omu * omu * u * x1 + 3.0 * omu * u * u * x2 + u * u * u
+
+        u = t.copy()
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for _ in range(NEWTON_STEPS):
+                omu = 1.0 - u
+                dx = 3.0 * omu * omu * x1 + 6.0 * omu * u * (x2 - x1) + 3.0 * u * u * (1.0 - x2)
+                u = u - np.where(np.abs(dx) < NEWTON_MIN_SLOPE, np.nan, (bezier_x(u, t, x1, x2) - t) / dx)
+
+            lo = np.floor(u / WARM_WIDTH) * WARM_WIDTH
+            hi = np.minimum(lo + WARM_WIDTH, 1.0)
+            warm = (
+                (x1 >= 0.0) & (x1 <= 1.0) & (x2 >= 0.0) & (x2 <= 1.0) & (u >= 0.0) & (u <= 1.0)
+                & ((lo == 0.0) | (t - bezier_x(lo, t, x1, x2) > WARM_MARGIN))
+                & ((hi == 1.0) | (bezier_x(hi, t, x1, x2) - t > WARM_MARGIN))
+            )
+
+        # Lanes without a trusted warm start bisect from [0, 1] like the scalar fallback.
+        lo = np.where(warm, lo, 0.0)
+        hi = np.where(warm, hi, 1.0)
+        for step in range(BISECT_STEPS):
+            mid = 0.5 * (lo + hi)
+            below = bezier_x(mid, t, x1, x2) < t
+            active = ~warm | (step < BISECT_STEPS - WARM_LEVEL)
+            lo = np.where(active & below, mid, lo)
+            hi = np.where(active & ~below, mid, hi)
+
+        u = 0.5 * (lo + hi)
+        omu = 1.0 - u
+        return (3.0 * omu * omu * u * y1 + 3.0 * omu * u * u * y2 + u * u * u).tolist()
 
     @staticmethod
     def xa(svg: str) -> List[List[int]]:
@@ -83,14 +185,19 @@ class Signature:
         return sign + format(intpart, "x") + "." + frac_str
 
     @staticmethod
-    def simulateStyle(values: List[int], c: int) -> Dict[str,str]:
+    def ease_args(values: List[int], c: int) -> Tuple[float, float, float, float, float]:
+        """Arguments ``simulateStyle`` passes to ``cubicBezierEased``."""
         duration = 4096
         currentTime = round(c / 10.0) * 10
         t = currentTime / duration
 
         cp = [Signature._h(v, -1 if (i % 2) else 0, 1, False) for i, v in enumerate(values[7:])]
+        return t, cp[0], cp[1], cp[2], cp[3]
 
-        easedY = Signature.cubicBezierEased(t, cp[0], cp[1], cp[2], cp[3])
+    @staticmethod
+    def simulateStyle(values: List[int], c: int, easedY: Optional[float] = None) -> Dict[str,str]:
+        if easedY is None:
+            easedY = Signature.cubicBezierEased(*Signature.ease_args(values, c))
 
         start = [float(x) for x in values[0:3]]
         end = [float(x) for x in values[3:6]]
@@ -138,13 +245,22 @@ class Signature:
         return {"color": color, "transform": transform}
 
     @staticmethod
-    def xs(x_bytes: bytes, svg: str, x_values: list) -> str:
+    def cell(x_bytes: bytes, x_values: list) -> Tuple[int, int]:
+        """SVG row index and animation product ``c`` selected by the verification bytes."""
         arr = list(x_bytes)
         idx = arr[x_values[0]] % 16
         c = ((arr[x_values[1]] % 16) * (arr[x_values[2]] % 16)) * (arr[x_values[3]] % 16)
+        return idx, c
+
+    @staticmethod
+    def xs(x_bytes: bytes, svg: str, x_values: list) -> str:
+        idx, c = Signature.cell(x_bytes, x_values)
         o = Signature.xa(svg)
-        vals = o[idx]
-        k = Signature.simulateStyle(vals, c)
+        return Signature.style_hex(o[idx], c)
+
+    @staticmethod
+    def style_hex(vals: List[int], c: int, easedY: Optional[float] = None) -> str:
+        k = Signature.simulateStyle(vals, c, easedY)
 
         concat = str(k["color"]) + str(k["transform"])
         matches = findall(r"[\d\.\-]+", concat)
@@ -157,13 +273,38 @@ class Signature:
         cleaned = joined.replace(".", "").replace("-", "")
         return cleaned
 
+    tables: "OrderedDict[Tuple[str, Tuple[int, ...]], SignatureTable]" = OrderedDict()
+    table_cache_size: int = 64
+    _tables_lock: Lock = Lock()
+    # Precomputed tables shared with the other workers on the host, see :meth:`SignatureTable.share`.
+    shared_tables = shared_store("signature_tables", memoize=False)
+
     @staticmethod
-    def generate_sign(path: str, method: str, verification: str, svg: str, x_values: list, time_n: int = None, random_float: float = None) -> str:
+    def table(svg: str, x_values: list) -> "SignatureTable":
+        """Return the cached :class:`SignatureTable` for ``svg``/``x_values``, evicting the least recently used."""
+        key = (svg, tuple(x_values))
+        with Signature._tables_lock:
+            table = Signature.tables.get(key)
+            if table is not None:
+                Signature.tables.move_to_end(key)
+        Hooks.emit("cache", cache="signature_table", hit=table is not None)
+        if table is not None:
+            return table
 
-        n = int(time() - 1682924400) if not time_n else time_n
+        table = SignatureTable(svg, x_values)
+        with Signature._tables_lock:
+            cached = Signature.tables.setdefault(key, table)
+            Signature.tables.move_to_end(key)
+            while len(Signature.tables) > Signature.table_cache_size:
+                Signature.tables.popitem(last=False)
+
+        if cached is table and Signature.shared_tables is not None:
+            table.share(Signature.shared_tables)
+        return cached
+
+    @staticmethod
+    def _assemble(path: str, method: str, r: bytes, o: str, n: int, random_float: float = None) -> str:
         t = pack('<I', n)
-        r = b64decode(verification)
-        o = Signature.xs(r, svg, x_values)
 
         msg = "!".join([method, path, str(n)]) + "obfiowerehiring" + o
         digest = sha256(msg.encode('utf-8')).digest()[:16]
@@ -171,10 +312,100 @@ class Signature:
         prefix_byte = int(floor(random() if not random_float else random_float * 256))
         assembled = bytes([prefix_byte]) + r + t + digest + bytes([3])
 
-        arr = bytearray(assembled)
-        if len(arr) > 0:
-            first = arr[0]
-            for i in range(1, len(arr)):
-                arr[i] = arr[i] ^ first
+        # XOR every byte after the first with the first one.
+        arr = assembled[:1] + assembled[1:].translate(XOR_TABLES[prefix_byte])
+
+        return b64encode(arr).decode('ascii').replace('=', '')
+
+    @staticmethod
+    def generate_sign(path: str, method: str, verification: str, svg: str, x_values: list, time_n: int = None, random_float: float = None) -> str:
+
+        n = int(time() - 1682924400) if not time_n else time_n
+        r = b64decode(verification)
+        o = Signature.table(svg, x_values).lookup(r)
+
+        return Signature._assemble(path, method, r, o, n, random_float)
+
+    @staticmethod
+    def generate_sign_batch(paths: List[str], method: str, verification: str, svg: str, x_values: list, time_n: int = None, random_floats: List[float] = None) -> List[str]:
+        """
+        Sign every path in ``paths`` for one verification token.
+
+        The token is decoded and its table cell resolved once; each path then only
+        costs one sha256. ``random_floats`` optionally gives one value per path.
+        """
+
+        n = int(time() - 1682924400) if not time_n else time_n
+        r = b64decode(verification)
+        o = Signature.table(svg, x_values).lookup(r)
+
+        if random_floats is None:
+            random_floats = [None] * len(paths)
+
+        return [Signature._assemble(path, method, r, o, n, random_float) for path, random_float in zip(paths, random_floats)]
+
+
+class SignatureTable:
+    """
+    Memoised ``Signature.xs`` results for one SVG and ``x_values`` pair.
+
+    ``xs`` only depends on the SVG row (16 choices) and the product ``c`` picked by
+    the verification bytes, so each cell is computed once by ``simulateStyle`` and
+    every later signature for the same page is a dictionary lookup.
+    """
+
+    # Every value ``c`` can take: a product of three nibbles.
+    PRODUCTS: Tuple[int, ...] = tuple(sorted({a * b * d for a in range(16) for b in range(16) for d in range(16)}))
+
+    def __init__(self, svg: str, x_values: list) -> None:
+        self.svg: str = svg
+        self.rows: List[List[int]] = Signature.xa(svg)
+        self.x_values: Tuple[int, ...] = tuple(x_values)
+        self.cells: Dict[Tuple[int, int], str] = {}
+
+    def lookup(self, x_bytes: bytes) -> str:
+        key = Signature.cell(x_bytes, self.x_values)
+        o = self.cells.get(key)
+        if o is None:
+            o = self.cells[key] = Signature.style_hex(self.rows[key[0]], key[1])
+        return o
+
+    def precompute(self) -> "SignatureTable":
+        """Fill every cell up front in one batched solve, e.g. before sharing the table with other workers."""
+        missing: list = [(idx, c) for idx in range(min(16, len(self.rows))) for c in self.PRODUCTS if (idx, c) not in self.cells]
+        if not missing:
+            return self
+
+        args: list = [Signature.ease_args(self.rows[idx], c) for idx, c in missing]
+        eased: list = Signature.cubicBezierEasedBatch(*zip(*args))
+
+        for (idx, c), easedY in zip(missing, eased):
+            self.cells[(idx, c)] = Signature.style_hex(self.rows[idx], c, easedY)
+        return self
+
+    def share(self, store, background: bool = True) -> Optional[Thread]:
+        """
+        Load every cell from ``store``, or precompute them and publish the table there.
+
+        The first worker to meet a new SVG pays for the precompute, in a background thread
+        unless ``background`` is off, and answers from lazily filled cells meanwhile; the other
+        workers then load the finished table instead of solving it again.
+        """
+        key: str = sha256(f"{self.svg}\0{self.x_values}".encode()).hexdigest()
+        cells = store.get(key)
+        Hooks.emit("cache", cache="shared_signature_table", hit=cells is not None)
+        if cells is not None:
+            self.cells.update({(idx, c): o for idx, c, o in cells})
+            return None
+
+        def publish() -> None:
+            self.precompute()
+            store.put(key, [[idx, c, o] for (idx, c), o in dict(self.cells).items()])
+
+        if not background:
+            publish()
+            return None
 
-        return b64encode(bytes(arr)).decode('ascii').replace('=', '')
+        thread = Thread(target=publish, name="grok-signature-table", daemon=True)
+        thread.start()
+        return thread
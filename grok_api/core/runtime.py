@@ -33,7 +33,7 @@ class Run:
         
         @param exception: Exception that occured
         """
-        Log.Error(f"Error occurred: {exception}")
+        Log.Error("Error occurred: %s", exception)
         
 class Utils:
     
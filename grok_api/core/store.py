@@ -0,0 +1,254 @@
+from typing    import Any, Optional, Iterable, Tuple, Union
+from threading import Lock
+from tempfile  import NamedTemporaryFile
+from json      import load, dump, loads, dumps
+from .logger   import Log
+import os
+
+try:
+    from fcntl import flock, LOCK_EX, LOCK_UN
+except ImportError:  # Windows
+    flock = None
+    from msvcrt import locking, LK_LOCK, LK_UNLCK
+
+
+# SQLite file every worker on the host shares parsed grok.com artifacts through, see :func:`shared_store`.
+SHARED_CACHE: Optional[str] = os.environ.get("GROK_API_SHARED_CACHE") or None
+
+
+class _FileLock:
+    """Exclusive advisory lock on ``<path>.lock``, shared by every process on the host."""
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path + ".lock"
+
+    def __enter__(self) -> "_FileLock":
+        self.file = open(self.path, "a+b")
+        if flock:
+            flock(self.file.fileno(), LOCK_EX)
+        else:
+            self.file.seek(0)
+            locking(self.file.fileno(), LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *args) -> None:
+        try:
+            if flock:
+                flock(self.file.fileno(), LOCK_UN)
+            else:
+                self.file.seek(0)
+                locking(self.file.fileno(), LK_UNLCK, 1)
+        finally:
+            self.file.close()
+
+
+class MappingStore:
+    """
+    JSON mapping file indexed in memory for O(1) lookups.
+
+    Files are either a ``{key: value}`` object or, when ``key`` is given, a list
+    of entries indexed by ``entry[key]``. Lookups only touch the disk on a miss,
+    reloading the file if another process has replaced it since. Writes merge the
+    new entry into the current file under a cross-process lock and publish it
+    with an atomic rename, so readers never see a partial file.
+    """
+
+    def __init__(self, path: str, key: str = None) -> None:
+        self.path: str = path
+        self.key: Optional[str] = key
+
+        self._index: dict = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock: Lock = Lock()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+            return stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _read(self) -> Optional[dict]:
+        try:
+            with open(self.path, "r") as f:
+                data = load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            if os.path.getsize(self.path) == 0:
+                return {}
+            Log.Error("Failed to load mapping %s: %s", self.path, e)
+            return None
+
+        if self.key:
+            return {entry[self.key]: entry for entry in data if entry.get(self.key)}
+        return dict(data)
+
+    def refresh(self) -> bool:
+        """Reload the file if it changed on disk, returning ``True`` when it did."""
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> bool:
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+
+        index = self._read()
+        if index is None:
+            return False
+
+        self._index = index
+        self._signature = signature
+        return True
+
+    def get(self, key: str) -> Any:
+        value = self._index.get(key)
+        if value is None and self.refresh():
+            value = self._index.get(key)
+        return value
+
+    def find(self, keys: Iterable[str]) -> Any:
+        """Return the value of the first of ``keys`` present in the store."""
+        keys = list(keys)
+        for _ in range(2):
+            for key in keys:
+                value = self._index.get(key)
+                if value is not None:
+                    return value
+            if not self.refresh():
+                return None
+        return None
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def put(self, key: str, value: Any) -> None:
+        """Add or replace one entry, merging with whatever other processes wrote meanwhile."""
+        with self._lock:
+            self._index[key] = value
+            try:
+                directory: str = os.path.dirname(self.path)
+                os.makedirs(directory, exist_ok=True)
+
+                with _FileLock(self.path):
+                    current = self._read()
+                    if current is not None:
+                        current[key] = value
+                        self._index = current
+                    self._write(directory)
+                    self._signature = self._stat()
+            except Exception as e:
+                Log.Error("Failed to save mapping %s: %s", self.path, e)
+
+    def _write(self, directory: str) -> None:
+        with NamedTemporaryFile("w", dir=directory, prefix=".tmp-", suffix=".json", delete=False) as f:
+            try:
+                if self.key:
+                    dump(list(self._index.values()), f, indent=2)
+                else:
+                    dump(self._index, f)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, self.path)
+
+
+class SQLiteMappingStore:
+    """
+    :class:`MappingStore` counterpart kept in a SQLite file in WAL mode.
+
+    Every process that opens the same file shares its entries: a value one worker writes is
+    found by the others on their next miss, without rewriting or re-reading a whole file.
+    Several stores can share a file under different ``namespace`` names. Entries read once are
+    kept in memory unless ``memoize`` is off. ``seed`` is consulted after the database, so the
+    bundled JSON mappings keep applying.
+    """
+
+    def __init__(self, path: str, namespace: str, seed: MappingStore = None, memoize: bool = True) -> None:
+        self.path: str = path
+        self.namespace: str = namespace
+        self.seed: Optional[MappingStore] = seed
+        self.memoize: bool = memoize
+
+        self._index: dict = {}
+        self._lock: Lock = Lock()
+
+        import sqlite3
+        self._db: "sqlite3.Connection" = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS mappings (namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+        )
+
+    def refresh(self) -> bool:
+        """Forget the in-memory entries so the next lookups read the database again."""
+        with self._lock:
+            self._index = {}
+        return True
+
+    def _select(self, keys: list) -> dict:
+        marks: str = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT key, value FROM mappings WHERE namespace = ? AND key IN ({marks})", (self.namespace, *keys)
+            ).fetchall()
+        found: dict = {key: loads(value) for key, value in rows}
+        if self.memoize:
+            self._index.update(found)
+        return found
+
+    def get(self, key: str) -> Any:
+        value = self._index.get(key)
+        if value is None:
+            value = self._select([key]).get(key)
+        if value is None and self.seed is not None:
+            value = self.seed.get(key)
+        return value
+
+    def find(self, keys: Iterable[str]) -> Any:
+        """Return the value of the first of ``keys`` present in the store."""
+        keys = list(keys)
+        for key in keys:
+            value = self._index.get(key)
+            if value is not None:
+                return value
+
+        found: dict = self._select(keys) if keys else {}
+        for key in keys:
+            if key in found:
+                return found[key]
+        return self.seed.find(keys) if self.seed is not None else None
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM mappings WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+
+    def put(self, key: str, value: Any) -> None:
+        """Add or replace one entry for every process using the file."""
+        try:
+            with self._lock:
+                self._db.execute("INSERT OR REPLACE INTO mappings VALUES (?, ?, ?)", (self.namespace, key, dumps(value)))
+                if self.memoize:
+                    self._index[key] = value
+        except Exception as e:
+            Log.Error("Failed to save mapping %s/%s: %s", self.path, self.namespace, e)
+
+
+def shared_store(namespace: str, seed: MappingStore = None, memoize: bool = True) -> Optional[Union[MappingStore, "SQLiteMappingStore"]]:
+    """``namespace`` of the ``GROK_API_SHARED_CACHE`` file, or just ``seed`` when no shared cache is configured."""
+    if SHARED_CACHE is None:
+        return seed
+    return SQLiteMappingStore(SHARED_CACHE, namespace, seed, memoize)
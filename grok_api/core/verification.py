@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from threading   import Lock
+from time        import monotonic
+from typing      import List, Optional, Tuple
+from .hooks      import Hooks
+
+
+class VerificationCache:
+    """
+    Verification material from the last full handshake of each anonymous user.
+
+    A follow-up turn for the same ``anon_user`` signs with the cached verification token,
+    SVG data and txid numbers and skips the two server-action requests while the entry is
+    younger than ``ttl``. When grok.com rejects reused material, :meth:`reject` drops the
+    entry and shrinks ``ttl`` below the age at which it failed; every turn that goes through
+    with reused material grows it back by ``growth``, up to the configured ``ttl``, so the
+    window follows what upstream actually accepts.
+    """
+
+    def __init__(self, ttl: float = 600.0, max_size: int = 10000, min_ttl: float = 5.0, growth: float = 1.25) -> None:
+        self.ttl: float = ttl
+        self.max_ttl: float = ttl
+        self.max_size: int = max_size
+        self.min_ttl: float = min_ttl
+        self.growth: float = growth
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock: Lock = Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.rejections: int = 0
+        self.accepted: int = 0
+
+    def get(self, anon_user: str) -> Optional[Tuple[str, str, List[int]]]:
+        """Return ``(verification_token, svg_data, numbers)`` if still inside the validity window."""
+        with self._lock:
+            entry = self._entries.get(anon_user)
+            if entry is not None and monotonic() - entry[0] > self.ttl:
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(anon_user)
+                self.hits += 1
+
+        Hooks.emit("cache", cache="verification", hit=entry is not None)
+        return entry[1] if entry is not None else None
+
+    def put(self, anon_user: str, verification_token: str, svg_data: str, numbers: List[int]) -> None:
+        with self._lock:
+            self._entries[anon_user] = (monotonic(), (verification_token, svg_data, numbers))
+            self._entries.move_to_end(anon_user)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def reject(self, anon_user: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(anon_user, None)
+            self.rejections += 1
+            if entry is not None:
+                self.ttl = max(self.min_ttl, min(self.ttl, (monotonic() - entry[0]) * 0.9))
+
+    def accept(self, anon_user: str) -> None:
+        """Record that grok.com accepted material reused for ``anon_user``."""
+        with self._lock:
+            self.accepted += 1
+            self.ttl = min(self.max_ttl, self.ttl * self.growth)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "rejections": self.rejections,
+                "accepted": self.accepted,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,158 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading          import Lock, Event
+from typing             import Callable, Any, AsyncGenerator, Iterator
+from time               import perf_counter
+import asyncio
+
+
+class ExecutorFull(Exception):
+    """Raised when every worker is busy and the wait queue is at its limit."""
+    pass
+
+
+class _Failure:
+    def __init__(self, error: BaseException) -> None:
+        self.error: BaseException = error
+
+_END = object()
+
+
+class BoundedExecutor:
+    """
+    Thread pool for blocking ``Grok`` calls with a hard cap on queued work.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more may
+    wait for a worker; anything beyond that is rejected with :class:`ExecutorFull`
+    instead of piling up behind slow conversations.
+    """
+
+    def __init__(self, max_workers: int = 50, max_queue: int = 100) -> None:
+        self.max_workers: int = max_workers
+        self.max_queue: int = max_queue
+
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="grok-worker")
+        self._lock: Lock = Lock()
+
+        self.pending: int = 0
+        self.active: int = 0
+        self.completed: int = 0
+        self.rejected: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+
+    @property
+    def queued(self) -> int:
+        return self.pending - self.active
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorFull(f"Worker pool is full ({self.max_workers} workers, {self.max_queue} queued)")
+            self.pending += 1
+
+    def _call(self, submitted: float, func: Callable[..., Any], *args: Any) -> Any:
+        waited: float = perf_counter() - submitted
+        with self._lock:
+            self.active += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+            self._release()
+
+    def submit(self, func: Callable[..., Any], *args: Any):
+        """Schedule ``func(*args)`` on the pool, raising :class:`ExecutorFull` when saturated."""
+        self._acquire()
+        try:
+            future = self._executor.submit(self._call, perf_counter(), func, *args)
+        except BaseException:
+            self._release()
+            raise
+
+        # A call cancelled while still queued never reaches ``_call``.
+        future.add_done_callback(lambda f: f.cancelled() and self._release())
+        return future
+
+    def _release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Await ``func(*args)`` on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    async def stream(self, factory: Callable[[], Iterator[Any]], buffer: int = 64) -> AsyncGenerator[Any, None]:
+        """
+        Drain the blocking iterator returned by ``factory()`` on the pool.
+
+        Items are handed over through a queue of at most ``buffer`` entries, so a
+        slow consumer stalls the worker instead of growing memory. Closing the
+        generator early stops the worker at its next item.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        stop: Event = Event()
+
+        future = self.submit(self._pump, factory, queue, loop, stop)
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            stop.set()
+            future.cancel()
+
+    @staticmethod
+    def _pump(factory: Callable[[], Iterator[Any]], queue: asyncio.Queue, loop: asyncio.AbstractEventLoop, stop: Event) -> None:
+
+        def put(item: Any) -> bool:
+            pending = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while True:
+                try:
+                    pending.result(timeout=1)
+                    return True
+                except TimeoutError:
+                    if stop.is_set():
+                        pending.cancel()
+                        return False
+
+        items = None
+        try:
+            items = factory()
+            for item in items:
+                if stop.is_set() or not put(item):
+                    return
+        except Exception as e:
+            put(_Failure(e))
+        finally:
+            if items is not None and hasattr(items, "close"):
+                items.close()
+            if not stop.is_set():
+                put(_END)
+
+    def stats(self) -> dict:
+        with self._lock:
+            started: int = self.completed + self.active
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queued": self.queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_avg": self.wait_total / started if started else 0.0,
+                "wait_max": self.wait_max,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
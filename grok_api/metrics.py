@@ -0,0 +1,105 @@
+from bisect    import bisect_left
+from threading import Lock
+from typing    import Dict, List, Tuple
+from .core     import Hooks
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(names: Tuple[str, ...], values: tuple) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...]) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.labels: Tuple[str, ...] = labels
+        self.values: Dict[tuple, float] = {}
+
+    def inc(self, labels: tuple, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]) -> None:
+        self.name: str = name
+        self.help: str = help
+        self.labels: Tuple[str, ...] = labels
+        self.buckets: Tuple[float, ...] = buckets
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self.values: Dict[tuple, list] = {}
+
+    def observe(self, labels: tuple, value: float) -> None:
+        counts = self.values.get(labels)
+        if counts is None:
+            counts = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, counts in sorted(self.values.items()):
+            total = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                total += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), labels + (le,))} {total}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {counts[-1]:g}")
+            lines.append(f"{self.name}_count{_labels(self.labels, labels)} {total}")
+        return lines
+
+
+class Metrics:
+    """
+    Prometheus view of the library's :class:`Hooks` events, rendered in the text exposition format.
+
+    Call :meth:`install` once to start collecting; :meth:`render` returns the ``/metrics`` body.
+    """
+
+    LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+    RATE_BUCKETS: Tuple[float, ...] = (1, 5, 10, 25, 50, 100, 200, 400)
+
+    def __init__(self) -> None:
+        self.lock: Lock = Lock()
+        self.phase_seconds = Histogram("grok_phase_seconds", "Time spent per request phase.", ("phase", "model"), self.LATENCY_BUCKETS)
+        self.phase_errors = Counter("grok_phase_errors_total", "Request phases that raised, by exception class.", ("phase", "model", "error"))
+        self.tokens = Counter("grok_tokens_total", "Tokens streamed from grok.com.", ("model",))
+        self.tokens_per_second = Histogram("grok_tokens_per_second", "Generation throughput per conversation turn.", ("model",), self.RATE_BUCKETS)
+        self.cache = Counter("grok_cache_lookups_total", "Cache lookups by cache and result.", ("cache", "result"))
+
+    def install(self) -> "Metrics":
+        Hooks.subscribe(self.on_event)
+        return self
+
+    def uninstall(self) -> None:
+        Hooks.unsubscribe(self.on_event)
+
+    def on_event(self, event: str, fields: dict) -> None:
+        with self.lock:
+            if event == "phase":
+                labels = (fields["phase"], fields.get("model") or "")
+                self.phase_seconds.observe(labels, fields["duration"])
+                if fields.get("error"):
+                    self.phase_errors.inc(labels + (fields["error"],))
+            elif event == "tokens":
+                self.tokens.inc((fields["model"],), fields["count"])
+                if fields["duration"] > 0:
+                    self.tokens_per_second.observe((fields["model"],), fields["count"] / fields["duration"])
+            elif event == "cache":
+                self.cache.inc((fields["cache"], "hit" if fields["hit"] else "miss"))
+
+    def render(self) -> str:
+        with self.lock:
+            lines: list = []
+            for metric in (self.phase_seconds, self.phase_errors, self.tokens, self.tokens_per_second, self.cache):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
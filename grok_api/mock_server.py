@@ -0,0 +1,147 @@
+"""
+Offline stand-in for the grok.com endpoints used by ``Grok``, for load tests and benchmarks.
+
+It serves the ``/c`` page, the three server-action stages, the chunk scripts the parser
+looks for and NDJSON conversation streams with a configurable token count, token rate
+and per-request latency. Point the library at it with ``GROK_API_BASE_URL`` or
+``Parser.base_url``. Requests sent through it as an HTTP proxy are served too, so the
+API server's required ``proxy`` field can name the mock itself.
+"""
+from fastapi           import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse, HTMLResponse
+from urllib.parse      import urlsplit
+from argparse          import ArgumentParser
+from base64            import b64encode
+from uuid              import uuid4
+from json              import dumps
+from uvicorn           import run
+import asyncio
+
+ACTIONS = ["7f5b1e2d3c4a59687a8b9c0d1e2f3a4b5c6d7e8f90", "7f6c2f3e4d5b6a7988a9b0c1d2e3f4a5b6c7d8e9f0", "7f7d3a4f5e6c7b8a99b0c1d2e3f4a5b6c7d8e9f0a1"]
+ACTION_SCRIPT = "/_next/static/chunks/app/c/page-mock.js"
+LOADER_SCRIPT = "/_next/static/chunks/9100-mock.js"
+XSID_SCRIPT = "static/chunks/xsid-mock.js"
+
+CHALLENGE = bytes(range(32, 64))
+VERIFICATION = b64encode(bytes([7, 21, 5, 6, 9, 3, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43])).decode()
+SVG = "M 10,30 C" + "C".join(
+    " ".join(str((row * 7 + col * 13) % 255) for col in range(11)) for row in range(16)
+)
+
+PAGE = (
+    '<!DOCTYPE html><html><head>'
+    '<script src="/_next/static/chunks/webpack-mock.js" async=""></script>'
+    f'<script src="{LOADER_SCRIPT}" async=""></script>'
+    f'<script src="{ACTION_SCRIPT}" async=""></script>'
+    '<meta name="baggage" content="sentry-environment=production,sentry-release=mock,sentry-public_key=mock"/>'
+    '<meta name="sentry-trace" content="0123456789abcdef0123456789abcdef-0123456789abcdef-1"/>'
+    '</head><body></body></html>'
+)
+SCRIPTS = {
+    ACTION_SCRIPT: "".join(f'let a{i}=(0,n.createServerReference)("{action}",n.callServer);' for i, action in enumerate(ACTIONS)) + 'const k="anonPrivateKey";',
+    LOADER_SCRIPT: f'e.exports=()=>a.l("{XSID_SCRIPT}",n(880932));',
+    f"/_next/{XSID_SCRIPT}": "x[5],16;x[9],16;x[12],16;x[3],16;",
+    "/_next/static/chunks/webpack-mock.js": "/* runtime */",
+}
+STAGES = [
+    b'0:{"a":"$@1","f":"","b":"mock"}\n1:{"anonUserId":"%s"}\n',
+    b'0:{"a":"$@1","f":"","b":"mock"}\n2:o%x,' % len(CHALLENGE) + CHALLENGE + b'1:{"challenge":"$2","anonUserId":"mock"}\n',
+    (
+        '0:{"a":"$@1","f":"","b":"mock"}\n'
+        f'1:[["$","meta",null,{{"name":"grok-site-verification","content":"{VERIFICATION}"}}],'
+        f'["$","path",null,{{"d":"{SVG}"}}]]\n'
+    ).encode(),
+]
+
+
+class _ProxyPaths:
+    """Accept absolute-form request targets, so the mock can also be the client's HTTP proxy."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and "://" in scope["path"]:
+            path: str = urlsplit(scope["path"]).path or "/"
+            scope = dict(scope, path=path, raw_path=path.encode())
+        await self.app(scope, receive, send)
+
+
+def create_app(tokens: int = 64, token_rate: float = 0.0, latency: float = 0.0) -> FastAPI:
+    """
+    Build the mock application.
+
+    :param tokens: Tokens streamed per conversation turn.
+    :param token_rate: Tokens per second; ``0`` streams them as fast as possible.
+    :param latency: Seconds added before every response, standing in for the network round trip.
+    """
+    app = FastAPI()
+    words = [f" word{i}" for i in range(tokens)]
+
+    async def wait() -> None:
+        if latency:
+            await asyncio.sleep(latency)
+
+    @app.get("/c")
+    async def page() -> HTMLResponse:
+        await wait()
+        response = HTMLResponse(PAGE)
+        response.set_cookie("__cf_bm", uuid4().hex)
+        return response
+
+    @app.post("/c")
+    async def server_action(request: Request) -> Response:
+        await wait()
+        action: str = request.headers.get("next-action", "")
+        if action not in ACTIONS:
+            return Response(status_code=404)
+
+        stage: int = ACTIONS.index(action)
+        body: bytes = STAGES[0] % uuid4().hex.encode() if stage == 0 else STAGES[stage]
+        return Response(body, media_type="text/x-component")
+
+    @app.get("/_next/{script:path}")
+    async def script(script: str) -> Response:
+        await wait()
+        content = SCRIPTS.get(f"/_next/{script}")
+        if content is None:
+            return Response(status_code=404)
+        return Response(content, media_type="application/javascript")
+
+    async def conversation(new: bool, conversation_id: str):
+        await wait()
+        if new:
+            yield dumps({"result": {"conversation": {"conversationId": conversation_id}}}) + "\n"
+        for word in words:
+            if token_rate:
+                await asyncio.sleep(1 / token_rate)
+            token = {"token": word, "isThinking": False, "isSoftStop": False, "responseId": "mock"}
+            yield dumps({"result": {"response": token} if new else token}) + "\n"
+
+        model_response = {"modelResponse": {"responseId": uuid4().hex, "message": "".join(words), "generatedImageUrls": []}}
+        yield dumps({"result": {"response": model_response} if new else model_response}) + "\n"
+
+    @app.post("/rest/app-chat/conversations/new")
+    async def new_conversation() -> StreamingResponse:
+        return StreamingResponse(conversation(True, uuid4().hex), media_type="application/json")
+
+    @app.post("/rest/app-chat/conversations/{conversation_id}/responses")
+    async def follow_up(conversation_id: str) -> StreamingResponse:
+        return StreamingResponse(conversation(False, conversation_id), media_type="application/json")
+
+    return _ProxyPaths(app)
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Serve an offline stand-in for grok.com.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6970)
+    parser.add_argument("--tokens", type=int, default=64, help="tokens per response")
+    parser.add_argument("--token-rate", type=float, default=0.0, help="tokens per second, 0 for unlimited")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+
+    run(create_app(args.tokens, args.token_rate, args.latency), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
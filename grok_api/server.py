@@ -0,0 +1,118 @@
+"""
+``grok-api-server``: run the API server with one or more worker processes.
+
+Every option can also be set through the environment variable named next to it; a flag wins
+over the environment. Per-process settings are handed to the workers through those same
+variables, since each worker imports ``grok_api.api_server`` fresh through :func:`create_app`.
+This module therefore must not import ``api_server`` itself.
+"""
+from argparse import ArgumentParser, Namespace
+from typing   import List, Optional
+from os       import environ
+from inspect  import signature
+from functools import partial
+from random   import randint
+
+
+def _env(name: str, default, kind=str):
+    value: Optional[str] = environ.get(name)
+    return kind(value) if value not in (None, "") else default
+
+
+def parse_args(argv: Optional[List[str]] = None) -> Namespace:
+    parser = ArgumentParser(prog="grok-api-server", description="Serve the Grok API over HTTP.")
+    parser.add_argument("--host", default=_env("GROK_API_HOST", "0.0.0.0"), help="bind address (GROK_API_HOST, default 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=_env("GROK_API_PORT", 6969, int), help="bind port (GROK_API_PORT, default 6969)")
+    parser.add_argument("--workers", type=int, default=_env("GROK_API_PROCESSES", 1, int), help="worker processes (GROK_API_PROCESSES, default 1)")
+    parser.add_argument("--threads", type=int, default=_env("GROK_API_WORKERS", 50, int), help="blocking Grok calls per process (GROK_API_WORKERS, default 50)")
+    parser.add_argument("--queue", type=int, default=_env("GROK_API_QUEUE", 100, int), help="calls allowed to wait for a thread (GROK_API_QUEUE, default 100)")
+    parser.add_argument("--pool-size", type=int, default=_env("GROK_API_POOL_SIZE", 32, int), help="idle grok.com sessions kept per process (GROK_API_POOL_SIZE, default 32)")
+    parser.add_argument("--pool-idle", type=float, default=_env("GROK_API_POOL_IDLE", 90.0, float), help="seconds an idle session is kept (GROK_API_POOL_IDLE, default 90)")
+    parser.add_argument("--shared-cache", default=_env("GROK_API_SHARED_CACHE", None), help="SQLite file the processes share parsed grok.com scripts and signature tables through (GROK_API_SHARED_CACHE)")
+    parser.add_argument("--max-requests", type=int, default=_env("GROK_API_MAX_REQUESTS", 0, int), help="recycle a worker after this many requests, 0 never (GROK_API_MAX_REQUESTS)")
+    parser.add_argument("--max-requests-jitter", type=int, default=_env("GROK_API_MAX_REQUESTS_JITTER", None, int), help="random extra requests per worker so they do not recycle together (GROK_API_MAX_REQUESTS_JITTER, default 10%% of --max-requests)")
+    parser.add_argument("--timeout-keep-alive", type=int, default=_env("GROK_API_TIMEOUT_KEEP_ALIVE", 5, int), help="seconds an idle client connection is kept (GROK_API_TIMEOUT_KEEP_ALIVE, default 5)")
+    parser.add_argument("--timeout-graceful-shutdown", type=int, default=_env("GROK_API_TIMEOUT_GRACEFUL_SHUTDOWN", 30, int), help="seconds a stopping or recycled worker waits for open requests (GROK_API_TIMEOUT_GRACEFUL_SHUTDOWN, default 30)")
+    parser.add_argument("--log-level", default=_env("GROK_API_SERVER_LOG_LEVEL", "info"), help="uvicorn log level (GROK_API_SERVER_LOG_LEVEL, default info)")
+
+    args: Namespace = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_requests_jitter is None:
+        args.max_requests_jitter = args.max_requests // 10
+    return args
+
+
+def apply_environment(args: Namespace) -> None:
+    """Export the per-process settings so every worker configures itself the same way on import."""
+    environ.update({
+        "GROK_API_WORKERS": str(args.threads),
+        "GROK_API_QUEUE": str(args.queue),
+        "GROK_API_POOL_SIZE": str(args.pool_size),
+        "GROK_API_POOL_IDLE": str(args.pool_idle),
+    })
+    if args.shared_cache:
+        environ["GROK_API_SHARED_CACHE"] = args.shared_cache
+
+
+def _accepts(func, name: str) -> bool:
+    return name in signature(func).parameters
+
+
+def _serve(config, jitter: int, sockets=None) -> None:
+    """Worker entry point for uvicorn releases whose ``Config`` cannot jitter ``limit_max_requests`` itself."""
+    from uvicorn import Server
+
+    if config.limit_max_requests and jitter:
+        config.limit_max_requests += randint(0, jitter)
+    Server(config).run(sockets=sockets)
+
+
+def build_config(args: Namespace):
+    from uvicorn import Config
+
+    options: dict = {}
+    if _accepts(Config.__init__, "limit_max_requests_jitter"):
+        options["limit_max_requests_jitter"] = args.max_requests_jitter if args.max_requests else 0
+
+    return Config(
+        "grok_api.api_server:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        limit_max_requests=args.max_requests or None,
+        timeout_keep_alive=args.timeout_keep_alive,
+        timeout_graceful_shutdown=args.timeout_graceful_shutdown,
+        log_level=args.log_level,
+        **options,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args: Namespace = parse_args(argv)
+    apply_environment(args)
+    config = build_config(args)
+
+    from uvicorn.supervisors import Multiprocess
+    from uvicorn import Server
+
+    try:
+        if args.workers > 1 or args.max_requests:
+            # The supervisor replaces workers that exit, which is what makes --max-requests a recycle
+            # rather than a shutdown, so it runs even for a single worker in that case.
+            sockets: list = [config.bind_socket()]
+            if _accepts(Multiprocess.__init__, "target"):
+                # Older uvicorn releases take the worker entry point from the caller, which applies the
+                # jitter when their Config cannot.
+                jitter: int = 0 if hasattr(config, "limit_max_requests_jitter") else args.max_requests_jitter
+                Multiprocess(config, target=partial(_serve, config, jitter), sockets=sockets).run()
+            else:
+                Multiprocess(config, sockets=sockets).run()
+        else:
+            Server(config).run()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import sys
+import os
+import pytest
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fakes         import FakeUpstream, FakeSession, FakeAsyncSession, ACTIONS, ACTION_SCRIPT, XSID_SCRIPT, XSID_LINK, NUMBERS
+from grok_api.core import Grok, AsyncGrok, Parser, MappingStore, SessionPool, VerificationCache, RetryPolicy
+
+
+@pytest.fixture
+def mappings(monkeypatch, tmp_path) -> None:
+    """Give ``Parser`` empty mapping files of its own."""
+    monkeypatch.setattr(Parser, "mapping", MappingStore(str(tmp_path / "txid.json")))
+    monkeypatch.setattr(Parser, "grok_mapping", MappingStore(str(tmp_path / "grok.json"), key="action_script"))
+
+
+@pytest.fixture
+def upstream(monkeypatch, mappings) -> FakeUpstream:
+    """Point ``Grok``/``AsyncGrok`` at an in-process fake grok.com with warm mappings."""
+    fake = FakeUpstream()
+
+    Parser.mapping.put(XSID_LINK, NUMBERS)
+    Parser.grok_mapping.put(ACTION_SCRIPT, {"xsid_script": XSID_SCRIPT, "action_script": ACTION_SCRIPT, "actions": ACTIONS})
+
+    monkeypatch.setattr(Grok, "sessions", SessionPool())
+    monkeypatch.setattr(Grok, "verification", VerificationCache())
+    monkeypatch.setattr(Grok, "retry", RetryPolicy(base_delay=0))
+    monkeypatch.setattr(Grok, "_create_session", staticmethod(lambda: FakeSession(fake)))
+    monkeypatch.setattr(AsyncGrok, "_create_session", staticmethod(lambda: FakeAsyncSession(fake)))
+    return fake
@@ -0,0 +1,120 @@
+"""Offline stand-ins for the grok.com endpoints used by ``Grok`` and ``AsyncGrok``."""
+from curl_cffi.requests import Cookies
+from base64             import b64encode
+from json               import dumps
+
+ACTIONS = ["7f00", "7f01", "7f02"]
+ACTION_SCRIPT = "/_next/static/chunks/actions.js"
+XSID_SCRIPT = "static/chunks/xsid.js"
+XSID_LINK = f"https://grok.com/_next/{XSID_SCRIPT}"
+NUMBERS = [1, 2, 3, 4]
+
+CHALLENGE = bytes(range(32, 64))
+VERIFICATION = b64encode(bytes([7, 21, 5, 6, 9, 3, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43])).decode()
+SVG = "M 10,30 C" + "C".join(
+    " ".join(str((row * 7 + col * 13) % 255) for col in range(11)) for row in range(16)
+)
+
+PAGE = (
+    f'<html><head><script src="{ACTION_SCRIPT}"></script><script src="/other.js"></script>'
+    '<meta name="baggage" content="sentry-environment=production"/>'
+    '<meta name="sentry-trace" content="0123456789abcdef-fedcba9876543210-1"/></head></html>'
+)
+STAGE_0 = '0:{"a":"$@1"}\n1:{"anonUserId":"anon-1"}\n'
+STAGE_1 = b'0:{"a":"$@1"}\n2:o%x,' % len(CHALLENGE) + CHALLENGE + b'1:{"challenge":"$2","anonUserId":"anon-1"}\n'
+STAGE_2 = (
+    '0:{"a":"$@1"}\n'
+    f'1:[["$","meta",null,{{"name":"grok-site-verification","content":"{VERIFICATION}"}}],'
+    f'["$","path",null,{{"d":"{SVG}"}}]]\n'
+)
+
+
+def conversation_lines(tokens: list, new: bool = True, conversation_id: str = "conv-1", response_id: str = "resp-1") -> list:
+    message = "".join(tokens)
+    if new:
+        lines = [{"result": {"conversation": {"conversationId": conversation_id}}}]
+        lines += [{"result": {"response": {"token": token}}} for token in tokens]
+        lines.append({"result": {"response": {"modelResponse": {"responseId": response_id, "message": message, "generatedImageUrls": []}}}})
+    else:
+        lines = [{"result": {"token": token}} for token in tokens]
+        lines.append({"result": {"modelResponse": {"responseId": response_id, "message": message, "generatedImageUrls": []}}})
+    return [dumps(line) for line in lines]
+
+
+class FakeResponse:
+    def __init__(self, body, cookies: dict = None) -> None:
+        self.content: bytes = body if isinstance(body, bytes) else body.encode()
+        self.text: str = self.content.decode("utf-8", "replace")
+        self.cookies: dict = cookies or {}
+        self.status_code: int = 200
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_lines(self):
+        yield from self.content.splitlines()
+
+    async def aiter_lines(self):
+        for line in self.content.splitlines():
+            yield line
+
+    def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+
+ANTI_BOT = '{"error":{"code":7,"message":"Request rejected by anti-bot rules.","details":[]}}'
+
+
+class FakeUpstream:
+    """Routes requests the way grok.com would and records them for assertions."""
+
+    def __init__(self, tokens: list = None) -> None:
+        self.tokens: list = tokens or ["Hel", "lo"]
+        self.calls: list = []
+        self.errors: list = []
+
+    def handle(self, method: str, url: str, headers: dict) -> FakeResponse:
+        self.calls.append((method, url, headers.get("next-action")))
+        if method == "GET":
+            return FakeResponse(PAGE, {"__cf_bm": "page"})
+        if url == "https://grok.com/c":
+            stage = ACTIONS.index(headers["next-action"])
+            return FakeResponse([STAGE_0, STAGE_1, STAGE_2][stage], {f"stage{stage}": "1"})
+        if self.errors:
+            error = self.errors.pop(0)
+            if isinstance(error, Exception):
+                raise error
+            return FakeResponse(error)
+        new = url.endswith("/new")
+        return FakeResponse("\n".join(conversation_lines(self.tokens, new, response_id="resp-new" if new else "resp-next")))
+
+
+class FakeSession:
+    def __init__(self, upstream: FakeUpstream) -> None:
+        self.upstream: FakeUpstream = upstream
+        self.headers: dict = {}
+        self.cookies: Cookies = Cookies()
+        self.proxies: dict = {}
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        return self.upstream.handle("GET", url, dict(self.headers))
+
+    def post(self, url: str, **kwargs) -> FakeResponse:
+        return self.upstream.handle("POST", url, dict(self.headers))
+
+    def close(self) -> None:
+        pass
+
+
+class FakeAsyncSession(FakeSession):
+    async def get(self, url: str, **kwargs) -> FakeResponse:
+        return super().get(url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> FakeResponse:
+        return super().post(url, **kwargs)
+
+    async def close(self) -> None:
+        pass
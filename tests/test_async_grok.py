@@ -0,0 +1,41 @@
+from grok_api.core import Grok, AsyncGrok
+import asyncio
+
+
+def test_async_chat_matches_sync(upstream):
+    sync_answer = Grok("grok-3-fast").chat("hi")
+    async_answer = asyncio.run(AsyncGrok("grok-3-fast").chat("hi"))
+
+    assert async_answer["response"] == sync_answer["response"] == "Hello"
+    assert async_answer["stream_response"] == ["Hel", "lo"]
+    assert set(async_answer["extra_data"]) == set(sync_answer["extra_data"])
+    assert async_answer["extra_data"]["conversationId"] == "conv-1"
+    assert async_answer["extra_data"]["parentResponseId"] == "resp-new"
+
+
+def test_async_chat_stream_follow_up(upstream):
+    async def run() -> list:
+        async with AsyncGrok() as grok:
+            first = await grok.chat("hi")
+        async with AsyncGrok() as grok:
+            return [chunk async for chunk in grok.chat_stream("again", first["extra_data"])]
+
+    chunks = asyncio.run(run())
+
+    assert [c["token"] for c in chunks[:-1]] == ["Hel", "lo"]
+    meta = chunks[-1]["meta"]
+    assert meta["response"] == "Hello"
+    assert meta["extra_data"]["conversationId"] == "conv-1"
+    assert meta["extra_data"]["parentResponseId"] == "resp-next"
+
+
+def test_many_concurrent_conversations(upstream):
+    async def one() -> dict:
+        async with AsyncGrok() as grok:
+            return await grok.chat("hi")
+
+    async def run() -> list:
+        return await asyncio.gather(*(one() for _ in range(50)))
+
+    answers = asyncio.run(run())
+    assert all(answer["response"] == "Hello" for answer in answers)
@@ -0,0 +1,59 @@
+from grok_api  import api_server
+from fastapi   import HTTPException
+from threading import Lock
+from json      import loads
+from time      import sleep
+import asyncio
+import pytest
+
+
+def collect(items: list, concurrency: int = None) -> list:
+    async def run() -> list:
+        request = api_server.BatchRequest(proxy="127.0.0.1:8080", items=items, concurrency=concurrency)
+        response = await api_server.batch_conversations(request)
+        return [loads(line) async for line in response.body_iterator]
+
+    return asyncio.run(run())
+
+
+def test_batch_reports_every_item(upstream):
+    lines = collect([{"message": "hi"}, {"message": "hi", "conversation": "missing"}, {"message": ""}, {"message": "again"}])
+
+    assert sorted(line["index"] for line in lines) == [0, 1, 2, 3]
+    by_index = {line["index"]: line for line in lines}
+    assert by_index[0]["status"] == by_index[3]["status"] == "success"
+    assert by_index[0]["response"] == "Hello" and by_index[0]["conversation"]
+    assert (by_index[1]["status"], by_index[1]["status_code"]) == ("error", 404)
+    assert (by_index[2]["status"], by_index[2]["status_code"]) == ("error", 400)
+
+
+def test_batch_respects_concurrency(monkeypatch):
+    lock, running, peak = Lock(), [0], [0]
+
+    def ask(model, proxy, message, extra_data=None, handle=None, include_extra_data=False) -> dict:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        sleep(0.02 if message == "slow" else 0.005)
+        with lock:
+            running[0] -= 1
+        return {"response": message}
+
+    monkeypatch.setattr(api_server, "ask", ask)
+    lines = collect([{"message": "slow"}] + [{"message": "fast"}] * 7, concurrency=3)
+
+    assert len(lines) == 8
+    assert peak[0] == 3
+    assert lines[0]["index"] != 0
+
+
+def test_batch_limits(upstream, monkeypatch):
+    monkeypatch.setattr(api_server, "BATCH_MAX_ITEMS", 2)
+
+    with pytest.raises(HTTPException) as error:
+        collect([{"message": "hi"}] * 3)
+    assert error.value.status_code == 413
+
+    with pytest.raises(HTTPException) as error:
+        collect([])
+    assert error.value.status_code == 400
@@ -0,0 +1,19 @@
+from benchmarks.suite import CASES
+from grok_api.core    import Parser
+from json             import load
+from os               import path
+import pytest
+
+with open(path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks", "golden.json")) as f:
+    GOLDEN: dict = load(f)
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_benchmark_case_matches_golden(name):
+    mapping = Parser.mapping
+    with CASES[name].fixture():
+        func, _ = CASES[name].setup()
+        value = CASES[name].golden(func())
+
+    assert value == GOLDEN[name]
+    assert Parser.mapping is mapping
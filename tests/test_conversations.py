@@ -0,0 +1,57 @@
+from grok_api.conversations import ConversationStore, MemoryConversationStore, SQLiteConversationStore
+from grok_api               import api_server
+from fastapi                import HTTPException
+import asyncio
+import pytest
+
+
+def test_memory_store_lru_and_ttl():
+    store = MemoryConversationStore(max_size=2)
+    first = store.put({"n": 1})
+    second = store.put({"n": 2})
+    store.get(first)
+    store.put({"n": 3})
+
+    assert store.get(first) == {"n": 1}
+    assert store.get(second) is None
+    assert MemoryConversationStore(ttl=-1).get(store.put({"n": 4})) is None
+
+
+def test_store_must_implement_get_and_put():
+    class Incomplete(ConversationStore):
+        def get(self, handle: str) -> None:
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_sqlite_store(tmp_path):
+    path = str(tmp_path / "conversations.db")
+    handle = SQLiteConversationStore(path).put({"conversationId": "conv-1"})
+
+    reopened = SQLiteConversationStore(path)
+    assert reopened.get(handle) == {"conversationId": "conv-1"}
+    assert reopened.put({"conversationId": "conv-2"}, handle) == handle
+    assert reopened.get(handle) == {"conversationId": "conv-2"}
+    assert SQLiteConversationStore(path, ttl=-1).get(SQLiteConversationStore(path, ttl=-1).put({})) is None
+
+
+def test_ask_with_conversation_handle(upstream, monkeypatch):
+    monkeypatch.setattr(api_server, "conversations", MemoryConversationStore())
+
+    def ask(**kwargs) -> dict:
+        request = api_server.ConversationRequest(proxy="127.0.0.1:8080", message="hi", **kwargs)
+        return asyncio.run(api_server.create_conversation(request))
+
+    first = ask()
+    follow_up = ask(conversation=first["conversation"], include_extra_data=True)
+
+    assert "extra_data" not in first
+    assert follow_up["conversation"] == first["conversation"]
+    assert follow_up["extra_data"]["conversationId"] == "conv-1"
+    assert follow_up["extra_data"]["parentResponseId"] == "resp-next"
+
+    with pytest.raises(HTTPException) as error:
+        ask(conversation="missing")
+    assert error.value.status_code == 404
@@ -0,0 +1,55 @@
+from grok_api.core.decoder import decode_line, set_json_backend, json_backend, Conversation, TOKEN, MODEL_RESPONSE, CONVERSATION, FINAL_METADATA, OTHER
+from fakes                 import conversation_lines
+from importlib.util        import find_spec
+import pytest
+
+BACKENDS = ["json"] + [name for name in ("orjson", "msgspec") if find_spec(name)]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = json_backend()
+    set_json_backend(request.param)
+    yield request.param
+    set_json_backend(previous)
+
+
+@pytest.mark.parametrize("new", [True, False])
+def test_both_conversation_shapes(backend, new):
+    conversation = Conversation(None if new else "existing")
+    for line in conversation_lines(["Hel", "lo"], new, response_id="resp"):
+        conversation.feed(decode_line(line.encode()))
+
+    assert conversation.tokens == ["Hel", "lo"]
+    assert conversation.message == "Hello"
+    assert conversation.response_id == "resp"
+    assert conversation.conversation_id == ("conv-1" if new else "existing")
+    assert conversation.images is None
+
+
+def test_classifies_each_line(backend):
+    assert decode_line('{"result":{"response":{"token":"a"}}}').kind == TOKEN
+    assert decode_line('{"result":{"modelResponse":{"responseId":"r","generatedImageUrls":["u"]}}}').images == ["u"]
+    assert decode_line('{"result":{"response":{"modelResponse":{"responseId":"r"}}}}').kind == MODEL_RESPONSE
+    assert decode_line('{"result":{"conversation":{"conversationId":"c"}}}').kind == CONVERSATION
+    assert decode_line('{"result":{"finalMetadata":{"followUpSuggestions":[]}}}').kind == FINAL_METADATA
+    assert decode_line('{"result":{"title":{"newTitle":"t"}}}').kind == OTHER
+
+
+@pytest.mark.parametrize("line", [b"", b"  ", b"{not json", b"[1, 2]", b'{"error":{"code":7}}', b'{"result":"x"}'])
+def test_skips_undecodable_lines(backend, line):
+    assert decode_line(line) is None
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_json_backend("yaml")
+
+
+def test_feed_line_keeps_error_body():
+    conversation = Conversation()
+    body = b'{"error":{"code":7,"message":"Request rejected by anti-bot rules."}}'
+
+    assert conversation.feed_line(body) is None
+    assert not conversation.completed
+    assert conversation.error_text == body.decode()
@@ -0,0 +1,86 @@
+from grok_api.executor import BoundedExecutor, ExecutorFull
+from grok_api          import api_server
+from fastapi           import HTTPException
+from threading         import Event
+import asyncio
+import pytest
+
+
+def blocker() -> tuple:
+    """A task that reports when a worker picked it up and then waits to be released."""
+    started, release = Event(), Event()
+
+    def task() -> None:
+        started.set()
+        release.wait(5)
+
+    return task, started, release
+
+
+def test_rejects_when_queue_full():
+    executor = BoundedExecutor(max_workers=1, max_queue=1)
+    task, started, release = blocker()
+
+    running = executor.submit(task)
+    assert started.wait(5)
+    queued = executor.submit(release.wait)
+    with pytest.raises(ExecutorFull):
+        executor.submit(release.wait)
+
+    stats = executor.stats()
+    assert stats["active"] == 1 and stats["queued"] == 1 and stats["rejected"] == 1
+
+    release.set()
+    running.result(timeout=5)
+    queued.result(timeout=5)
+    executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["active"] == 0 and stats["queued"] == 0 and stats["completed"] == 2
+
+
+def test_ask_returns_503_with_retry_after(monkeypatch):
+    executor = BoundedExecutor(max_workers=1, max_queue=0)
+    task, started, release = blocker()
+    executor.submit(task)
+    assert started.wait(5)
+    assert executor.stats()["active"] == 1
+    monkeypatch.setattr(api_server, "executor", executor)
+
+    request = api_server.ConversationRequest(proxy="127.0.0.1:8080", message="hi")
+    try:
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(api_server.create_conversation(request))
+    finally:
+        release.set()
+        executor.shutdown()
+
+    assert error.value.status_code == 503
+    assert error.value.headers["Retry-After"] == str(api_server.RETRY_AFTER)
+
+
+def test_stream_stops_worker_when_reader_leaves():
+    executor = BoundedExecutor(max_workers=1, max_queue=0)
+    produced: list = []
+    closed = Event()
+
+    def tokens():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield i
+        finally:
+            closed.set()
+
+    async def run() -> int:
+        chunks = executor.stream(tokens, buffer=2)
+        first = await anext(chunks)
+        await chunks.aclose()
+        return first
+
+    assert asyncio.run(run()) == 0
+    assert closed.wait(5)
+    executor.shutdown()
+
+    assert len(produced) < 10
+    assert executor.stats()["active"] == 0
@@ -0,0 +1,68 @@
+from grok_api.core.flight     import FlightDecoder, decode_action
+from grok_api.core.exceptions import GrokParsingError
+from grok_api.core            import Parser
+from re                       import findall
+from os                       import path
+import pytest
+
+FIXTURES = path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks", "fixtures")
+
+
+def fixture(name: str) -> bytes:
+    with open(path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def test_challenge_is_sliced_by_length():
+    # Bytes that the old marker search mistook for the start of the next row.
+    challenge = b"\x00\x131:\xa0" + bytes(range(200, 256))
+    action = decode_action(b'0:{"a":"$@1"}\n2:o%x,' % len(challenge) + challenge + b'1:{"challenge":"$2","anonUserId":"anon-1"}\n')
+
+    assert action.challenge == challenge
+    assert action.anon_user_id == "anon-1"
+
+
+@pytest.mark.parametrize("step", [1, 7, 4096])
+def test_streamed_rows_match_whole_body(step):
+    content = fixture("c_request_1.bin")
+    decoder = FlightDecoder()
+    rows = []
+    for i in range(0, len(content), step):
+        rows += decoder.feed(content[i:i + step])
+    rows += decoder.close()
+
+    assert [(row.id, row.tag) for row in rows] == [(0, ""), (2, "o"), (1, "")]
+    assert decoder.rows[2].value == decode_action(content).challenge
+
+
+def test_verification_rows_without_newlines():
+    content = fixture("c_request_2.txt")
+    action = decode_action(content)
+
+    assert action.svg_paths == findall(r'"d":"(M[^"]{200,})"', content.decode())
+    assert Parser.verification(action)[:2] == Parser.get_anim(content.decode())
+
+
+def test_unknown_rows_are_skipped():
+    content = (
+        b':HL["/_next/static/media/font.woff2","font"]\n'
+        b'0:{"a":"$@1"}\n'
+        b'3:W["debug",{"x":1}]\n'
+        b'4:Q{"new":"row type"}\n'
+        b'not a row at all\n'
+        b'2:o4,\x00\n\x01\x02'
+        b'1:{"challenge":"$2","anonUserId":"anon-1"}\n'
+        b'5:{"cut off'
+    )
+    action = decode_action(content)
+
+    assert action.challenge == b"\x00\n\x01\x02"
+    assert action.anon_user_id == "anon-1"
+    assert action.verification_token is None
+
+
+def test_truncated_rows_are_rejected():
+    decoder = FlightDecoder()
+    decoder.feed(b'0:{"a":"$@1"}\n2:o86,\x01\x02')
+    with pytest.raises(GrokParsingError):
+        decoder.close()
@@ -0,0 +1,34 @@
+from grok_api.core import Grok, GrokError, GrokLimitError
+from fakes         import ANTI_BOT
+import pytest
+
+
+def test_chat_exposes_conversation(upstream):
+    grok = Grok()
+    answer = grok.chat("hi")
+
+    assert answer["response"] == "Hello"
+    assert grok.conversation.completed
+    assert grok.conversation.conversation_id == "conv-1"
+    assert grok.conversation.response_id == "resp-new"
+
+
+def test_chat_retries_anti_bot(upstream):
+    upstream.errors.append(ANTI_BOT)
+
+    assert Grok().chat("hi")["response"] == "Hello"
+    assert sum(url.endswith("/new") for _, url, _ in upstream.calls) == 2
+
+
+def test_chat_raises_upstream_error(upstream):
+    upstream.errors.append('{"error":{"code":3,"message":"Bad request"}}')
+
+    with pytest.raises(GrokError, match="Bad request"):
+        Grok().chat("hi")
+
+
+def test_chat_response_cap(upstream, monkeypatch):
+    monkeypatch.setattr(Grok, "max_response_bytes", 64)
+
+    with pytest.raises(GrokLimitError):
+        Grok().chat("hi")
@@ -0,0 +1,26 @@
+from benchmarks.importtime import BUDGETS, measure, eager
+from os                    import environ
+import grok_api.core
+import grok_api
+import pytest
+
+# Shared CI runners can be several times slower than a workstation.
+SCALE: float = float(environ.get("GROK_API_IMPORT_BUDGET_SCALE", 3))
+
+
+@pytest.mark.parametrize("statement", list(BUDGETS))
+def test_import_budget(statement):
+    budget, forbidden = BUDGETS[statement]
+    ms, modules = measure(statement)
+
+    assert not eager(modules, forbidden)
+    assert ms <= budget * SCALE, f"{statement} took {ms:.1f}ms, budget {budget * SCALE:.0f}ms"
+
+
+def test_lazy_names_resolve():
+    assert set(grok_api.__all__) <= set(dir(grok_api))
+    assert grok_api.Grok is grok_api.core.Grok
+    assert all(getattr(grok_api.core, name) for name in grok_api.core.__all__)
+
+    with pytest.raises(AttributeError):
+        grok_api.core.Missing
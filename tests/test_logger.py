@@ -0,0 +1,65 @@
+from grok_api.core import Log
+from io            import StringIO
+from json          import loads
+import pytest
+
+
+@pytest.fixture
+def log(monkeypatch):
+    stream = StringIO()
+    monkeypatch.setattr(Log, "stream", stream)
+    monkeypatch.setattr(Log, "enabled", True)
+    monkeypatch.setattr(Log, "level", Log.DEBUG)
+    monkeypatch.setattr(Log, "format", "text")
+    yield stream
+    Log.flush()
+
+
+class Expensive:
+    formatted: int = 0
+
+    def __str__(self) -> str:
+        Expensive.formatted += 1
+        return "expensive"
+
+
+def test_formats_lazily_and_filters_levels(log):
+    Log.set_level("ERROR")
+    Log.Info("skipped %s", Expensive())
+    Log.Error("kept %s", Expensive())
+    Log.flush()
+
+    assert Expensive.formatted == 1
+    assert "kept expensive" in log.getvalue()
+    assert "skipped" not in log.getvalue()
+
+
+def test_positional_prefix_and_colour(log):
+    Log.Success("plain", "[*]")
+    Log.Info("tinted", "[~]", "\x1b[36m")
+    Log.Error("100% done", "[x]")
+    Log.flush()
+
+    lines = log.getvalue().splitlines()
+    assert lines[0].endswith("\x1b[92m[*]\x1b[39m plain")
+    assert lines[1].endswith("\x1b[36m[~]\x1b[39m tinted")
+    assert lines[2].endswith("[x]\x1b[39m 100% done")
+
+
+def test_json_lines(log):
+    Log.set_format("json")
+    Log.Success("Solved %s", {"a": 1}, proxy="http://a:1")
+    Log.flush()
+
+    record = loads(log.getvalue())
+    assert record["level"] == "SUCCESS"
+    assert record["message"] == "Solved {'a': 1}"
+    assert record["proxy"] == "http://a:1"
+
+
+def test_disabled_logging_does_nothing(log, monkeypatch):
+    monkeypatch.setattr(Log, "enabled", False)
+    Log.Error("%s", Expensive())
+    Log.flush()
+
+    assert log.getvalue() == ""
@@ -0,0 +1,47 @@
+from grok_api.core    import Grok, Hooks, GrokParsingError
+from grok_api.metrics import Metrics
+from grok_api         import api_server
+import asyncio
+import pytest
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics().install()
+    yield metrics
+    metrics.uninstall()
+
+
+def test_hooks_report_phases_and_caches(upstream):
+    events = []
+    listener = Hooks.subscribe(lambda event, fields: events.append((event, fields)))
+    try:
+        Grok("grok-4").chat("hi")
+    finally:
+        Hooks.unsubscribe(listener)
+
+    phases = [fields["phase"] for event, fields in events if event == "phase"]
+    assert phases == ["load", "c_request_0", "c_request_1", "c_request_2", "sign", "ttft", "generation", "chat"]
+    assert ("cache", {"cache": "grok", "hit": True}) in events
+    tokens = next(fields for event, fields in events if event == "tokens")
+    assert tokens["model"] == "grok-4" and tokens["count"] == 2
+
+
+def test_metrics_render(upstream, metrics, monkeypatch):
+    Grok("grok-4").chat("hi")
+    monkeypatch.setattr(Grok, "_parse_page", lambda self, html: (_ for _ in ()).throw(GrokParsingError("changed")))
+    with pytest.raises(GrokParsingError):
+        Grok("grok-4").chat("hi")
+
+    text = metrics.render()
+    assert 'grok_phase_seconds_count{phase="c_request_1",model="grok-4"} 1' in text
+    assert 'grok_phase_errors_total{phase="load",model="grok-4",error="GrokParsingError"} 1' in text
+    assert 'grok_cache_lookups_total{cache="txid",result="hit"} 1' in text
+    assert 'grok_tokens_total{model="grok-4"} 2' in text
+
+
+def test_metrics_endpoint():
+    response = asyncio.run(api_server.prometheus_metrics())
+
+    assert response.media_type.startswith("text/plain")
+    assert b"# TYPE grok_phase_seconds histogram" in response.body
@@ -0,0 +1,48 @@
+from grok_api.core  import Grok, Parser, SessionPool, VerificationCache
+from grok_api.bench import mock_server, library_request, run, percentile
+import pytest
+
+
+@pytest.fixture(scope="module")
+def mock_url():
+    with mock_server(tokens=8) as url:
+        yield url
+
+
+@pytest.fixture
+def offline(monkeypatch, mappings, mock_url) -> str:
+    monkeypatch.setattr(Parser, "base_url", mock_url)
+    monkeypatch.setattr(Grok, "sessions", SessionPool())
+    monkeypatch.setattr(Grok, "verification", VerificationCache())
+    return mock_url
+
+
+def test_library_against_mock(offline):
+    with Grok() as grok:
+        answer = grok.chat("hi")
+
+    assert answer["response"] == "".join(f" word{i}" for i in range(8))
+    assert Parser.grok_mapping.find(["/_next/static/chunks/app/c/page-mock.js"])["actions"]
+
+    with Grok() as grok:
+        tokens = [chunk["token"] for chunk in grok.chat_stream("again", answer["extra_data"]) if chunk["token"]]
+
+    assert len(tokens) == 8
+    assert grok.reused_verification
+
+
+def test_bench_run_reports_percentiles(offline):
+    result = run(library_request("grok-3-auto", "hi"), total=12, concurrency=4)
+
+    assert result["ok"] == 12 and not result["errors"]
+    assert result["rps"] > 0
+    assert 0 < result["ttft"]["p50"] <= result["latency"]["p50"] <= result["latency"]["p99"]
+
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
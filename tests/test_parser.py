@@ -0,0 +1,98 @@
+from grok_api.core import Parser
+from os            import path
+from time          import sleep
+from fakes         import FakeResponse
+import asyncio
+import pytest
+
+FIXTURE = path.join(path.dirname(path.dirname(path.abspath(__file__))), "benchmarks", "fixtures", "grok_c.html")
+
+
+def test_parse_page_matches_bs4_on_saved_page():
+    bs4 = pytest.importorskip("bs4")
+    with open(FIXTURE, encoding="utf-8") as f:
+        html: str = f.read()
+
+    scripts, baggage, sentry_trace = Parser.parse_page(html)
+
+    expected: list = [s['src'] for s in bs4.BeautifulSoup(html, 'html.parser').find_all('script', src=True) if s['src'].startswith('/_next/static/chunks/')]
+    assert scripts == expected
+    assert baggage.startswith("sentry-environment=production,")
+    assert len(sentry_trace) == 32
+
+
+def test_parse_page_edge_cases():
+    html = (
+        '<script async src="/_next/static/chunks/a.js?dpl=1&amp;v=2"></script>'
+        '<script data-src="/_next/static/chunks/ignored.js"></script>'
+        '<script src="/other/b.js"></script>'
+        '<meta name="baggage" content="first"/><meta name="baggage" content="second"/>'
+        '<meta name="sentry-trace" content="trace-span-1"/>'
+    )
+
+    assert Parser.parse_page(html) == (["/_next/static/chunks/a.js?dpl=1&v=2"], "first", "trace")
+    assert Parser.parse_page("<html></html>") == ([], "", "")
+
+
+SCRIPTS = [f"/_next/static/chunks/{i:016x}.js" for i in range(40)]
+CONTENTS = {
+    SCRIPTS[30]: 'createServerReference)("7f00")createServerReference)("7f01") anonPrivateKey',
+    SCRIPTS[35]: 'a.l("static/chunks/xsid.js",n(880932))',
+}
+
+
+def test_parse_grok_stops_after_both_targets(mappings, monkeypatch):
+    fetched: list = []
+
+    def fetch(script: str):
+        fetched.append(script)
+        sleep(0.01)
+        return CONTENTS.get(script, "")
+
+    monkeypatch.setattr(Parser, "_fetch_script", staticmethod(fetch))
+
+    actions, xsid_script = Parser.parse_grok(SCRIPTS + ["/_next/static/chunks/webpack-1.js"], concurrency=1)
+
+    assert actions == ["7f00", "7f01"] and xsid_script == "static/chunks/xsid.js"
+    # One worker: candidates are fetched in order and nothing past the second hit is requested.
+    assert fetched[:36] == SCRIPTS[:36] and len(fetched) < 40
+    assert Parser.grok_mapping.get(SCRIPTS[30])["xsid_script"] == "static/chunks/xsid.js"
+
+
+def test_rank_scripts_prefers_app_chunks():
+    scripts = ["/_next/static/chunks/webpack-1.js", "/_next/static/chunks/a.js", "/_next/static/chunks/app/c/page-1.js", "/_next/static/chunks/a.js"]
+
+    assert Parser._rank_scripts(scripts) == ["/_next/static/chunks/app/c/page-1.js", "/_next/static/chunks/a.js", "/_next/static/chunks/webpack-1.js"]
+
+
+def test_parse_grok_async_cancels_outstanding_fetches(mappings, monkeypatch):
+    from curl_cffi import requests
+    started: list = []
+    cancelled: list = []
+
+    class Session:
+        def __init__(self, **kwargs) -> None:
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args) -> None:
+            pass
+
+        async def get(self, url: str):
+            script: str = url.removeprefix("https://grok.com")
+            started.append(script)
+            try:
+                await asyncio.sleep(0 if script in CONTENTS else 10)
+            except asyncio.CancelledError:
+                cancelled.append(script)
+                raise
+            return FakeResponse(CONTENTS[script])
+
+    monkeypatch.setattr(requests, "AsyncSession", Session)
+
+    actions, xsid_script = asyncio.run(Parser.parse_grok_async(SCRIPTS, concurrency=40))
+
+    assert actions == ["7f00", "7f01"] and xsid_script == "static/chunks/xsid.js"
+    assert len(started) == 40 and len(cancelled) == 38
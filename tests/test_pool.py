@@ -0,0 +1,63 @@
+from grok_api.core import Grok, SessionPool
+from fakes         import FakeSession, FakeUpstream
+
+
+def session() -> FakeSession:
+    return FakeSession(FakeUpstream())
+
+
+def test_reuses_sessions_per_proxy():
+    pool = SessionPool()
+    first = pool.acquire("http://a:1", session)
+    pool.release(first, "http://a:1")
+
+    assert pool.acquire("http://b:1", session) is not first
+    assert pool.acquire("http://a:1", session) is first
+    assert first.proxies == {"all": "http://a:1"}
+    assert pool.stats()["reused"] == 1
+
+
+def test_release_wipes_conversation_state():
+    pool = SessionPool()
+    leased = pool.acquire(factory=session)
+    leased.cookies.set("sso", "secret", domain="grok.com")
+    leased.headers = {"x-statsig-id": "abc"}
+    pool.release(leased)
+
+    again = pool.acquire(factory=session)
+    assert again is leased
+    assert len(again.cookies.jar) == 0
+    assert again.headers == {}
+
+
+def test_idle_sessions_expire():
+    pool = SessionPool(idle_timeout=0)
+    leased = pool.acquire(factory=session)
+    pool.release(leased)
+
+    assert pool.acquire(factory=session) is not leased
+    assert pool.stats()["evicted"] == 1
+
+
+def test_size_limit():
+    pool = SessionPool(max_size=1)
+    first, second = pool.acquire(factory=session), pool.acquire(factory=session)
+    pool.release(first)
+    pool.release(second)
+
+    assert pool.stats()["idle"] == 1
+    assert pool.stats()["evicted"] == 1
+
+
+def test_grok_returns_session_to_pool(upstream):
+    with Grok() as grok:
+        grok.chat("hi")
+        leased = grok.session
+        assert len(leased.cookies.jar) > 0
+
+    with Grok() as grok:
+        assert grok.session is leased
+        assert len(grok.session.cookies.jar) == 0
+        assert grok.chat("again")["response"] == "Hello"
+
+    assert Grok.sessions.stats()["reused"] == 1
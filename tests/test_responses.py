@@ -0,0 +1,155 @@
+from grok_api.core import Grok, AsyncGrok, ResponseCache, ResponseBackend, SQLiteResponseBackend
+from threading     import Event, Thread
+from time          import sleep
+import asyncio
+import pytest
+
+
+@pytest.fixture
+def cache(monkeypatch, upstream) -> ResponseCache:
+    cache = ResponseCache(ttl=60)
+    monkeypatch.setattr(Grok, "response_cache", cache)
+    return cache
+
+
+def posts(upstream) -> int:
+    return sum(url.endswith("/new") for _, url, _ in upstream.calls)
+
+
+def test_first_turns_are_cached(upstream, cache):
+    first = Grok().chat("hi")
+    first["response"] = "changed"
+    second = Grok().chat("hi")
+
+    assert second["response"] == "Hello"
+    assert posts(upstream) == 1
+    assert Grok("grok-3-fast").chat("hi")["response"] == "Hello"
+    assert Grok(proxy="http://tenant-b:8080").chat("hi")["response"] == "Hello"
+    assert posts(upstream) == 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_per_proxy_cache(upstream, cache):
+    cache.per_proxy = True
+    Grok().chat("hi")
+    Grok(proxy="http://tenant-b:8080").chat("hi")
+    Grok(proxy="http://tenant-b:8080").chat("hi")
+
+    assert posts(upstream) == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_hits_do_not_share_conversation_state(upstream, cache):
+    first = Grok().chat("hi")
+    assert first["extra_data"]["conversationId"] == "conv-1"
+
+    assert Grok().chat("hi")["extra_data"] is None
+    assert list(Grok().chat_stream("hi"))[-1]["meta"]["extra_data"] is None
+
+
+def test_follow_up_turns_bypass_cache(upstream, cache):
+    answer = Grok().chat("hi")
+    Grok().chat("hi", answer["extra_data"])
+    Grok().chat("hi", answer["extra_data"])
+
+    assert cache.stats()["hits"] == 0
+    assert len(upstream.calls) > 4
+
+
+def test_stream_replays_cached_answer(upstream, cache):
+    streamed = list(Grok().chat_stream("hi"))
+    replayed = list(Grok().chat_stream("hi"))
+
+    assert replayed[:-1] == streamed[:-1]
+    assert replayed[-1]["meta"] == {**streamed[-1]["meta"], "extra_data": None}
+    assert [chunk["token"] for chunk in replayed[:-1]] == ["Hel", "lo"]
+    assert Grok().chat("hi")["stream_response"] == ["Hel", "lo"]
+    assert posts(upstream) == 1
+
+
+def test_async_client_shares_cache(upstream, cache):
+    async def run() -> list:
+        answer = await AsyncGrok().chat("hi")
+        return [answer] + [chunk async for chunk in AsyncGrok().chat_stream("hi")]
+
+    chunks = asyncio.run(run())
+
+    assert chunks[0]["response"] == chunks[-1]["meta"]["response"] == "Hello"
+    assert posts(upstream) == 1
+
+
+def test_identical_calls_are_coalesced():
+    cache = ResponseCache()
+    release = Event()
+    calls = []
+
+    def compute() -> dict:
+        calls.append(1)
+        release.wait(5)
+        return {"response": "shared"}
+
+    results = []
+    threads = [Thread(target=lambda: results.append(cache.call("m", "hi", compute))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()["coalesced"] < 4:
+        sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results.count({"response": "shared"}) == 1
+    assert results.count({"response": "shared", "extra_data": None}) == 4
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_failures_are_not_cached_or_shared():
+    cache = ResponseCache()
+
+    def fail() -> dict:
+        raise RuntimeError("upstream")
+
+    with pytest.raises(RuntimeError):
+        cache.call("m", "hi", fail)
+    assert cache.call("m", "hi", lambda: {"response": "ok"}) == {"response": "ok"}
+    assert cache.stats()["misses"] == 2
+
+
+def test_abandoned_stream_is_not_cached():
+    cache = ResponseCache()
+
+    def stream():
+        yield {"token": "a", "meta": None}
+        yield {"token": None, "meta": {"response": "a", "images": None, "extra_data": {}}}
+
+    next(cache.stream("m", "hi", stream))
+    assert cache.stats()["size"] == 0 and cache.stats()["in_flight"] == 0
+
+    list(cache.stream("m", "hi", stream))
+    assert [chunk["token"] for chunk in cache.stream("m", "hi", stream)] == ["a", None]
+    assert cache.stats()["hits"] == 1
+
+
+def test_sqlite_backend(tmp_path):
+    backend = SQLiteResponseBackend(str(tmp_path / "responses.db"), max_size=2)
+
+    backend.put("a", {"response": "a"}, 60)
+    backend.put("b", {"response": "b"}, 60)
+    assert backend.get("a") == {"response": "a"}
+    backend.put("c", {"response": "c"}, 60)
+    backend.put("d", {"response": "d"}, -1)
+
+    assert backend.get("b") is None
+    assert backend.get("d") is None
+    assert SQLiteResponseBackend(backend.path).get("c") == {"response": "c"}
+    assert backend.stats()["size"] == 2
+
+
+def test_backend_must_implement_storage():
+    class Incomplete(ResponseBackend):
+        def get(self, key: str) -> None:
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
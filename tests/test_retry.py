@@ -0,0 +1,139 @@
+from grok_api.core import Grok, AsyncGrok, RetryPolicy, GrokRejectedError, GrokCircuitOpenError, GrokParsingError, GrokStreamError
+from curl_cffi     import CurlECode
+from curl_cffi.requests.exceptions import ConnectionError, RequestException
+from fakes         import ANTI_BOT
+import asyncio
+import pytest
+
+
+def failing(errors: list):
+    calls = []
+
+    def attempt(n: int) -> str:
+        calls.append(n)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return attempt, calls
+
+
+def test_retries_until_success():
+    attempt, calls = failing([GrokRejectedError("bot"), GrokRejectedError("bot")])
+
+    assert RetryPolicy(base_delay=0).call(attempt) == "ok"
+    assert calls == [1, 2, 3]
+
+
+def test_stops_at_max_attempts_and_on_other_errors():
+    policy = RetryPolicy(base_delay=0, max_attempts=2)
+    attempt, calls = failing([GrokRejectedError("bot")] * 3)
+    with pytest.raises(GrokRejectedError):
+        policy.call(attempt)
+    assert calls == [1, 2]
+
+    attempt, calls = failing([GrokParsingError("changed")])
+    with pytest.raises(GrokParsingError):
+        policy.call(attempt)
+    assert calls == [1]
+
+
+def test_budget_is_shared():
+    policy = RetryPolicy(base_delay=0, budget_max=1, budget_ratio=0)
+    policy.call(failing([GrokRejectedError("bot")])[0])
+
+    attempt, calls = failing([GrokRejectedError("bot")])
+    with pytest.raises(GrokRejectedError):
+        policy.call(attempt)
+    assert calls == [1]
+    assert policy.stats()["exhausted"] == 1
+
+
+def test_circuit_breaker_fails_fast_then_recovers():
+    policy = RetryPolicy(max_attempts=1, breaker={"min_requests": 2, "cooldown": 0})
+    for _ in range(2):
+        with pytest.raises(GrokRejectedError):
+            policy.call(failing([GrokRejectedError("bot")])[0], "http://a:1")
+
+    policy._breakers["http://a:1"].cooldown = 60
+    attempt, calls = failing([])
+    with pytest.raises(GrokCircuitOpenError):
+        policy.call(attempt, "http://a:1")
+    assert calls == []
+    assert policy.call(attempt, "http://b:1") == "ok"
+
+    policy._breakers["http://a:1"].cooldown = 0
+    assert policy.call(attempt, "http://a:1") == "ok"
+    assert policy._breakers["http://a:1"].opened_at is None
+
+
+def test_stream_is_not_retried_after_first_item():
+    def attempt(n: int):
+        yield n
+        raise GrokRejectedError("bot")
+
+    chunks = []
+    with pytest.raises(GrokRejectedError):
+        for chunk in RetryPolicy(base_delay=0).stream(attempt):
+            chunks.append(chunk)
+    assert chunks == [1]
+
+
+def test_chat_gives_up_after_max_attempts(upstream):
+    upstream.errors.extend([ANTI_BOT] * 3)
+
+    with pytest.raises(GrokRejectedError):
+        Grok().chat("hi")
+    assert Grok.retry.stats()["retries"] == 2
+
+
+def test_streams_retry_rejections(upstream):
+    async def run() -> list:
+        async with AsyncGrok() as grok:
+            return [chunk async for chunk in grok.chat_stream("hi")]
+
+    upstream.errors.append(ANTI_BOT)
+    assert [chunk["token"] for chunk in Grok().chat_stream("hi")][:2] == ["Hel", "lo"]
+
+    upstream.errors.append(ANTI_BOT)
+    assert asyncio.run(run())[-1]["meta"]["response"] == "Hello"
+    assert Grok.retry.stats()["retries"] == 2
+
+
+def conversation_posts(upstream) -> int:
+    return sum(method == "POST" and "/conversations/" in url for method, url, _ in upstream.calls)
+
+
+def test_sent_turn_is_not_retried(upstream):
+    first = Grok().chat("hi")
+    before = conversation_posts(upstream)
+
+    upstream.errors.append(RequestException("Connection reset", CurlECode.RECV_ERROR))
+    with pytest.raises(GrokStreamError):
+        Grok().chat("again", first["extra_data"])
+    assert conversation_posts(upstream) == before + 1
+
+    upstream.errors.append(ConnectionError("Failed to connect", CurlECode.COULDNT_CONNECT))
+    assert Grok().chat("again", first["extra_data"])["response"] == "Hello"
+    assert conversation_posts(upstream) == before + 3
+    assert Grok.retry.stats()["retries"] == 1
+
+
+def test_async_retries_keep_the_subclass(upstream):
+    created = []
+
+    class Tracked(AsyncGrok):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    async def run() -> list:
+        upstream.errors.append(ANTI_BOT)
+        async with Tracked() as grok:
+            await grok.chat("hi")
+        upstream.errors.append(ANTI_BOT)
+        async with Tracked() as grok:
+            return [chunk async for chunk in grok.chat_stream("hi")]
+
+    assert asyncio.run(run())[-1]["meta"]["response"] == "Hello"
+    assert len(created) == 4
@@ -0,0 +1,55 @@
+from grok_api.bench  import free_port, wait_until_up
+from grok_api.server import parse_args, apply_environment, build_config
+from curl_cffi       import requests
+from time            import monotonic, sleep
+from os              import environ
+import subprocess
+import sys
+
+
+def test_flags_override_environment(monkeypatch):
+    monkeypatch.setenv("GROK_API_PORT", "7000")
+    monkeypatch.setenv("GROK_API_PROCESSES", "3")
+    monkeypatch.setenv("GROK_API_MAX_REQUESTS", "1000")
+
+    args = parse_args(["--port", "8000", "--pool-size", "4"])
+
+    assert (args.port, args.workers, args.pool_size) == (8000, 3, 4)
+    assert args.max_requests_jitter == 100
+
+
+def test_config_and_worker_environment(monkeypatch):
+    for name in ("GROK_API_WORKERS", "GROK_API_QUEUE", "GROK_API_POOL_SIZE", "GROK_API_POOL_IDLE"):
+        monkeypatch.delenv(name, raising=False)
+    args = parse_args(["--workers", "4", "--threads", "20", "--max-requests", "500", "--max-requests-jitter", "7"])
+    apply_environment(args)
+    config = build_config(args)
+
+    assert config.app == "grok_api.api_server:create_app" and config.factory
+    assert (config.workers, config.limit_max_requests) == (4, 500)
+    assert getattr(config, "limit_max_requests_jitter", 7) == 7
+    assert config.timeout_graceful_shutdown == 30
+    assert (environ["GROK_API_WORKERS"], environ["GROK_API_POOL_SIZE"]) == ("20", "32")
+
+
+def test_workers_are_recycled():
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "grok_api.server", "--port", str(port), "--host", "127.0.0.1", "--workers", "2",
+         "--max-requests", "2", "--max-requests-jitter", "0", "--log-level", "error"]
+    )
+    try:
+        wait_until_up(f"http://127.0.0.1:{port}/stats", timeout=30)
+        pids = set()
+        deadline = monotonic() + 30
+        while len(pids) < 3 and monotonic() < deadline:
+            try:
+                pids.add(requests.get(f"http://127.0.0.1:{port}/stats", timeout=5).json()["pid"])
+            except requests.errors.RequestsError:
+                pass
+            sleep(0.2)
+
+        assert len(pids) >= 3
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
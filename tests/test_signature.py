@@ -0,0 +1,88 @@
+from grok_api.core import Signature
+from grok_api.core.reverse.xctid import SignatureTable
+from base64        import b64decode
+from json          import load
+from os            import path
+import pytest
+
+with open(path.join(path.dirname(path.abspath(__file__)), "fixtures", "signatures.json")) as f:
+    GOLDEN: list = load(f)
+
+
+@pytest.mark.parametrize("vector", GOLDEN, ids=range(len(GOLDEN)))
+def test_generate_sign_matches_golden(vector):
+    sign = Signature.generate_sign(vector["path"], vector["method"], vector["verification"], vector["svg"], vector["x_values"], vector["time_n"], vector["random_float"])
+
+    assert sign == vector["sign"]
+    assert Signature.table(vector["svg"], vector["x_values"]).lookup(b64decode(vector["verification"])) == vector["xs"]
+
+
+def test_precomputed_table_matches_reference():
+    vector = GOLDEN[0]
+    table = Signature.table(vector["svg"], vector["x_values"]).precompute()
+
+    assert len(table.cells) == 16 * len(table.PRODUCTS)
+    for (idx, c), o in table.cells.items():
+        assert o == Signature.style_hex(table.rows[idx], c)
+
+
+def test_table_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(Signature, "tables", type(Signature.tables)())
+    monkeypatch.setattr(Signature, "table_cache_size", 2)
+
+    first = Signature.table(GOLDEN[0]["svg"], GOLDEN[0]["x_values"])
+    Signature.table(GOLDEN[1]["svg"], GOLDEN[1]["x_values"])
+    assert Signature.table(GOLDEN[0]["svg"], GOLDEN[0]["x_values"]) is first
+
+    Signature.table(GOLDEN[2]["svg"], GOLDEN[2]["x_values"])
+    assert (GOLDEN[1]["svg"], tuple(GOLDEN[1]["x_values"])) not in Signature.tables
+    assert len(Signature.tables) == 2
+
+
+def _ease_inputs() -> list:
+    args: list = []
+    for vector in GOLDEN[:8]:
+        for row in Signature.xa(vector["svg"]):
+            args += [Signature.ease_args(row, c) for c in SignatureTable.PRODUCTS[::7]]
+    # Degenerate curves where the eased value lands exactly on a rounding boundary.
+    args += [Signature.ease_args([255, 128, 128, 1, 0, 255, 254, 0, 128, 0, 128], c) for c in (0, 2156, 2160, 3375)]
+    return args
+
+
+def test_eased_solver_is_bit_identical_to_bisection():
+    args = _ease_inputs()
+    reference = [Signature._bisect(*a) for a in args]
+
+    assert [Signature.cubicBezierEased(*a) for a in args] == reference
+    assert Signature.cubicBezierEasedBatch(*zip(*args)) == reference
+
+
+def test_eased_batch_without_numpy(monkeypatch):
+    from grok_api.core.reverse import xctid
+    monkeypatch.setattr(xctid, "_np", None)
+    args = _ease_inputs()[:50]
+
+    assert Signature.cubicBezierEasedBatch(*zip(*args)) == [Signature._bisect(*a) for a in args]
+
+
+def test_generate_sign_batch_matches_single_signatures():
+    vector = GOLDEN[5]
+    paths = [f"/rest/app-chat/conversations/{i:x}/responses" for i in range(20)]
+    floats = [i / 20 for i in range(20)]
+
+    batch = Signature.generate_sign_batch(paths, "POST", vector["verification"], vector["svg"], vector["x_values"], vector["time_n"], floats)
+
+    assert batch == [Signature.generate_sign(path, "POST", vector["verification"], vector["svg"], vector["x_values"], vector["time_n"], f) for path, f in zip(paths, floats)]
+
+
+def test_shared_table_is_precomputed_once(tmp_path):
+    from grok_api.core import SQLiteMappingStore
+
+    vector = GOLDEN[0]
+    store = SQLiteMappingStore(str(tmp_path / "shared.db"), "signature_tables", memoize=False)
+    SignatureTable(vector["svg"], vector["x_values"]).share(store, background=False)
+
+    table = SignatureTable(vector["svg"], vector["x_values"])
+    assert table.share(store) is None
+    assert len(table.cells) == 16 * len(table.PRODUCTS)
+    assert table.lookup(b64decode(vector["verification"])) == vector["xs"]
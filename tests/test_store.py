@@ -0,0 +1,88 @@
+from grok_api.core import MappingStore, SQLiteMappingStore, Parser
+from multiprocessing import get_context
+from json          import load
+import os
+
+
+def _put_many(path: str, worker: int) -> None:
+    store = MappingStore(path, key="action_script")
+    for i in range(20):
+        store.put(f"/w{worker}/{i}.js", {"action_script": f"/w{worker}/{i}.js", "actions": [str(i)], "xsid_script": "x.js"})
+
+
+def test_concurrent_processes_keep_every_entry(tmp_path):
+    path = str(tmp_path / "grok.json")
+    processes = [get_context("spawn").Process(target=_put_many, args=(path, worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+
+    with open(path) as f:
+        entries: list = load(f)
+
+    assert len(entries) == 80
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".tmp-")]
+
+
+def test_reloads_entries_written_elsewhere(tmp_path):
+    path = str(tmp_path / "txid.json")
+    reader, writer = MappingStore(path), MappingStore(path)
+
+    assert reader.get("https://grok.com/_next/a.js") is None
+    writer.put("https://grok.com/_next/a.js", [1, 2, 3])
+
+    assert reader.get("https://grok.com/_next/a.js") == [1, 2, 3]
+    assert reader.find(["/missing.js", "https://grok.com/_next/a.js"]) == [1, 2, 3]
+
+
+def test_tolerates_empty_and_corrupt_files(tmp_path):
+    path = tmp_path / "txid.json"
+    path.write_text("")
+    assert MappingStore(str(path)).get("a") is None
+
+    path.write_text('{"a": [1')
+    store = MappingStore(str(path))
+    assert store.get("a") is None
+    store.put("b", [2])
+    assert MappingStore(str(path)).get("b") == [2]
+
+
+def test_shipped_grok_mapping_is_indexed():
+    store = MappingStore(Parser.GROK_PATH, key="action_script")
+    with open(Parser.GROK_PATH) as f:
+        entries: list = load(f)
+
+    assert store.find([entries[-1]["action_script"]]) == entries[-1]
+
+
+def _put_shared(path: str, worker: int) -> None:
+    store = SQLiteMappingStore(path, "grok")
+    for i in range(20):
+        store.put(f"/w{worker}/{i}.js", {"action_script": f"/w{worker}/{i}.js", "actions": [str(i)], "xsid_script": "x.js"})
+
+
+def test_sqlite_store_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "shared.db")
+    reader = SQLiteMappingStore(path, "grok")
+    assert reader.find(["/w0/0.js"]) is None
+
+    processes = [get_context("spawn").Process(target=_put_shared, args=(path, worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+
+    assert len(reader) == 80
+    assert reader.find(["/missing.js", "/w3/19.js"])["actions"] == ["19"]
+    assert len(SQLiteMappingStore(path, "txid")) == 0
+
+
+def test_sqlite_store_falls_back_to_seed(tmp_path):
+    seed = MappingStore(str(tmp_path / "txid.json"))
+    seed.put("a.js", [1, 2])
+    store = SQLiteMappingStore(str(tmp_path / "shared.db"), "txid", seed=seed)
+
+    assert store.get("a.js") == [1, 2]
+    store.put("a.js", [3])
+    assert store.get("a.js") == [3] and seed.get("a.js") == [1, 2]
@@ -0,0 +1,38 @@
+from grok_api  import api_server
+from fastapi   import HTTPException
+from json      import loads
+import asyncio
+import pytest
+
+
+def collect(format: str) -> list:
+    async def run() -> list:
+        request = api_server.ConversationRequest(proxy="127.0.0.1:8080", message="hi")
+        response = await api_server.stream_conversation(request, format)
+        return [frame async for frame in response.body_iterator]
+
+    return asyncio.run(run())
+
+
+def test_ndjson_stream(upstream):
+    frames = [loads(frame) for frame in collect("ndjson")]
+
+    assert [frame["token"] for frame in frames[:-1]] == ["Hel", "lo"]
+    assert frames[-1]["meta"]["response"] == "Hello"
+    assert frames[-1]["meta"]["conversation"]
+    assert "extra_data" not in frames[-1]["meta"]
+
+
+def test_sse_stream(upstream):
+    frames = collect("sse")
+
+    assert all(frame.startswith(b"data: ") and frame.endswith(b"\n\n") for frame in frames)
+    assert loads(frames[0][6:])["token"] == "Hel"
+
+
+def test_handshake_error_maps_to_status(upstream, monkeypatch):
+    monkeypatch.setattr(upstream, "handle", lambda *args: (_ for _ in ()).throw(api_server.GrokNetworkError("down")))
+
+    with pytest.raises(HTTPException) as error:
+        collect("ndjson")
+    assert error.value.status_code == 502
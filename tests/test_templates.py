@@ -0,0 +1,61 @@
+from grok_api.core          import Grok, Headers, Payloads
+from grok_api.core.payloads import new_conversation_data, follow_up_data
+from json                   import dumps
+import pytest
+
+MESSAGES = ["hi", 'quote " and \\ backslash', "line\nbreak ünicode \U0001f600", "\0message\0", ""]
+
+
+def serialized(data: dict) -> bytes:
+    return dumps(data, separators=(",", ":")).encode()
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_payload_matches_full_serialization(message):
+    assert Payloads.conversation(message, "grok-4", "MODEL_MODE_EXPERT", "expert") == serialized(
+        new_conversation_data(message, "grok-4", "MODEL_MODE_EXPERT")
+    )
+    assert Payloads.conversation(message, "grok-4", "MODEL_MODE_EXPERT", "expert", 'resp-"1"') == serialized(
+        follow_up_data(message, "grok-4", "MODEL_MODE_EXPERT", "expert", 'resp-"1"')
+    )
+
+
+def test_follow_up_without_parent_response(upstream):
+    grok = Grok()
+    answer = grok.chat("hi")
+    extra_data = {**answer["extra_data"], "parentResponseId": None}
+
+    assert grok._conversation_body("again", extra_data) == serialized(
+        follow_up_data("again", grok.model, grok.model_mode, grok.mode, None)
+    )
+    assert b'"parentResponseId":null' in grok._conversation_body("again", extra_data)
+
+
+def test_payload_templates_are_bounded(monkeypatch):
+    monkeypatch.setattr(Payloads, "_templates", {})
+    monkeypatch.setattr(Payloads, "max_templates", 4)
+
+    for i in range(10):
+        Payloads.conversation("hi", f"model-{i}", "MODEL_MODE_AUTO", "auto")
+
+    assert len(Payloads._templates) <= 4
+
+
+def test_overlay_matches_fix_order():
+    fields = {"x-statsig-id": "sig", "baggage": "bag", "x-extra": "1"}
+    updated = dict(Headers.CONVERSATION)
+    updated.update(fields)
+
+    assert list(Headers.overlay(Headers.CONVERSATION, fields).items()) == list(Headers.fix_order(updated, Headers.CONVERSATION).items())
+    assert "content-type" not in Headers.C_REQUEST_MULTIPART
+
+
+def test_templates_stay_untouched(upstream):
+    before = [dict(template) for template in (Headers.LOAD, Headers.C_REQUEST, Headers.CONVERSATION)]
+
+    answer = Grok().chat("hi")
+    Grok().chat("again", answer["extra_data"])
+
+    assert [dict(template) for template in (Headers.LOAD, Headers.C_REQUEST, Headers.CONVERSATION)] == before
+    with pytest.raises(TypeError):
+        Headers.CONVERSATION["x-statsig-id"] = "leak"
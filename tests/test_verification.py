@@ -0,0 +1,84 @@
+from grok_api.core import Grok, AsyncGrok, VerificationCache, GrokError
+from fakes         import ANTI_BOT, ACTIONS
+import asyncio
+import pytest
+
+
+def server_actions(upstream) -> int:
+    return sum(action in ACTIONS for _, _, action in upstream.calls)
+
+
+def test_cache_window():
+    cache = VerificationCache(ttl=60, min_ttl=0)
+    cache.put("anon", "token", "svg", [1, 2])
+
+    assert cache.get("anon") == ("token", "svg", [1, 2])
+    assert cache.get("other") is None
+
+    cache.reject("anon")
+    assert cache.get("anon") is None
+    assert cache.ttl < 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2 and cache.stats()["rejections"] == 1
+
+
+def test_window_grows_back_after_accepted_reuse():
+    cache = VerificationCache(ttl=60, min_ttl=1, growth=2)
+    cache.put("anon", "token", "svg", [1, 2])
+    cache.reject("anon")
+    assert cache.ttl == 1
+
+    for _ in range(10):
+        cache.accept("anon")
+    assert cache.ttl == 60
+
+
+def test_follow_up_skips_server_actions(upstream):
+    with Grok() as grok:
+        first = grok.chat("hi")
+    assert server_actions(upstream) == 3
+
+    with Grok() as grok:
+        follow_up = grok.chat("again", first["extra_data"])
+        assert grok.reused_verification
+
+    assert follow_up["response"] == "Hello"
+    assert server_actions(upstream) == 3
+    assert Grok.verification.stats()["hits"] == 1
+
+
+def test_rejected_verification_falls_back(upstream):
+    with Grok() as grok:
+        first = grok.chat("hi")
+
+    upstream.errors.append(ANTI_BOT)
+    with Grok() as grok:
+        chunks = list(grok.chat_stream("again", first["extra_data"]))
+
+    assert chunks[-1]["meta"]["response"] == "Hello"
+    assert server_actions(upstream) == 5
+    assert Grok.verification.stats()["rejections"] == 1
+
+
+def test_other_errors_keep_cached_verification(upstream):
+    with Grok() as grok:
+        first = grok.chat("hi")
+
+    Grok.verification.ttl = 30
+    upstream.errors.append('{"error":{"code":13,"message":"Internal error"}}')
+    with Grok() as grok, pytest.raises(GrokError):
+        grok.chat("again", first["extra_data"])
+
+    assert Grok.verification.stats()["rejections"] == 0
+    assert Grok.verification.ttl == 30
+    assert Grok.verification.get(first["extra_data"]["anon_user"]) is not None
+
+
+def test_async_follow_up_skips_server_actions(upstream):
+    async def run() -> dict:
+        async with AsyncGrok() as grok:
+            first = await grok.chat("hi")
+        async with AsyncGrok() as grok:
+            return await grok.chat("again", first["extra_data"])
+
+    assert asyncio.run(run())["extra_data"]["parentResponseId"] == "resp-next"
+    assert server_actions(upstream) == 3